@@ -0,0 +1,174 @@
+"""
+Admission control for chat graph runs.
+
+Turns on the same thread_id run one at a time (two concurrent turns would both read
+the same latest checkpoint and race to write the next one, silently dropping a turn),
+and a global limit bounds how many graph runs execute at once. Requests beyond the
+configured queue depth are rejected immediately so the API can answer 429 instead
+of piling up until the worker times out.
+
+Limits are per process; with several gunicorn workers, turns on one thread are only
+serialized if the load balancer routes a thread_id to the same worker.
+
+AsyncAdmissionController applies the same limits to coroutines (asgi.py): waiting
+turns await asyncio locks instead of blocking the event loop.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+
+class Overloaded(Exception):
+    """Raised when a run cannot be admitted; `retry_after` is a hint in whole seconds"""
+
+    def __init__(self, retry_after: int, reason: str = "Server busy, please retry"):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """An admitted run; call release() exactly once when the run has finished"""
+
+    def __init__(self, controller, thread_id, thread_lock):
+        self._controller = controller
+        self._thread_id = thread_id
+        self._thread_lock = thread_lock
+        self._released = False
+
+    def release(self):
+        # Idempotent so streaming responses can release from several close paths
+        if self._released:
+            return
+        self._released = True
+        self._controller._slots.release()
+        self._thread_lock.release()
+        self._controller._leave(self._thread_id)
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent: int = 16, max_queued: int = 32,
+                 queue_timeout: float = 30.0, retry_after: float = 2.0):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.retry_after = max(1, math.ceil(retry_after))
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # thread_id -> [lock, number of requests holding or waiting for it]
+        self._thread_locks = {}
+
+    def acquire(self, thread_id: str) -> Ticket:
+        """Wait for this thread's turn and a global run slot, or raise Overloaded"""
+        with self._lock:
+            if self._in_flight >= self.max_concurrent + self.max_queued:
+                raise Overloaded(self.retry_after)
+            self._in_flight += 1
+            entry = self._thread_locks.setdefault(thread_id, [threading.Lock(), 0])
+            entry[1] += 1
+        thread_lock = entry[0]
+
+        deadline = time.monotonic() + self.queue_timeout
+        if not thread_lock.acquire(timeout=self.queue_timeout):
+            self._leave(thread_id)
+            raise Overloaded(self.retry_after, "Previous turn on this thread is still running")
+        # Take the global slot only once it's this thread's turn, so requests
+        # queued behind their own thread don't hold a slot while they wait
+        if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            thread_lock.release()
+            self._leave(thread_id)
+            raise Overloaded(self.retry_after)
+        return Ticket(self, thread_id, thread_lock)
+
+    @contextmanager
+    def admit(self, thread_id: str):
+        ticket = self.acquire(thread_id)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "active_threads": len(self._thread_locks),
+                "max_concurrent": self.max_concurrent,
+                "max_queued": self.max_queued,
+            }
+
+    def _leave(self, thread_id: str):
+        with self._lock:
+            self._in_flight -= 1
+            entry = self._thread_locks[thread_id]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._thread_locks[thread_id]
+
+
+class AsyncAdmissionController(AdmissionController):
+    """AdmissionController for the event loop; create it inside the loop it serves"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._slots = asyncio.BoundedSemaphore(self.max_concurrent)
+
+    async def acquire(self, thread_id: str) -> Ticket:
+        """Wait for this thread's turn and a global run slot, or raise Overloaded"""
+        with self._lock:
+            if self._in_flight >= self.max_concurrent + self.max_queued:
+                raise Overloaded(self.retry_after)
+            self._in_flight += 1
+            entry = self._thread_locks.setdefault(thread_id, [asyncio.Lock(), 0])
+            entry[1] += 1
+        thread_lock = entry[0]
+
+        deadline = time.monotonic() + self.queue_timeout
+        try:
+            await asyncio.wait_for(thread_lock.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._leave(thread_id)
+            raise Overloaded(self.retry_after, "Previous turn on this thread is still running")
+        except asyncio.CancelledError:  # the client went away while queued
+            self._leave(thread_id)
+            raise
+        try:
+            await asyncio.wait_for(self._slots.acquire(), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            thread_lock.release()
+            self._leave(thread_id)
+            raise Overloaded(self.retry_after)
+        except asyncio.CancelledError:
+            thread_lock.release()
+            self._leave(thread_id)
+            raise
+        return Ticket(self, thread_id, thread_lock)
+
+    @asynccontextmanager
+    async def admit(self, thread_id: str):
+        ticket = await self.acquire(thread_id)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+
+def limits_from_env() -> dict:
+    return {
+        "max_concurrent": int(os.getenv("CHATX_MAX_CONCURRENT_RUNS", "16")),
+        "max_queued": int(os.getenv("CHATX_MAX_QUEUED_RUNS", "32")),
+        "queue_timeout": float(os.getenv("CHATX_QUEUE_TIMEOUT", "30")),
+        "retry_after": float(os.getenv("CHATX_RETRY_AFTER", "2")),
+    }
+
+
+def controller_from_env() -> AdmissionController:
+    return AdmissionController(**limits_from_env())
+
+
+def async_controller_from_env() -> AsyncAdmissionController:
+    return AsyncAdmissionController(**limits_from_env())
@@ -1,20 +1,78 @@
-from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask import Flask, request, jsonify, send_from_directory, send_file, Response, stream_with_context, g
 from flask_cors import CORS
 import uuid
 import os
+import re
+import stat
+import hashlib
+import threading
+import time
+from functools import lru_cache
+
+from chat_stream import sse_event, events_from_chunk, extract_response
+from admission import Overloaded, controller_from_env
+from static_assets import StaticAssets
+from checkpoint_cache import merge_stats
+from durability import durability_from_env, resolve_durability
+from message_history import history_page, parse_limit, unchanged_page
+import metrics
+from tracing import TurnTracer, debug_requested, finish_turn, store_from_env
 
 app = Flask(__name__)
 CORS(app)
 
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            route=route, method=request.method, status=response.status_code,
+        )
+    return response
+
+# Limits for /api/chat/batch
+BATCH_MAX_ITEMS = int(os.getenv("CHATX_BATCH_MAX_ITEMS", "100"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("CHATX_BATCH_MAX_CONCURRENCY", "8"))
+
+# Per-thread serialization and global limit on concurrent graph runs
+admission = controller_from_env()
+
+# When checkpoints are committed during a turn (sync/async/exit); requests may override
+DURABILITY = durability_from_env()
+
+# Per-turn traces (turn_traces table), returned to clients sending X-ChatX-Debug
+trace_store = store_from_env()
+
+def overloaded_response(error):
+    return jsonify({'error': str(error)}), 429, {'Retry-After': str(error.retry_after)}
+
 # Lazy load chatbot to prevent startup crashes
 chatbot = None
+# Set once the graph, tools and LLM client have been built in this process
+chatbot_ready = threading.Event()
+
 def get_chatbot():
     global chatbot
     if chatbot is None:
         from langgraph_tool_backend import chatbot as cb
         chatbot = cb
+        chatbot_ready.set()
     return chatbot
 
+def warm_up():
+    """Build the chatbot ahead of the first request (gunicorn hooks and __main__)."""
+    try:
+        get_chatbot()
+    except Exception as e:
+        print(f"[ERROR] Chatbot warm-up failed: {e}")
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     try:
@@ -24,59 +82,294 @@ def chat():
         
         if not message:
             return jsonify({'error': 'Message is required'}), 400
+        try:
+            durability = resolve_durability(data.get('durability'), DURABILITY)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        CONFIG = {
-            "configurable": {"thread_id": thread_id},
-            "run_name": "chat_turn",
-        }
+        if data.get('stream'):
+            return stream_chat_response(message, thread_id, durability)
         
         from langchain_core.messages import HumanMessage
         cb = get_chatbot()
-        final_state = cb.invoke(
-            {"messages": [HumanMessage(content=message)]},
-            config=CONFIG  # type: ignore
-        )
+        with admission.admit(thread_id):
+            tracer = TurnTracer(thread_id)
+            CONFIG = {
+                "configurable": {"thread_id": thread_id},
+                "run_name": "chat_turn",
+                "callbacks": [tracer],
+            }
+            try:
+                final_state = cb.invoke(
+                    {"messages": [HumanMessage(content=message)]},
+                    config=CONFIG,  # type: ignore
+                    durability=durability
+                )
+            except Exception as e:
+                finish_turn(tracer, trace_store, error=e)
+                raise
+        trace = finish_turn(tracer, trace_store)
         
-        response = "I'm sorry, I couldn't process your request."
-        if "messages" in final_state:
-            for msg in reversed(final_state["messages"]):
-                if hasattr(msg, 'type') and msg.type == 'ai' and hasattr(msg, 'content'):
-                    response = msg.content
-                    break
+        response = extract_response(final_state)
         
-        return jsonify({
+        body = {
             'response': response,
             'thread_id': thread_id
-        })
+        }
+        if debug_requested(request.headers):
+            body['trace'] = trace
+        return jsonify(body)
+        
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    try:
+        data = request.json or {}
+        message = data.get('message', '')
+        thread_id = data.get('thread_id', str(uuid.uuid4()))
+        
+        if not message:
+            return jsonify({'error': 'Message is required'}), 400
+        try:
+            durability = resolve_durability(data.get('durability'), DURABILITY)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return stream_chat_response(message, thread_id, durability)
+        
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/chat/batch', methods=['POST'])
+def chat_batch():
+    """Run many independent chat turns concurrently; results keep input order"""
+    try:
+        data = request.json or {}
+        items = data.get('items')
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'items must be a non-empty list'}), 400
+        if len(items) > BATCH_MAX_ITEMS:
+            return jsonify({'error': f'At most {BATCH_MAX_ITEMS} items per batch'}), 400
+        try:
+            max_concurrency = int(data.get('max_concurrency', BATCH_MAX_CONCURRENCY))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'max_concurrency must be an integer'}), 400
+        max_concurrency = max(1, min(max_concurrency, BATCH_MAX_CONCURRENCY))
+        try:
+            durability = resolve_durability(data.get('durability'), DURABILITY)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        from langchain_core.messages import HumanMessage
+        from langchain_core.runnables import RunnableLambda
+        results = [None] * len(items)
+        pending = []
+        seen_threads = set()
+        
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = {'thread_id': None, 'error': 'Each item must be an object'}
+                continue
+            message = item.get('message', '')
+            thread_id = item.get('thread_id') or str(uuid.uuid4())
+            if not message:
+                results[index] = {'thread_id': thread_id, 'error': 'Message is required'}
+                continue
+            # Two turns on one thread would race on the same checkpoint
+            if thread_id in seen_threads:
+                results[index] = {'thread_id': thread_id, 'error': 'Duplicate thread_id in batch'}
+                continue
+            seen_threads.add(thread_id)
+            pending.append((index, thread_id, {"messages": [HumanMessage(content=message)]}))
+        
+        if pending:
+            tracers = {thread_id: TurnTracer(thread_id) for _, thread_id, _ in pending}
+            configs = [
+                {
+                    "configurable": {"thread_id": thread_id},
+                    "run_name": "chat_turn",
+                    "max_concurrency": max_concurrency,
+                    "callbacks": [tracers[thread_id]],
+                }
+                for _, thread_id, _ in pending
+            ]
+            cb = get_chatbot()
+            
+            def run_turn(inputs, config):
+                # Each item goes through the same admission control as /api/chat
+                thread_id = config["configurable"]["thread_id"]
+                with admission.admit(thread_id):
+                    try:
+                        output = cb.invoke(inputs, config=config, durability=durability)
+                    except Exception as e:
+                        finish_turn(tracers[thread_id], trace_store, error=e)
+                        raise
+                finish_turn(tracers[thread_id], trace_store)
+                return output
+            
+            outputs = RunnableLambda(run_turn).batch(
+                [inputs for _, _, inputs in pending],
+                config=configs,  # type: ignore
+                return_exceptions=True
+            )
+            debug = debug_requested(request.headers)
+            for (index, thread_id, _), output in zip(pending, outputs):
+                if isinstance(output, Exception):
+                    results[index] = {'thread_id': thread_id, 'error': str(output)}
+                else:
+                    results[index] = {'thread_id': thread_id, 'response': extract_response(output)}
+                if debug and tracers[thread_id].trace is not None:
+                    results[index]['trace'] = tracers[thread_id].trace
+        
+        return jsonify({'results': results})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def stream_chat_response(message, thread_id, durability=None):
+    """Run one chat turn and forward message chunks and tool events as SSE"""
+    from langchain_core.messages import HumanMessage
+    cb = get_chatbot()
+    debug = debug_requested(request.headers)
+    # Admission happens before the response starts so overload can still be a 429;
+    # the ticket is held until the stream finishes or the client goes away
+    ticket = admission.acquire(thread_id)
+    
+    def generate():
+        tracer = TurnTracer(thread_id)
+        CONFIG = {
+            "configurable": {"thread_id": thread_id},
+            "run_name": "chat_turn",
+            "callbacks": [tracer],
+        }
+        try:
+            for chunk, metadata in cb.stream(
+                {"messages": [HumanMessage(content=message)]},
+                config=CONFIG,  # type: ignore
+                stream_mode="messages",
+                durability=durability or DURABILITY
+            ):
+                for event in events_from_chunk(chunk, metadata):
+                    yield sse_event(event)
+            trace = finish_turn(tracer, trace_store)
+            done = {'type': 'done', 'thread_id': thread_id}
+            if debug:
+                done['trace'] = trace
+            yield sse_event(done)
+        except Exception as e:
+            finish_turn(tracer, trace_store, error=e)
+            yield sse_event({'type': 'error', 'error': str(e), 'thread_id': thread_id})
+        finally:
+            ticket.release()
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.call_on_close(ticket.release)
+    # Disable caching and proxy buffering so chunks reach the client immediately
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/threads', methods=['GET'])
+def list_threads():
+    """Paginated conversation list: ?limit=&sort=&order=&cursor="""
+    try:
+        get_chatbot()
+        from langgraph_tool_backend import checkpointer
+        page = checkpointer.list_threads(
+            limit=request.args.get('limit', 50, type=int),
+            sort=request.args.get('sort', 'updated_at'),
+            order=request.args.get('order', 'desc'),
+            cursor=request.args.get('cursor'),
+        )
+        return jsonify(page)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/threads/<thread_id>/messages', methods=['GET'])
+def thread_messages(thread_id):
+    """A page of a thread's messages: ?limit=&before=<index>&since=<checkpoint_id>"""
+    try:
+        bot = get_chatbot()
+        from langgraph_tool_backend import checkpointer
+        limit = parse_limit(request.args.get('limit'))
+        before = request.args.get('before', type=int)
+        since = request.args.get('since')
+
+        # Checkpoint metadata answers "anything new?" without loading the thread
+        latest = checkpointer.message_count_at(thread_id)
+        if latest is None:
+            return jsonify({'error': 'Thread not found'}), 404
+        if since and since == latest[0]:
+            return jsonify(unchanged_page(*latest))
+
+        known = checkpointer.message_count_at(thread_id, since) if since else None
+        state = bot.get_state({"configurable": {"thread_id": thread_id}})
+        page = history_page(
+            state.values.get('messages', []),
+            state.config["configurable"]["checkpoint_id"],
+            limit=limit, before=before, since_count=known[1] if known else None,
+        )
+        if since and known is None:
+            # The client's checkpoint was pruned or never existed: resync from the newest page
+            page['reset'] = True
+        return jsonify(page)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/health', methods=['GET'])
 def health():
     return jsonify({'status': 'healthy'})
 
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    get_chatbot()
+    from langgraph_tool_backend import llm_cache, checkpoint_caches
+    return jsonify({
+        'llm_cache': llm_cache.stats() if llm_cache else {'enabled': False},
+        'checkpoint_cache': merge_stats(checkpoint_caches),
+    })
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    # Load balancers should only route chat traffic to warmed-up workers
+    if chatbot_ready.is_set():
+        return jsonify({'status': 'ready'})
+    return jsonify({'status': 'warming_up'}), 503
+
+# The React build is loaded into memory once, with gzip/brotli variants
+BUILD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend', 'build')
+static_assets = StaticAssets(BUILD_DIR)
+
 @app.route('/static/js/<path:filename>')
 def serve_js(filename):
-    js_folder = os.path.join(os.path.dirname(__file__), 'frontend', 'build', 'static', 'js')
-    file_path = os.path.join(js_folder, filename)
-    if os.path.exists(file_path):
-        return send_file(file_path, mimetype='application/javascript')
-    return '', 404
+    response = static_assets.response(f'static/js/{filename}')
+    return response if response is not None else ('', 404)
 
 @app.route('/static/css/<path:filename>')
 def serve_css(filename):
-    css_folder = os.path.join(os.path.dirname(__file__), 'frontend', 'build', 'static', 'css')
-    file_path = os.path.join(css_folder, filename)
-    if os.path.exists(file_path):
-        return send_file(file_path, mimetype='text/css')
-    return '', 404
+    response = static_assets.response(f'static/css/{filename}')
+    return response if response is not None else ('', 404)
 
 @app.route('/')
 def home():
-    index_path = os.path.join(os.path.dirname(__file__), 'frontend', 'build', 'index.html')
-    if os.path.exists(index_path):
-        return send_file(index_path)
+    response = static_assets.response('index.html')
+    if response is not None:
+        return response
     return '<h1>ChatX API Running</h1><p>Frontend build not found</p>'
 
 @app.route('/test')
@@ -100,6 +393,24 @@ def test_frontend():
         return send_file(test_path)
     return '<h1>Test frontend file not found</h1>'
 
+# Generated images live here; published images are named by content hash
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+CONTENT_ADDRESSED_IMAGE = re.compile(r'^generated_([0-9a-f]{16})\.png$')
+IMAGE_MIME_TYPES = {
+    '.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif', '.webp': 'image/webp', '.svg': 'image/svg+xml',
+}
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+@lru_cache(maxsize=1024)
+def file_etag(filepath, mtime_ns, size):
+    """Strong ETag for files whose name is not a content hash (legacy images)"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()[:32]
+
 @app.route('/api/image/<filename>')
 def serve_image(filename):
     # Additional security validation to prevent path traversal
@@ -115,56 +426,49 @@ def serve_image(filename):
         return '', 400  # Bad Request
     
     # Construct the full file path
-    static_dir = os.path.join(os.path.dirname(__file__), 'static')
-    filepath = os.path.join(static_dir, filename)
+    filepath = os.path.join(IMAGE_DIR, filename)
     
     # Ensure the filepath is within the static directory (additional security check)
-    try:
-        # Resolve both paths to their absolute forms
-        abs_static_dir = os.path.abspath(static_dir)
-        abs_filepath = os.path.abspath(filepath)
-        
-        # Check if the file path is within the static directory
-        if not abs_filepath.startswith(abs_static_dir + os.sep) and not abs_filepath == abs_static_dir:
-            return '', 400  # Bad Request
-    except Exception:
+    abs_static_dir = os.path.abspath(IMAGE_DIR)
+    if not os.path.abspath(filepath).startswith(abs_static_dir + os.sep):
         return '', 400  # Bad Request
     
-    # Check if file exists
-    if os.path.exists(filepath):
-        # Verify it's actually a file (not a directory)
-        if not os.path.isfile(filepath):
+    # Ensure only valid image files are served; PNG is the default for files with no extension
+    _, ext = os.path.splitext(filename)
+    if ext:
+        mime_type = IMAGE_MIME_TYPES.get(ext.lower())
+        if mime_type is None:
             return '', 400  # Bad Request
-        
-        # Determine MIME type based on file extension
-        import mimetypes
-        mime_type, _ = mimetypes.guess_type(filepath)
-        
-        # Ensure only valid image files are served
-        allowed_mime_types = [
-            'image/png', 'image/jpeg', 'image/jpg', 'image/gif', 
-            'image/webp', 'image/svg+xml'
-        ]
-        
-        # If MIME type is not detected or not in allowed list, reject
-        if mime_type is None or mime_type not in allowed_mime_types:
-            # Allow PNG as default for files with no extension
-            if not '.' in filename:
-                mime_type = 'image/png'
-            else:
-                return '', 400  # Bad Request
-        
-        # Create response with cache control headers
-        response = send_file(filepath, mimetype=mime_type)
-        
-        # Add cache control headers to prevent aggressive caching
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-        
-        return response
+    else:
+        mime_type = 'image/png'
+    
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return '', 404
+    # Verify it's actually a file (not a directory)
+    if not stat.S_ISREG(st.st_mode):
+        return '', 400  # Bad Request
+    
+    content_addressed = CONTENT_ADDRESSED_IMAGE.match(filename)
+    if content_addressed:
+        etag = content_addressed.group(1)
+    else:
+        etag = file_etag(filepath, st.st_mtime_ns, st.st_size)
+    
+    # send_file answers If-None-Match with 304 and Range requests with 206
+    response = send_file(filepath, mimetype=mime_type, etag=etag, conditional=True,
+                         last_modified=st.st_mtime)
+    
+    if content_addressed:
+        # The name is the content hash, so the bytes behind it can never change
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        # Legacy names may be overwritten; let clients revalidate with the ETag
+        response.headers['Cache-Control'] = 'no-cache'
     
-    return '', 404
+    return response
 
 if __name__ == '__main__':
+    warm_up()
     app.run(debug=False, port=5000)
\ No newline at end of file
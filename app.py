@@ -1,4 +1,5 @@
-from api_server import app
+from api_server import app, warm_up
 
 if __name__ == '__main__':
+    warm_up()
     app.run(debug=False, port=5000)
\ No newline at end of file
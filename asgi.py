@@ -0,0 +1,207 @@
+"""
+ASGI entry point for ChatX.
+
+Serves the chat API through chatbot.ainvoke/astream on an AsyncSqliteSaver, so a
+single process can hold many concurrent conversations that are waiting on Gemini
+and tool I/O instead of pinning one worker thread per request.
+
+Run with:
+    uvicorn asgi:app --port 5000
+"""
+
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import aiosqlite
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from admission import Overloaded, async_controller_from_env
+from chat_stream import sse_event, events_from_chunk, extract_response
+from checkpointers import InstrumentedSaver
+from durability import durability_from_env, resolve_durability
+from compressed_serde import serde_from_env
+from checkpoint_maintenance import RetentionSaver, keep_from_env
+from thread_catalog import CatalogSaver
+from sharded_saver import ShardedSaver, shard_paths, shards_from_env
+import metrics
+from tracing import TurnTracer, debug_requested, finish_turn, store_from_env
+
+# Compiled async graph and admission control (asyncio locks), created in lifespan
+# once the event loop is running
+chatbot = None
+admission = None
+trace_store = store_from_env()
+DURABILITY = durability_from_env()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global chatbot, admission
+    import langgraph_tool_backend as backend
+
+    async with AsyncExitStack() as stack:
+        shards = []
+        for path in shard_paths(backend.DB_PATH, shards_from_env()):
+            conn = await stack.enter_async_context(aiosqlite.connect(path))
+            saver = AsyncSqliteSaver(conn, serde=serde_from_env())
+            await saver.setup()
+            if keep_from_env():
+                saver = RetentionSaver(saver, keep=keep_from_env())
+            shards.append(CatalogSaver(saver))
+        checkpointer = InstrumentedSaver(shards[0] if len(shards) == 1 else ShardedSaver(shards))
+        chatbot = backend.build_graph(backend.achat_node).compile(checkpointer=checkpointer)
+        admission = async_controller_from_env()
+        try:
+            yield
+        finally:
+            chatbot = None
+            admission = None
+
+
+async def read_json(request) -> dict:
+    try:
+        data = await request.json()
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def overloaded_response(error: Overloaded):
+    return JSONResponse({'error': str(error)}, status_code=429, headers={'Retry-After': str(error.retry_after)})
+
+
+def chat_config(thread_id: str, tracer: TurnTracer) -> dict:
+    return {
+        "configurable": {"thread_id": thread_id},
+        "run_name": "chat_turn",
+        "callbacks": [tracer],
+    }
+
+
+async def chat(request):
+    try:
+        data = await read_json(request)
+        message = data.get('message', '')
+        thread_id = data.get('thread_id', str(uuid.uuid4()))
+
+        if not message:
+            return JSONResponse({'error': 'Message is required'}, status_code=400)
+        try:
+            durability = resolve_durability(data.get('durability'), DURABILITY)
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+
+        debug = debug_requested(request.headers)
+        if data.get('stream'):
+            return await stream_chat_response(message, thread_id, debug, durability)
+
+        async with admission.admit(thread_id):
+            tracer = TurnTracer(thread_id)
+            try:
+                final_state = await chatbot.ainvoke(
+                    {"messages": [HumanMessage(content=message)]},
+                    config=chat_config(thread_id, tracer),  # type: ignore
+                    durability=durability
+                )
+            except Exception as e:
+                finish_turn(tracer, trace_store, error=e)
+                raise
+            trace = finish_turn(tracer, trace_store)
+
+        body = {
+            'response': extract_response(final_state),
+            'thread_id': thread_id
+        }
+        if debug:
+            body['trace'] = trace
+        return JSONResponse(body)
+
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, status_code=500)
+
+
+async def chat_stream(request):
+    try:
+        data = await read_json(request)
+        message = data.get('message', '')
+        thread_id = data.get('thread_id', str(uuid.uuid4()))
+
+        if not message:
+            return JSONResponse({'error': 'Message is required'}, status_code=400)
+        try:
+            durability = resolve_durability(data.get('durability'), DURABILITY)
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+
+        return await stream_chat_response(message, thread_id, debug_requested(request.headers), durability)
+
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, status_code=500)
+
+
+async def stream_chat_response(message, thread_id, debug=False, durability=None):
+    """Run one chat turn with astream and forward chunks and tool events as SSE"""
+    # Admission happens before the response starts so overload can still be a 429;
+    # the ticket is held until the stream finishes or the client goes away
+    ticket = await admission.acquire(thread_id)
+
+    async def generate():
+        tracer = TurnTracer(thread_id)
+        try:
+            async for chunk, metadata in chatbot.astream(
+                {"messages": [HumanMessage(content=message)]},
+                config=chat_config(thread_id, tracer),  # type: ignore
+                stream_mode="messages",
+                durability=durability or DURABILITY
+            ):
+                for event in events_from_chunk(chunk, metadata):
+                    yield sse_event(event)
+            trace = finish_turn(tracer, trace_store)
+            done = {'type': 'done', 'thread_id': thread_id}
+            if debug:
+                done['trace'] = trace
+            yield sse_event(done)
+        except Exception as e:
+            finish_turn(tracer, trace_store, error=e)
+            yield sse_event({'type': 'error', 'error': str(e), 'thread_id': thread_id})
+        finally:
+            ticket.release()
+
+    return StreamingResponse(
+        generate(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        # Also covers a response that is dropped before the body is iterated
+        background=BackgroundTask(ticket.release),
+    )
+
+
+async def health(request):
+    return JSONResponse({'status': 'healthy'})
+
+
+async def metrics_endpoint(request):
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+app = Starlette(
+    routes=[
+        Route('/api/chat', chat, methods=['POST']),
+        Route('/api/chat/stream', chat_stream, methods=['POST']),
+        Route('/api/health', health, methods=['GET']),
+        Route('/api/metrics', metrics_endpoint, methods=['GET']),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan,
+)
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+End-to-end HTTP load benchmark for the Flask API.
+
+Starts the real server (gunicorn with app:app, or the Flask development server)
+with the scripted offline model (CHATX_LLM_PROVIDER=scripted) and a fresh
+checkpoint database, then keeps `--concurrency` clients busy for `--duration`
+seconds with a weighted mix of:
+
+- chat: POST /api/chat over `--threads` conversations (calculator and expert
+  tool turns as well as plain answers)
+- image: GET /api/image/<file> for a PNG placed in the image directory
+- static: GET / and the files of the React build, when it exists
+
+It reports throughput, p50/p95/p99 latency (overall and per kind), error rate
+with status codes, checkpoint DB growth and the RSS of every server process, as
+JSON with --json so results can be compared between releases:
+
+    python benchmark_http.py --workers 4 --concurrency 32 --duration 30 --json > before.json
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+IMAGE_DIR = os.path.join(ROOT, "static")
+BUILD_DIR = os.path.join(ROOT, "frontend", "build")
+
+CHAT_MESSAGES = [
+    "what is 12*7?",
+    "hi there!",
+    "explain how vector databases work",
+    "write a blog post about remote work",
+    "thanks, that was helpful",
+    "how do I secure my password manager?",
+    "what is (1500 - 320) / 4?",
+    "plan a project timeline for a mobile app launch",
+]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def latency_summary(latencies) -> dict:
+    values = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 2) if seconds is not None else None
+    return {
+        "requests": len(values),
+        "p50_ms": ms(percentile(values, 0.50)),
+        "p95_ms": ms(percentile(values, 0.95)),
+        "p99_ms": ms(percentile(values, 0.99)),
+        "max_ms": ms(values[-1] if values else None),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_kb(pid: int):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def child_pids(pid: int) -> list:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields after it are fixed
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def process_memory(pid: int) -> dict:
+    workers = {child: rss_kb(child) for child in child_pids(pid)}
+    return {
+        "master_rss_kb": rss_kb(pid),
+        "worker_rss_kb": [rss for rss in workers.values() if rss is not None],
+    }
+
+
+def db_bytes(directory: str) -> int:
+    """Size of the checkpoint database files (all shards, WAL included)"""
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+               if name.startswith("chatbot") and ".db" in name)
+
+
+def static_paths() -> list:
+    paths = ["/"]
+    for kind in ("js", "css"):
+        directory = os.path.join(BUILD_DIR, "static", kind)
+        if os.path.isdir(directory):
+            paths.extend(f"/static/{kind}/{name}" for name in sorted(os.listdir(directory))
+                         if name.endswith((".js", ".css")))
+    return paths
+
+
+class Server:
+    """The API server in a subprocess with the scripted model and its own database"""
+
+    def __init__(self, args):
+        self.args = args
+        self.dir = tempfile.mkdtemp(prefix="chatx-bench-")
+        self.port = args.port or free_port()
+        self.process = None
+        self.log = None
+
+    def start(self):
+        env = {
+            **os.environ,
+            "CHATX_LLM_PROVIDER": "scripted",
+            "CHATX_SCRIPTED_LATENCY_MS": str(self.args.llm_latency_ms),
+            "CHATX_SCRIPTED_TOKEN_MS": str(self.args.llm_token_ms),
+            "CHATX_DB_PATH": os.path.join(self.dir, "chatbot.db"),
+            "PYTHONUNBUFFERED": "1",
+        }
+        env.setdefault("GOOGLE_API_KEY", "benchmark-key")
+        if self.args.server == "gunicorn":
+            command = [sys.executable, "-m", "gunicorn", "app:app", "--bind", f"127.0.0.1:{self.port}",
+                       "--workers", str(self.args.workers), "--threads", str(self.args.worker_threads)]
+        else:
+            command = [sys.executable, "-c",
+                       "import sys; from api_server import app, warm_up; warm_up(); "
+                       "app.run(host='127.0.0.1', port=int(sys.argv[1]), threaded=True)", str(self.port)]
+        self.log = open(os.path.join(self.dir, "server.log"), "w")
+        self.process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=self.log, stderr=subprocess.STDOUT)
+        self.wait_ready()
+
+    def wait_ready(self, timeout: float = 120):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with {self.process.returncode}; see {self.log.name}")
+            try:
+                status, _ = request("127.0.0.1", self.port, "GET", "/api/ready")
+                if status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"Server not ready after {timeout}s; see {self.log.name}")
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self.log is not None:
+            self.log.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def request(host, port, method, path, body=None, connection=None):
+    """(status, response bytes); reuses `connection` when given"""
+    conn = connection or http.client.HTTPConnection(host, port, timeout=120)
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    try:
+        conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        if connection is None:
+            conn.close()
+
+
+class Client(threading.Thread):
+    """Sends requests from the mix on one keep-alive connection until the deadline"""
+
+    def __init__(self, index, server, plan, deadline, results):
+        super().__init__(daemon=True)
+        self.index = index
+        self.server = server
+        self.plan = plan
+        self.deadline = deadline
+        self.results = results
+        self.random = random.Random(index)
+
+    def run(self):
+        conn = http.client.HTTPConnection("127.0.0.1", self.server.port, timeout=120)
+        sent = 0
+        while time.monotonic() < self.deadline:
+            kind, method, path, body = self.plan(self.random, self.index, sent)
+            sent += 1
+            start = time.perf_counter()
+            try:
+                status, _ = request("127.0.0.1", self.server.port, method, path, body, connection=conn)
+            except (OSError, http.client.HTTPException) as e:
+                status = type(e).__name__
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", self.server.port, timeout=120)
+            self.results.append((kind, time.perf_counter() - start, status))
+        conn.close()
+
+
+def make_plan(args, image_name):
+    weights = {"chat": args.chat_weight, "image": args.image_weight, "static": args.static_weight}
+    kinds = [kind for kind, weight in weights.items() if weight > 0]
+    statics = static_paths()
+
+    def plan(rng, client, sent):
+        kind = rng.choices(kinds, weights=[weights[k] for k in kinds])[0]
+        if kind == "chat":
+            body = {"message": rng.choice(CHAT_MESSAGES), "thread_id": f"bench-{rng.randrange(args.threads)}"}
+            return kind, "POST", "/api/chat", body
+        if kind == "image":
+            return kind, "GET", f"/api/image/{image_name}", None
+        return kind, "GET", rng.choice(statics), None
+
+    return plan
+
+
+def run(args) -> dict:
+    image_name = f"benchmark_{uuid.uuid4().hex[:8]}.png"
+    created_dir = not os.path.isdir(IMAGE_DIR)
+    os.makedirs(IMAGE_DIR, exist_ok=True)
+    shutil.copyfile(os.path.join(ROOT, "test_image.png"), os.path.join(IMAGE_DIR, image_name))
+    server = Server(args)
+    try:
+        server.start()
+        plan = make_plan(args, image_name)
+        db_before = db_bytes(server.dir)
+        memory_before = process_memory(server.process.pid)
+
+        results = []
+        start = time.monotonic()
+        clients = [Client(i, server, plan, start + args.duration, results) for i in range(args.concurrency)]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        elapsed = time.monotonic() - start
+
+        memory_after = process_memory(server.process.pid)
+        db_after = db_bytes(server.dir)
+    finally:
+        server.stop()
+        os.remove(os.path.join(IMAGE_DIR, image_name))
+        if created_dir and not os.listdir(IMAGE_DIR):
+            os.rmdir(IMAGE_DIR)
+
+    errors = {}
+    by_kind = {}
+    for kind, latency, status in results:
+        by_kind.setdefault(kind, []).append(latency)
+        if not (isinstance(status, int) and status < 400):
+            errors[str(status)] = errors.get(str(status), 0) + 1
+    return {
+        "config": {
+            "server": args.server,
+            "workers": args.workers if args.server == "gunicorn" else 1,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "threads": args.threads,
+            "llm_latency_ms": args.llm_latency_ms,
+            "llm_token_ms": args.llm_token_ms,
+            "mix": {"chat": args.chat_weight, "image": args.image_weight, "static": args.static_weight},
+            "revision": git_revision(),
+        },
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "latency": latency_summary([latency for _, latency, _ in results]),
+        "latency_by_kind": {kind: latency_summary(values) for kind, values in sorted(by_kind.items())},
+        "error_rate": round(sum(errors.values()) / len(results), 4) if results else 0.0,
+        "errors": errors,
+        "db_bytes_before": db_before,
+        "db_bytes_after": db_after,
+        "db_growth_bytes": db_after - db_before,
+        "memory_before": memory_before,
+        "memory_after": memory_after,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Load-test the HTTP API with an offline scripted model")
+    parser.add_argument("--server", choices=["gunicorn", "flask"], default="gunicorn")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument("--worker-threads", type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument("--port", type=int, default=0, help="Port to serve on (default: a free one)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load")
+    parser.add_argument("--threads", type=int, default=50, help="Distinct chat threads")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0, help="Scripted model time to first token")
+    parser.add_argument("--llm-token-ms", type=float, default=0.0, help="Scripted model delay per token")
+    parser.add_argument("--chat-weight", type=float, default=6)
+    parser.add_argument("--image-weight", type=float, default=2)
+    parser.add_argument("--static-weight", type=float, default=2)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    result = run(args)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    config = result["config"]
+    print(f"{config['server']} x{config['workers']}, {config['concurrency']} clients, {config['duration_s']}s")
+    print(f"throughput {result['throughput_rps']} req/s, error rate {result['error_rate']} {result['errors'] or ''}")
+    print(f"{'kind':<8} {'requests':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for kind, summary in [("all", result["latency"])] + list(result["latency_by_kind"].items()):
+        print(f"{kind:<8} {summary['requests']:>9} {summary['p50_ms']!s:>9} {summary['p95_ms']!s:>9} "
+              f"{summary['p99_ms']!s:>9} {summary['max_ms']!s:>9}")
+    print(f"checkpoint DB {result['db_bytes_before']:,} -> {result['db_bytes_after']:,} bytes")
+    print(f"RSS (kB) master {result['memory_after']['master_rss_kb']}, "
+          f"workers {result['memory_after']['worker_rss_kb']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the backend's hot functions.
+
+Each case runs a fixed input a fixed number of times per repeat, after a
+warm-up call, and reports the median (and best) time per call over the
+repeats, so numbers are comparable between runs on the same machine:
+
+- image prompt handling: detect_image_style, optimize_image_prompt_advanced,
+  simplify_prompt_for_api
+- placeholder rendering: create_enhanced_placeholder, create_simple_placeholder
+- the expert tools' keyword matching (each tool's function on a typical query)
+- a checkpointer put + get_tuple round trip at several history lengths
+- retrieve_all_threads at several total checkpoint counts
+
+Results are printed as a table, or as JSON with --json. With --baseline the run
+is compared with an earlier JSON result and cases slower by more than
+--threshold are listed (exit status 1), so a regression shows up as a number:
+
+    python benchmark_micro.py --json > baseline.json
+    python benchmark_micro.py --baseline baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+os.environ.setdefault("CHATX_DB_PATH", os.path.join(tempfile.mkdtemp(), "chatbot.db"))
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+
+import langgraph_tool_backend as backend
+from benchmark_http import git_revision
+from compressed_serde import serde_from_env
+from sqlite_pool import PooledSqliteSaver
+from thread_catalog import CatalogSaver
+
+IMAGE_PROMPT = "a whimsical storybook illustration of a cute fox reading under a tree at sunset, magical forest"
+
+EXPERT_QUERIES = {
+    "code_analyzer": {"code": "def add(a, b):\n    return a - b\n" * 5, "language": "python"},
+    "data_analyst": {"data_query": "analyze monthly sales trends and the correlation with ad spend"},
+    "business_consultant": {"business_query": "growth strategy and pricing for a saas startup"},
+    "content_creator": {"content_type": "blog", "topic": "remote work productivity"},
+    "project_manager": {"task": "plan the launch timeline for a mobile app with a small team"},
+    "financial_advisor": {"financial_query": "how should I invest for retirement and pay off debt"},
+    "legal_advisor": {"legal_query": "what should a freelance contract include about liability"},
+    "hr_specialist": {"hr_query": "how do I run a structured interview for a backend engineer"},
+    "cybersecurity_expert": {"security_query": "how do I protect my company from phishing and ransomware"},
+    "knowledge_assistant": {"question": "explain how vector databases work"},
+}
+
+
+def measure(fn, number: int, repeat: int) -> dict:
+    """Median and best microseconds per call of fn() over `repeat` runs of `number` calls"""
+    with contextlib.redirect_stdout(io.StringIO()):  # several functions log with print
+        fn()
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            runs.append((time.perf_counter() - start) * 1e6 / number)
+    return {"us_per_call": round(statistics.median(runs), 2), "best_us": round(min(runs), 2),
+            "calls": number * repeat}
+
+
+def prompt_cases(scale: float) -> dict:
+    n = max(1, int(2000 * scale))
+    return {
+        "detect_image_style": measure(lambda: backend.detect_image_style(IMAGE_PROMPT), n, 5),
+        "optimize_image_prompt_advanced": measure(lambda: backend.optimize_image_prompt_advanced(IMAGE_PROMPT), n, 5),
+        "simplify_prompt_for_api": measure(lambda: backend.simplify_prompt_for_api(IMAGE_PROMPT), n, 5),
+    }
+
+
+def placeholder_cases(scale: float) -> dict:
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "placeholder.png")
+    optimized = backend.optimize_image_prompt_advanced(IMAGE_PROMPT)
+    n = max(1, int(10 * scale))
+    return {
+        "create_enhanced_placeholder": measure(
+            lambda: backend.create_enhanced_placeholder(path, IMAGE_PROMPT, optimized), n, 3),
+        "create_simple_placeholder": measure(lambda: backend.create_simple_placeholder(path, IMAGE_PROMPT), n, 3),
+    }
+
+
+def expert_cases(scale: float) -> dict:
+    tools = {t.name: t for t in backend.tools}
+    n = max(1, int(500 * scale))
+    return {f"expert.{name}": measure(lambda t=tools[name], a=args: t.func(**a), n, 5)
+            for name, args in EXPERT_QUERIES.items()}
+
+
+def history(length: int) -> list:
+    messages = []
+    for i in range(length // 2):
+        messages.append(HumanMessage(content=f"Question {i}: how does part {i} of the system work?", id=f"h{i}"))
+        messages.append(AIMessage(content=f"Answer {i}: " + "It works like this. " * 20, id=f"a{i}"))
+    return messages
+
+
+def round_trip_cases(lengths, scale: float) -> dict:
+    """put + get_tuple of a checkpoint holding `length` messages, with the app's serializer"""
+    saver = PooledSqliteSaver(os.path.join(tempfile.mkdtemp(), "chatbot.db"), serde=serde_from_env())
+    results = {}
+    for length in lengths:
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": history(length)}
+        config = {"configurable": {"thread_id": f"round-trip-{length}", "checkpoint_ns": ""}}
+        counter = iter(range(10 ** 9))
+
+        def round_trip():
+            checkpoint["id"] = f"1ef00000-0000-6000-8000-{next(counter):012d}"
+            saver.put(config, checkpoint, {"step": 1}, {})
+            saver.get_tuple(config)
+
+        n = max(1, int(200 * scale / max(1, length / 10)))
+        results[f"checkpoint_round_trip.{length}_messages"] = measure(round_trip, n, 3)
+    saver.close()
+    return results
+
+
+def populate(saver, checkpoints: int, per_thread: int = 10):
+    """`checkpoints` small checkpoints over checkpoints / per_thread threads, in one transaction"""
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": history(2)}
+    with saver.batch():
+        for i in range(checkpoints):
+            thread = i // per_thread
+            checkpoint["id"] = f"1ef00000-0000-6000-8000-{i:012d}"
+            saver.put({"configurable": {"thread_id": f"thread-{thread}", "checkpoint_ns": ""}},
+                      checkpoint, {"step": i % per_thread}, {})
+
+
+def thread_list_cases(sizes, scale: float) -> dict:
+    results = {}
+    original = backend.checkpointer
+    try:
+        for size in sizes:
+            saver = CatalogSaver(PooledSqliteSaver(os.path.join(tempfile.mkdtemp(), "chatbot.db"),
+                                                   serde=serde_from_env()))
+            populate(saver, size)
+            backend.checkpointer = saver
+            assert len(backend.retrieve_all_threads()) == size // 10
+            n = max(1, int(20 * scale * 1000 / size))
+            results[f"retrieve_all_threads.{size}_checkpoints"] = measure(backend.retrieve_all_threads, n, 3)
+            saver.close()
+    finally:
+        backend.checkpointer = original
+    return results
+
+
+def run(quick: bool = False) -> dict:
+    scale = 0.1 if quick else 1.0
+    lengths = [10, 100] if quick else [10, 100, 1000]
+    sizes = [1000, 10000] if quick else [1000, 10000, 100000]
+    results = {}
+    results.update(prompt_cases(scale))
+    results.update(placeholder_cases(scale))
+    results.update(expert_cases(scale))
+    results.update(round_trip_cases(lengths, scale))
+    results.update(thread_list_cases(sizes, scale))
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """(case, baseline us, current us, ratio) for cases slower than baseline by more than `threshold`"""
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None or not before["us_per_call"]:
+            continue
+        ratio = result["us_per_call"] / before["us_per_call"]
+        if ratio > 1 + threshold:
+            regressions.append((name, before["us_per_call"], result["us_per_call"], round(ratio, 2)))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for backend hot functions")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations and smaller sizes")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--baseline", help="Earlier --json output to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs the baseline")
+    args = parser.parse_args()
+
+    result = run(quick=args.quick)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{'case':<52} {'us/call':>12} {'best':>12}")
+        for name, case in result["results"].items():
+            print(f"{name:<52} {case['us_per_call']:>12,.2f} {case['best_us']:>12,.2f}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"[WARNING] {name}: {before:,.2f}us -> {after:,.2f}us ({ratio}x)", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
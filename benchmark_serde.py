@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Checkpoint size benchmark for the compressed serializer.
+
+Runs the same synthetic workload (threads of turns in which the model calls one
+of the expert tools and answers in markdown) through the real graph once per
+codec, each into a fresh database, and reports database size, blob bytes and
+time per turn.
+
+    python benchmark_serde.py --threads 20 --turns 10
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+os.environ.setdefault("CHATX_DB_PATH", os.path.join(tempfile.mkdtemp(), "chatbot.db"))
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import langgraph_tool_backend as backend
+from compressed_serde import CompressedSerializer, zstandard
+from sqlite_pool import PooledSqliteSaver
+
+TOOL_CALLS = [
+    ("knowledge_assistant", {"question": "how does {topic} work"}),
+    ("cybersecurity_expert", {"security_query": "how to secure {topic}"}),
+    ("project_manager", {"task": "launch {topic}"}),
+    ("hr_specialist", {"hr_query": "hiring for {topic}"}),
+    ("content_creator", {"content_type": "blog", "topic": "{topic}"}),
+]
+TOPICS = ["vector databases", "kubernetes", "rust", "solar panels", "sourdough", "jazz harmony"]
+
+
+class WorkloadModel(BaseChatModel):
+    """Calls a tool for every user message, then answers in markdown"""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        last = messages[-1]
+        if isinstance(last, HumanMessage):
+            turn = sum(isinstance(m, HumanMessage) for m in messages)
+            name, args = TOOL_CALLS[turn % len(TOOL_CALLS)]
+            topic = TOPICS[turn % len(TOPICS)]
+            message = AIMessage(content="", tool_calls=[{
+                "name": name, "args": {k: v.format(topic=topic) for k, v in args.items()}, "id": f"call-{turn}",
+            }])
+        else:
+            tool_output = last.content if isinstance(last, ToolMessage) else ""
+            lines = [line for line in tool_output.splitlines() if line.strip()][:12]
+            message = AIMessage(content="Here is what I found:\n\n" + "\n".join(lines) +
+                                "\n\nLet me know if you want more detail on any of these points.",
+                                usage_metadata={"input_tokens": 900, "output_tokens": 250, "total_tokens": 1150})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @property
+    def _llm_type(self) -> str:
+        return "workload"
+
+
+def run(codec: str, threads: int, turns: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "chatbot.db")
+    saver = PooledSqliteSaver(path, serde=CompressedSerializer(codec=codec))
+    graph = backend.build_graph().compile(checkpointer=saver)
+
+    original = backend.llm_with_tools
+    backend.llm_with_tools = WorkloadModel()
+    try:
+        start = time.perf_counter()
+        for thread in range(threads):
+            config = {"configurable": {"thread_id": f"bench-{thread}"}}
+            for turn in range(turns):
+                graph.invoke({"messages": [HumanMessage(content=f"Question {turn} on thread {thread}")]}, config)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for thread in range(threads):
+            graph.get_state({"configurable": {"thread_id": f"bench-{thread}"}})
+        load_ms = (time.perf_counter() - start) * 1000 / threads
+    finally:
+        backend.llm_with_tools = original
+
+    with saver.cursor() as cur:
+        cur.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        blob_bytes = cur.execute(
+            "SELECT (SELECT COALESCE(SUM(LENGTH(checkpoint)), 0) FROM checkpoints) + "
+            "(SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes)"
+        ).fetchone()[0]
+    saver.close()
+    with sqlite3.connect(path) as conn:
+        conn.execute("VACUUM")
+    return {
+        "codec": codec,
+        "db_bytes": os.path.getsize(path),
+        "blob_bytes": blob_bytes,
+        "ms_per_turn": round(elapsed * 1000 / (threads * turns), 2),
+        "ms_per_state_load": round(load_ms, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare checkpoint sizes with and without compression")
+    parser.add_argument("--threads", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    codecs = ["none", "zlib"] + (["zstd"] if zstandard is not None else [])
+    results = [run(codec, args.threads, args.turns) for codec in codecs]
+    baseline = results[0]
+    for result in results:
+        result["db_ratio"] = round(baseline["db_bytes"] / result["db_bytes"], 2)
+        result["blob_ratio"] = round(baseline["blob_bytes"] / result["blob_bytes"], 2)
+
+    if args.json:
+        print(json.dumps({"threads": args.threads, "turns": args.turns, "results": results}, indent=2))
+        return
+    print(f"{args.threads} threads x {args.turns} turns")
+    print(f"{'codec':<6} {'db size':>12} {'ratio':>6} {'blobs':>12} {'ratio':>6} {'ms/turn':>8} {'ms/load':>8}")
+    for r in results:
+        print(f"{r['codec']:<6} {r['db_bytes']:>12,} {r['db_ratio']:>5}x {r['blob_bytes']:>12,} "
+              f"{r['blob_ratio']:>5}x {r['ms_per_turn']:>8} {r['ms_per_state_load']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Input-token benchmark for the tool pre-router.
+
+Routes a labelled corpus of user messages (each with the tool a good answer
+needs, or none) and reports routing latency, how often the needed tool was
+bound, how often the router fell back to all tools, the tool-schema tokens
+sent per call with and without routing, and how many calls the lite model tier
+would take.
+
+With --traces it instead reads the usage logs in turn_traces (tracing.py): each
+logged LLM call has Gemini's input_tokens and the tools the router bound, so the
+schema tokens routing removed can be added back to get what the call would have
+cost with every tool bound.
+
+    python benchmark_tool_router.py
+    python benchmark_tool_router.py --traces traces.db --json
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+os.environ.setdefault("CHATX_DB_PATH", os.path.join(tempfile.mkdtemp(), "chatbot.db"))
+
+from langchain_core.messages import HumanMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+import langgraph_tool_backend as backend
+from context_window import CHARS_PER_TOKEN
+from model_tiers import LITE, STANDARD
+from tool_router import ToolRouter
+
+# (user message, tool a good answer calls, or None when no tool is needed)
+CORPUS = [
+    ("What is 17.5% of 2340?", "calculator"),
+    ("calculate 1234 * 5678", "calculator"),
+    ("what's (45+55)/4", "calculator"),
+    ("How much is 3 to the power of 8?", "calculator"),
+    ("What's the current stock price of AAPL?", "get_stock_price"),
+    ("How are TSLA shares trading at the moment?", "get_stock_price"),
+    ("Check the ticker NVDA for me", "get_stock_price"),
+    ("What happened in the news today?", "duckduckgo_search"),
+    ("Who won the champions league final this year?", "duckduckgo_search"),
+    ("Search for the latest Python release", "duckduckgo_search"),
+    ("What's the weather like in Berlin?", "duckduckgo_search"),
+    ("Draw a picture of a cat wearing a space suit", "generate_image"),
+    ("Generate an image of a sunset over mountains", "generate_image"),
+    ("Make me a minimalist logo for a coffee shop", "generate_image"),
+    ("Can you review this code: def add(a, b): return a - b", "code_analyzer"),
+    ("Why does my javascript function return undefined?", "code_analyzer"),
+    ("Help me debug this Python traceback", "code_analyzer"),
+    ("Analyze this CSV data and find the trends", "data_analyst"),
+    ("What's the correlation between ad spend and signups in my dataset?", "data_analyst"),
+    ("How should I price my SaaS startup?", "business_consultant"),
+    ("Give me a growth strategy for a small bakery business", "business_consultant"),
+    ("Do a SWOT analysis of our competitor", "business_consultant"),
+    ("Write a blog post about remote work", "content_creator"),
+    ("Draft a LinkedIn post announcing our new product", "content_creator"),
+    ("Write an email to customers about the outage", "content_creator"),
+    ("Create a project timeline for a mobile app launch", "project_manager"),
+    ("Plan a two-week sprint for the team", "project_manager"),
+    ("How should I invest $10,000 for retirement?", "financial_advisor"),
+    ("Help me make a monthly budget and pay off debt", "financial_advisor"),
+    ("Is a 15 or 30 year mortgage better?", "financial_advisor"),
+    ("What should a freelance contract include?", "legal_advisor"),
+    ("Can I trademark my company name?", "legal_advisor"),
+    ("What does GDPR require for a newsletter signup?", "legal_advisor"),
+    ("How do I run a good job interview?", "hr_specialist"),
+    ("Write a job description for a backend engineer", "hr_specialist"),
+    ("How should I handle an employee performance review?", "hr_specialist"),
+    ("How do I protect my company from phishing?", "cybersecurity_expert"),
+    ("Is it safe to reuse passwords with a password manager?", "cybersecurity_expert"),
+    ("How do I fix an SQL injection vulnerability?", "cybersecurity_expert"),
+    ("Explain how vector databases work", "knowledge_assistant"),
+    ("What is the difference between TCP and UDP?", "knowledge_assistant"),
+    ("Tell me about the history of jazz", "knowledge_assistant"),
+    ("hi!", None),
+    ("thanks, that was helpful", None),
+    ("can you make it shorter?", None),
+    ("ok sounds good", None),
+]
+
+
+def schema_tokens(tool) -> int:
+    """Estimated prompt tokens of one tool's function declaration"""
+    return len(json.dumps(convert_to_openai_tool(tool))) // CHARS_PER_TOKEN
+
+
+def bench_corpus(router: ToolRouter, repeat: int) -> dict:
+    tokens = {t.name: schema_tokens(t) for t in router.tools}
+    full_tokens = sum(tokens.values())
+    latencies, bound_tokens, bound_counts = [], [], []
+    found = needed = fallbacks = 0
+    tiers = {LITE: 0, STANDARD: 0}
+    for text, expected in CORPUS:
+        messages = [HumanMessage(content=text)]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            names = router.route(messages)
+        latencies.append((time.perf_counter() - start) * 1e6 / repeat)
+        tiers[router.policy.choose(messages, names)[0]] += 1
+        if names is None or names == router.all_tools:
+            fallbacks += 1
+            names = set(tokens)
+        bound_counts.append(len(names))
+        bound_tokens.append(sum(tokens[name] for name in names))
+        if expected is not None:
+            needed += 1
+            found += expected in names
+
+    latencies.sort()
+    mean_tokens = sum(bound_tokens) / len(bound_tokens)
+    return {
+        "messages": len(CORPUS),
+        "route_us_mean": round(sum(latencies) / len(latencies), 1),
+        "route_us_max": round(latencies[-1], 1),
+        "needed_tool_bound": round(found / needed, 3),
+        "fallback_rate": round(fallbacks / len(CORPUS), 3),
+        "tools_bound_mean": round(sum(bound_counts) / len(bound_counts), 2),
+        "schema_tokens_full": full_tokens,
+        "schema_tokens_routed_mean": round(mean_tokens, 1),
+        "schema_tokens_saved_per_call": round(full_tokens - mean_tokens, 1),
+        "lite_tier_rate": round(tiers[LITE] / len(CORPUS), 3),
+    }
+
+
+def bench_traces(path: str, tools) -> dict:
+    """Input-token savings of routed LLM calls recorded in a turn_traces database"""
+    tokens = {t.name: schema_tokens(t) for t in tools}
+    full_tokens = sum(tokens.values())
+    calls = routed = logged_input = saved = 0
+    by_tier = {}
+    with sqlite3.connect(path) as conn:
+        for (trace,) in conn.execute("SELECT trace FROM turn_traces"):
+            for step in json.loads(trace)["steps"]:
+                for call in step["llm_calls"]:
+                    usage = call.get("usage") or {}
+                    if "input_tokens" not in usage or call.get("cached"):
+                        continue
+                    calls += 1
+                    logged_input += usage["input_tokens"]
+                    if call.get("tier"):
+                        by_tier[call["tier"]] = by_tier.get(call["tier"], 0) + 1
+                    bound = call.get("tools")
+                    if bound is not None:
+                        routed += 1
+                        saved += full_tokens - sum(tokens.get(name, 0) for name in bound)
+    without_routing = logged_input + saved
+    return {
+        "llm_calls": calls,
+        "routed_calls": routed,
+        "input_tokens_logged": logged_input,
+        "input_tokens_without_routing": without_routing,
+        "input_tokens_saved": saved,
+        "saved_fraction": round(saved / without_routing, 3) if without_routing else 0.0,
+        "calls_by_tier": by_tier,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the tool-schema tokens saved by per-turn tool routing")
+    parser.add_argument("--max-tools", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=200, help="Routing repetitions per message, for timing")
+    parser.add_argument("--traces", help="Report savings from the usage logs in this turn_traces database")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    router = ToolRouter(backend.llm, backend.tools, max_tools=args.max_tools)
+    if args.traces:
+        result = bench_traces(args.traces, backend.tools)
+    else:
+        result = bench_corpus(router, args.repeat)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    for name, value in result.items():
+        print(f"{name:<32} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,4 +8,7 @@ npm run build
 cd ..
 
 # Install Python dependencies
-pip install -r requirements.txt
\ No newline at end of file
+pip install -r requirements.txt
+
+# Precompress the build (gzip, plus brotli when installed) so workers skip it at startup
+python static_assets.py frontend/build
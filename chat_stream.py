@@ -0,0 +1,73 @@
+"""
+Helpers for turning LangGraph message streams into Server-Sent Events.
+
+Shared by the Flask API server and any other entry point that streams chat turns.
+"""
+
+import json
+
+
+def sse_event(payload: dict) -> str:
+    """Format a payload as a single SSE `data:` frame"""
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+def message_text(content) -> str:
+    """Return the plain text of a message content (string or list of parts)"""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for part in content:
+            if isinstance(part, str):
+                parts.append(part)
+            elif isinstance(part, dict) and part.get("type") == "text":
+                parts.append(part.get("text", ""))
+        return "".join(parts)
+    return ""
+
+
+def events_from_chunk(chunk, metadata: dict) -> list[dict]:
+    """
+    Translate one `(chunk, metadata)` pair from `stream_mode="messages"`
+    into zero or more client events.
+    """
+    events = []
+    msg_type = getattr(chunk, "type", None)
+
+    if msg_type in ("AIMessageChunk", "ai"):
+        # Tool call requests arrive as tool_call_chunks while streaming, or as
+        # complete tool_calls when a node returns a finished message
+        tool_calls = getattr(chunk, "tool_call_chunks", None) or getattr(chunk, "tool_calls", None) or []
+        for tool_call in tool_calls:
+            if tool_call.get("name"):
+                events.append({
+                    "type": "tool_start",
+                    "name": tool_call["name"],
+                    "tool_call_id": tool_call.get("id"),
+                })
+
+        text = message_text(getattr(chunk, "content", ""))
+        if text:
+            events.append({"type": "chunk", "content": text})
+
+    elif msg_type == "tool":
+        events.append({
+            "type": "tool_end",
+            "name": getattr(chunk, "name", None),
+            "tool_call_id": getattr(chunk, "tool_call_id", None),
+            "status": getattr(chunk, "status", "success"),
+        })
+
+    return events
+
+
+def extract_response(final_state) -> str:
+    """Return the text of the last AI message in a final graph state"""
+    response = "I'm sorry, I couldn't process your request."
+    if "messages" in final_state:
+        for msg in reversed(final_state["messages"]):
+            if hasattr(msg, 'type') and msg.type == 'ai' and hasattr(msg, 'content'):
+                response = msg.content
+                break
+    return response
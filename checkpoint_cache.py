@@ -0,0 +1,190 @@
+"""
+In-memory cache of hot thread states in front of the SQLite checkpointer.
+
+Each turn starts with get_tuple for the thread's latest checkpoint, which reads
+and deserializes the whole message history, usually one this worker wrote
+seconds earlier. CachingSaver keeps the latest checkpoint of recently active
+threads in memory, written through on put and bounded by an estimate of its
+size in bytes (least recently used threads are evicted first).
+
+Several workers share the database, so by default a hit is only served after
+checking that the cached checkpoint_id is still the thread's latest, which is
+an index lookup that reads no checkpoint blob. With a single worker that check
+can be turned off (CHATX_CHECKPOINT_CACHE_VALIDATE=0) to skip SQLite entirely.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from langgraph.checkpoint.base import CheckpointTuple, copy_checkpoint, get_checkpoint_metadata
+
+from checkpointers import DelegatingSaver
+
+LATEST_CHECKPOINT_ID = """
+SELECT checkpoint_id FROM checkpoints
+WHERE thread_id = ? AND checkpoint_ns = ?
+ORDER BY checkpoint_id DESC LIMIT 1
+"""
+
+# Rough per-object overhead of a deserialized message or channel value
+OBJECT_OVERHEAD = 256
+
+
+def estimate_size(checkpoint) -> int:
+    """Approximate in-memory size of a checkpoint, dominated by message text"""
+    size = OBJECT_OVERHEAD
+    for value in checkpoint.get("channel_values", {}).values():
+        items = value if isinstance(value, list) else [value]
+        for item in items:
+            content = getattr(item, "content", item)
+            size += OBJECT_OVERHEAD + len(content if isinstance(content, str) else str(content))
+            for call in getattr(item, "tool_calls", None) or []:
+                size += OBJECT_OVERHEAD + len(str(call.get("args", "")))
+    return size
+
+
+class CachingSaver(DelegatingSaver):
+    """Write-through LRU of each thread's latest checkpoint, bounded by bytes"""
+
+    def __init__(self, inner, max_bytes: int = 64 * 1024 * 1024, validate: bool = True):
+        super().__init__(inner)
+        self.max_bytes = max_bytes
+        self.validate = validate
+        self._entries = OrderedDict()  # (thread_id, checkpoint_ns) -> (CheckpointTuple, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+
+    def get_tuple(self, config):
+        configurable = config["configurable"]
+        key = (str(configurable["thread_id"]), configurable.get("checkpoint_ns", ""))
+        requested = configurable.get("checkpoint_id")
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            cached_id = entry[0].config["configurable"]["checkpoint_id"]
+            if requested:
+                fresh = requested == cached_id
+            else:
+                fresh = not self.validate or self._latest_id(*key) == cached_id
+            if fresh:
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                self._count("hits")
+                return self._copy(entry[0])
+            if not requested:
+                # Another worker wrote a newer checkpoint
+                self._count("stale")
+                self._drop(key, cached_id)
+        self._count("misses")
+
+        saved = self.inner.get_tuple(config)
+        if saved is not None and not requested:
+            self._store(key, saved)
+        return saved
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = self.inner.put(config, checkpoint, metadata, new_versions)
+        configurable = config["configurable"]
+        parent_config = None
+        if configurable.get("checkpoint_id"):
+            parent_config = {"configurable": {
+                "thread_id": configurable["thread_id"],
+                "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+                "checkpoint_id": configurable["checkpoint_id"],
+            }}
+        saved = CheckpointTuple(
+            next_config, copy_checkpoint(checkpoint), get_checkpoint_metadata(config, metadata), parent_config, []
+        )
+        self._store((str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")), saved)
+        return next_config
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        self.inner.put_writes(config, writes, task_id, task_path)
+        # Pending writes belong to the cached tuple; reload it rather than merge them
+        configurable = config["configurable"]
+        self._drop((str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")),
+                   configurable.get("checkpoint_id"))
+
+    def delete_thread(self, thread_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == str(thread_id)]:
+                self._bytes -= self._entries.pop(key)[1]
+        return self.inner.delete_thread(thread_id)
+
+    def _latest_id(self, thread_id, checkpoint_ns):
+        with self.inner.cursor(transaction=False) as cur:
+            row = cur.execute(LATEST_CHECKPOINT_ID, (thread_id, checkpoint_ns)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _copy(saved):
+        # The graph mutates the checkpoint it resumes from; keep the cached one intact
+        return saved._replace(checkpoint=copy_checkpoint(saved.checkpoint),
+                              pending_writes=list(saved.pending_writes or []))
+
+    def _store(self, key, saved):
+        size = estimate_size(saved.checkpoint)
+        checkpoint_id = saved.config["configurable"]["checkpoint_id"]
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None:
+                # A read that raced with a put must not replace the newer checkpoint
+                if old[0].config["configurable"]["checkpoint_id"] > checkpoint_id:
+                    return
+                del self._entries[key]
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (saved, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._stats["evictions"] += 1
+
+    def _drop(self, key, checkpoint_id=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if checkpoint_id is None or entry[0].config["configurable"]["checkpoint_id"] == checkpoint_id:
+                del self._entries[key]
+                self._bytes -= entry[1]
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def cache_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes})
+        return stats
+
+
+def merge_stats(caches) -> dict:
+    """Combined stats of several caches (one per shard)"""
+    if not caches:
+        return {"enabled": False}
+    totals = {}
+    for cache in caches:
+        for name, value in cache.cache_stats().items():
+            totals[name] = totals.get(name, 0) + value
+    lookups = totals["hits"] + totals["misses"]
+    totals.update({"enabled": True, "hit_rate": round(totals["hits"] / lookups, 4) if lookups else 0.0})
+    return totals
+
+
+def checkpoint_cache_from_env(inner, shards: int = 1):
+    """Wrap `inner` in a CachingSaver unless CHATX_CHECKPOINT_CACHE_MB=0; the budget is split across shards"""
+    max_mb = float(os.getenv("CHATX_CHECKPOINT_CACHE_MB", "64"))
+    if max_mb <= 0:
+        return inner
+    return CachingSaver(
+        inner,
+        max_bytes=int(max_mb * 1024 * 1024 / max(1, shards)),
+        validate=os.getenv("CHATX_CHECKPOINT_CACHE_VALIDATE", "1") != "0",
+    )
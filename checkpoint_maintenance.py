@@ -0,0 +1,168 @@
+"""
+Checkpoint retention and compaction for chatbot.db.
+
+SqliteSaver keeps a checkpoint for every superstep of every thread. The app only
+ever reads a thread's latest checkpoint, so we keep the newest `keep` per thread
+(which always includes the latest) and delete the rest with their pending writes:
+
+- online, through RetentionSaver, right after each checkpoint is written;
+- offline, with the compaction command, which also truncates the WAL and VACUUMs:
+
+    python checkpoint_maintenance.py --db chatbot.db --keep 20
+"""
+
+import argparse
+import os
+import sqlite3
+
+from checkpointers import DelegatingSaver
+
+PRUNE_THREAD_CHECKPOINTS = """
+DELETE FROM checkpoints
+WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (
+    SELECT checkpoint_id FROM checkpoints
+    WHERE thread_id = ? AND checkpoint_ns = ?
+    ORDER BY checkpoint_id DESC LIMIT ?
+)
+"""
+
+PRUNE_THREAD_WRITES = """
+DELETE FROM writes
+WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (
+    SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+)
+"""
+
+# Checkpoint ids are time-ordered (uuid6), so DESC order is newest first
+PRUNE_ALL_CHECKPOINTS = """
+DELETE FROM checkpoints WHERE rowid IN (
+    SELECT rowid FROM (
+        SELECT rowid, ROW_NUMBER() OVER (
+            PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+        ) AS position
+        FROM checkpoints
+    ) WHERE position > ?
+)
+"""
+
+PRUNE_ORPHAN_WRITES = """
+DELETE FROM writes WHERE NOT EXISTS (
+    SELECT 1 FROM checkpoints c
+    WHERE c.thread_id = writes.thread_id
+      AND c.checkpoint_ns = writes.checkpoint_ns
+      AND c.checkpoint_id = writes.checkpoint_id
+)
+"""
+
+
+def prune_thread(cur, thread_id: str, checkpoint_ns: str, keep: int) -> int:
+    """Delete all but the newest `keep` checkpoints of one thread; return rows deleted"""
+    cur.execute(PRUNE_THREAD_CHECKPOINTS, (thread_id, checkpoint_ns, thread_id, checkpoint_ns, keep))
+    deleted = cur.rowcount
+    if deleted:
+        cur.execute(PRUNE_THREAD_WRITES, (thread_id, checkpoint_ns, thread_id, checkpoint_ns))
+        deleted += cur.rowcount
+    return deleted
+
+
+class RetentionSaver(DelegatingSaver):
+    """Applies the retention policy to a thread after each checkpoint written to it"""
+
+    def __init__(self, inner, keep: int = 20):
+        if keep < 1:
+            raise ValueError("keep must be at least 1 so the latest checkpoint survives")
+        super().__init__(inner)
+        self.keep = keep
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = self.inner.put(config, checkpoint, metadata, new_versions)
+        configurable = next_config["configurable"]
+        # SqliteSaver.cursor takes the saver's lock and commits on exit
+        with self.inner.cursor() as cur:
+            prune_thread(cur, configurable["thread_id"], configurable.get("checkpoint_ns", ""), self.keep)
+        return next_config
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        next_config = await self.inner.aput(config, checkpoint, metadata, new_versions)
+        configurable = next_config["configurable"]
+        thread_id, checkpoint_ns = configurable["thread_id"], configurable.get("checkpoint_ns", "")
+        # AsyncSqliteSaver: aiosqlite connection guarded by an asyncio lock
+        async with self.inner.lock:
+            cur = await self.inner.conn.execute(
+                PRUNE_THREAD_CHECKPOINTS, (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.keep)
+            )
+            if cur.rowcount:
+                await self.inner.conn.execute(
+                    PRUNE_THREAD_WRITES, (thread_id, checkpoint_ns, thread_id, checkpoint_ns)
+                )
+            await self.inner.conn.commit()
+        return next_config
+
+
+def database_size(path: str) -> int:
+    """Bytes used by the database file plus its WAL and shared-memory files"""
+    return sum(os.path.getsize(p) for p in (path, path + "-wal", path + "-shm") if os.path.exists(p))
+
+
+def compact(path: str, keep: int, vacuum: bool = True) -> dict:
+    """Prune every thread to `keep` checkpoints, truncate the WAL and VACUUM"""
+    if keep < 1:
+        raise ValueError("keep must be at least 1")
+    size_before = database_size(path)
+    conn = sqlite3.connect(path)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if "checkpoints" not in tables:
+            raise ValueError(f"{path} has no checkpoints table")
+
+        (checkpoints_before,) = conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()
+        with conn:
+            checkpoints_deleted = conn.execute(PRUNE_ALL_CHECKPOINTS, (keep,)).rowcount
+            writes_deleted = conn.execute(PRUNE_ORPHAN_WRITES).rowcount if "writes" in tables else 0
+
+        # A busy result means another process still reads an old WAL snapshot
+        busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        if vacuum:
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+    size_after = database_size(path)
+    return {
+        "checkpoints_before": checkpoints_before,
+        "checkpoints_deleted": checkpoints_deleted,
+        "writes_deleted": writes_deleted,
+        "wal_checkpoint_busy": bool(busy),
+        "bytes_before": size_before,
+        "bytes_after": size_after,
+        "bytes_reclaimed": size_before - size_after,
+    }
+
+
+def keep_from_env() -> int:
+    """CHATX_CHECKPOINT_KEEP checkpoints per thread; 0 keeps everything"""
+    return int(os.getenv("CHATX_CHECKPOINT_KEEP", "20"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prune old checkpoints and compact the SQLite database")
+    parser.add_argument("--db", default=os.getenv("CHATX_DB_PATH", "chatbot.db"), help="checkpoint database")
+    parser.add_argument("--keep", type=int, default=keep_from_env() or 20,
+                        help="checkpoints to keep per thread (default: CHATX_CHECKPOINT_KEEP or 20)")
+    parser.add_argument("--no-vacuum", action="store_true", help="prune and truncate the WAL only")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} does not exist")
+    result = compact(args.db, args.keep, vacuum=not args.no_vacuum)
+    print(f"[INFO] Deleted {result['checkpoints_deleted']} of {result['checkpoints_before']} checkpoints "
+          f"and {result['writes_deleted']} writes (keeping {args.keep} per thread)")
+    if result["wal_checkpoint_busy"]:
+        print("[WARNING] WAL could not be fully truncated; another process is reading the database")
+    print(f"[INFO] {result['bytes_before']} -> {result['bytes_after']} bytes "
+          f"({result['bytes_reclaimed']} bytes reclaimed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Checkpointer wrappers layered around the SqliteSaver.
+
+`DelegatingSaver` forwards every BaseCheckpointSaver method to an inner saver,
+so a wrapper only overrides the calls it cares about. Attributes it does not
+define (`conn`, `lock`, `setup`, ...) fall through to the inner saver.
+"""
+
+import time
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+from metrics import CHECKPOINT_DURATION
+
+
+class DelegatingSaver(BaseCheckpointSaver):
+    """Base class for savers that wrap another saver"""
+
+    def __init__(self, inner: BaseCheckpointSaver):
+        super().__init__(serde=inner.serde)
+        self.inner = inner
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the wrapper itself
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    @property
+    def config_specs(self) -> list:
+        return self.inner.config_specs
+
+    def get_tuple(self, config):
+        return self.inner.get_tuple(config)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        return self.inner.list(config, filter=filter, before=before, limit=limit)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        return self.inner.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        return self.inner.put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id):
+        return self.inner.delete_thread(thread_id)
+
+    async def aget_tuple(self, config):
+        return await self.inner.aget_tuple(config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        async for item in self.inner.alist(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await self.inner.aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await self.inner.aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await self.inner.adelete_thread(thread_id)
+
+    def get_next_version(self, current, channel):
+        return self.inner.get_next_version(current, channel)
+
+
+class InstrumentedSaver(DelegatingSaver):
+    """Records checkpoint read/write latency in chatx_checkpoint_duration_seconds"""
+
+    def get_tuple(self, config):
+        with CHECKPOINT_DURATION.time(operation="get_tuple"):
+            return self.inner.get_tuple(config)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        # Stays lazy: only the time spent fetching items counts, not the caller's loop
+        # body, and it is recorded once the caller finishes or stops iterating
+        items = self.inner.list(config, filter=filter, before=before, limit=limit)
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(items)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield item
+        finally:
+            # The inner listing may hold a cursor (and its lock) until closed
+            if hasattr(items, "close"):
+                items.close()
+            CHECKPOINT_DURATION.observe(elapsed, operation="list")
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with CHECKPOINT_DURATION.time(operation="put"):
+            return self.inner.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        with CHECKPOINT_DURATION.time(operation="put_writes"):
+            return self.inner.put_writes(config, writes, task_id, task_path)
+
+    async def aget_tuple(self, config):
+        with CHECKPOINT_DURATION.time(operation="get_tuple"):
+            return await self.inner.aget_tuple(config)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        with CHECKPOINT_DURATION.time(operation="put"):
+            return await self.inner.aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        with CHECKPOINT_DURATION.time(operation="put_writes"):
+            return await self.inner.aput_writes(config, writes, task_id, task_path)
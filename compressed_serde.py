@@ -0,0 +1,108 @@
+"""
+Compressed checkpoint serializer.
+
+Every checkpoint stores the whole `messages` channel again, including the long
+markdown answers of the expert tools, so most of chatbot.db is the same text
+written over and over. CompressedSerializer wraps LangGraph's JsonPlusSerializer
+and compresses each blob with zlib (or zstd, when the `zstandard` package is
+installed), primed with a preset dictionary of what ChatX checkpoints contain:
+the tools' output, LangChain's message fields and Gemini's response metadata
+(serde_dictionaries.py).
+
+The codec is recorded in the row's type column ("msgpack+zlib1"), so rows
+written before compression was enabled ("msgpack") and rows written with a
+different codec stay readable.
+
+Set CHATX_CHECKPOINT_COMPRESSION to zlib (default), zstd or none.
+"""
+
+import os
+import re
+import zlib
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from serde_dictionaries import DICTIONARIES
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is always available
+    zstandard = None
+
+# New rows use this dictionary; rows name theirs in the type column
+DICTIONARY_VERSION = 1
+
+# "zlib1" = zlib with dictionary version 1
+CODEC_TAG = re.compile(r"([a-z]+)(\d+)")
+
+# Blobs shorter than this (versions, small pending writes) are stored as is
+MIN_SIZE = 128
+
+
+class CompressedSerializer(JsonPlusSerializer):
+    """JsonPlusSerializer that stores compressed blobs tagged with their codec"""
+
+    def __init__(self, codec: str = "zlib", level: int = None, min_size: int = MIN_SIZE, **kwargs):
+        super().__init__(**kwargs)
+        if codec not in ("zlib", "zstd", "none"):
+            raise ValueError("codec must be zlib, zstd or none")
+        if codec == "zstd" and zstandard is None:
+            print("[WARNING] zstandard is not installed; compressing checkpoints with zlib")
+            codec = "zlib"
+        self.codec = codec
+        self.level = level
+        self.min_size = min_size
+        self._zstd = {}
+
+    def _zstd_dict(self, version: int):
+        if version not in self._zstd:
+            self._zstd[version] = zstandard.ZstdCompressionDict(
+                DICTIONARIES[version], dict_type=zstandard.DICT_TYPE_RAWCONTENT
+            )
+        return self._zstd[version]
+
+    def compress(self, data: bytes, codec: str, version: int = DICTIONARY_VERSION) -> bytes:
+        if codec == "zlib":
+            level = 6 if self.level is None else self.level
+            compressor = zlib.compressobj(level, zdict=DICTIONARIES[version])
+            return compressor.compress(data) + compressor.flush()
+        level = 3 if self.level is None else self.level
+        # Compressors are not thread-safe; they are cheap to create
+        return zstandard.ZstdCompressor(level=level, dict_data=self._zstd_dict(version)).compress(data)
+
+    def decompress(self, data: bytes, codec: str, version: int) -> bytes:
+        if codec == "zlib":
+            decompressor = zlib.decompressobj(zdict=DICTIONARIES[version])
+            return decompressor.decompress(data) + decompressor.flush()
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("checkpoint was written with zstd; install the zstandard package to read it")
+            return zstandard.ZstdDecompressor(dict_data=self._zstd_dict(version)).decompress(data)
+        raise ValueError(f"Unknown checkpoint compression: {codec}")
+
+    def dumps_typed(self, obj):
+        type_, data = super().dumps_typed(obj)
+        if self.codec == "none" or len(data) < self.min_size:
+            return type_, data
+        compressed = self.compress(data, self.codec)
+        if len(compressed) >= len(data):
+            return type_, data
+        return f"{type_}+{self.codec}{DICTIONARY_VERSION}", compressed
+
+    def loads_typed(self, data):
+        type_, blob = data
+        if "+" not in type_:
+            # Uncompressed row, including everything written before compression
+            return super().loads_typed(data)
+        type_, tag = type_.split("+", 1)
+        match = CODEC_TAG.fullmatch(tag)
+        if match is None:
+            raise ValueError(f"Unknown checkpoint compression: {tag}")
+        codec, version = match.group(1), int(match.group(2))
+        if version not in DICTIONARIES:
+            raise ValueError(f"Unknown checkpoint compression dictionary: {tag}")
+        return super().loads_typed((type_, self.decompress(blob, codec, version)))
+
+
+def serde_from_env() -> CompressedSerializer:
+    return CompressedSerializer(codec=os.getenv("CHATX_CHECKPOINT_COMPRESSION", "zlib").lower())
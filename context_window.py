@@ -0,0 +1,148 @@
+"""
+Token-budgeted history window for chat_node.
+
+Only the most recent part of a thread is sent to Gemini verbatim. Once the
+not-yet-summarized messages exceed `max_tokens`, the older ones are folded into a
+rolling summary kept in ChatState (`summary`, plus `summarized_messages`, the
+number of leading messages it covers) and only about `keep_tokens` of recent
+history stays verbatim. The prompt therefore stays roughly the same size however
+long the thread gets, and the summarizer runs once per `max_tokens - keep_tokens`
+of new history rather than on every turn.
+
+The window always starts at a user message, so an assistant tool call is never
+separated from its tool results.
+"""
+
+import json
+import os
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from chat_stream import message_text
+
+# Rough but provider-independent; Gemini averages ~4 characters per token
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+# Tool outputs (search results, reports) can be huge; the summarizer sees a prefix
+SUMMARY_INPUT_CHARS_PER_MESSAGE = 2000
+
+SUMMARY_INSTRUCTIONS = (
+    "You maintain a running summary of a conversation between a user and an AI assistant. "
+    "Update the summary with the new messages below. Keep facts, names, numbers, decisions, "
+    "open questions and the results of tool calls the assistant may need later. "
+    "Be concise: at most {max_words} words. Reply with the summary only."
+)
+
+
+def estimate_tokens(message) -> int:
+    chars = len(message_text(message.content))
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        chars += len(tool_call["name"]) + len(json.dumps(tool_call["args"], default=str))
+    return chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def window_start(messages, start: int, keep_tokens: int) -> int:
+    """
+    Index of the earliest user message at or after `start` such that the messages
+    from there fit in `keep_tokens`. Falls back to the last user message (the
+    current turn is always kept whole), or `start` if there is none.
+    """
+    boundaries = [i for i in range(start, len(messages)) if isinstance(messages[i], HumanMessage)]
+    if not boundaries:
+        return start
+    suffix_tokens = [0] * (len(messages) + 1)
+    for i in range(len(messages) - 1, start - 1, -1):
+        suffix_tokens[i] = suffix_tokens[i + 1] + estimate_tokens(messages[i])
+    for i in boundaries:
+        if suffix_tokens[i] <= keep_tokens:
+            return i
+    return boundaries[-1]
+
+
+def transcript(messages) -> str:
+    lines = []
+    for message in messages:
+        text = message_text(message.content)[:SUMMARY_INPUT_CHARS_PER_MESSAGE]
+        if message.type == "human":
+            lines.append(f"User: {text}")
+        elif message.type == "ai":
+            if text:
+                lines.append(f"Assistant: {text}")
+            for tool_call in getattr(message, "tool_calls", None) or []:
+                args = json.dumps(tool_call["args"], default=str)[:SUMMARY_INPUT_CHARS_PER_MESSAGE]
+                lines.append(f"Assistant called {tool_call['name']}({args})")
+        elif message.type == "tool":
+            lines.append(f"Tool {message.name or 'result'}: {text}")
+    return "\n".join(lines)
+
+
+class ContextWindow:
+    """Builds the prompt for chat_node and the state update that goes with it"""
+
+    def __init__(self, summarizer, max_tokens: int = 8000, keep_tokens: int = None,
+                 summary_words: int = 250):
+        self.summarizer = summarizer
+        self.max_tokens = max_tokens
+        self.keep_tokens = keep_tokens if keep_tokens is not None else max_tokens // 2
+        self.summary_words = summary_words
+
+    def plan(self, state):
+        """Return (messages to fold into the summary, index after them); ([], n) if nothing to fold"""
+        messages = state["messages"]
+        done = min(state.get("summarized_messages", 0), len(messages))
+        pending = sum(estimate_tokens(message) for message in messages[done:])
+        if not self.max_tokens or pending <= self.max_tokens:
+            return [], done
+        start = window_start(messages, done, self.keep_tokens)
+        return messages[done:start], start
+
+    def summary_prompt(self, summary: str, fold) -> list:
+        previous = f"Current summary:\n{summary}\n\n" if summary else ""
+        return [
+            SystemMessage(content=SUMMARY_INSTRUCTIONS.format(max_words=self.summary_words)),
+            HumanMessage(content=f"{previous}New messages:\n{transcript(fold)}"),
+        ]
+
+    def prompt(self, state, summary: str, start: int) -> list:
+        window = list(state["messages"][start:])
+        if summary:
+            window.insert(0, SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+        return window
+
+    def prepare(self, state):
+        """Return (prompt messages, state update) for one chat_node call"""
+        fold, start = self.plan(state)
+        summary = state.get("summary", "")
+        if not fold:
+            return self.prompt(state, summary, start), {}
+        try:
+            summary = message_text(self.summarizer.invoke(self.summary_prompt(summary, fold)).content)
+        except Exception as e:
+            # Answer from the trimmed window now and retry the summary next turn
+            print(f"[ERROR] History summarization failed: {e}")
+            return self.prompt(state, state.get("summary", ""), start), {}
+        return self.prompt(state, summary, start), {"summary": summary, "summarized_messages": start}
+
+    async def aprepare(self, state):
+        fold, start = self.plan(state)
+        summary = state.get("summary", "")
+        if not fold:
+            return self.prompt(state, summary, start), {}
+        try:
+            summary = message_text((await self.summarizer.ainvoke(self.summary_prompt(summary, fold))).content)
+        except Exception as e:
+            print(f"[ERROR] History summarization failed: {e}")
+            return self.prompt(state, state.get("summary", ""), start), {}
+        return self.prompt(state, summary, start), {"summary": summary, "summarized_messages": start}
+
+
+def window_from_env(summarizer) -> ContextWindow:
+    """CHATX_CONTEXT_TOKENS=0 sends the full history as before"""
+    max_tokens = int(os.getenv("CHATX_CONTEXT_TOKENS", "8000"))
+    keep = os.getenv("CHATX_CONTEXT_KEEP_TOKENS")
+    return ContextWindow(
+        summarizer,
+        max_tokens=max_tokens,
+        keep_tokens=int(keep) if keep else None,
+        summary_words=int(os.getenv("CHATX_SUMMARY_WORDS", "250")),
+    )
@@ -0,0 +1,41 @@
+"""
+Checkpoint durability modes for chat graph runs.
+
+A chat turn checkpoints after every superstep (input, chat_node, tools, the final
+chat_node). LangGraph's `durability` decides when those checkpoints are written:
+
+- "sync": each checkpoint is committed before the next step starts. A crash
+  loses at most the step that was running; the turn resumes from the last
+  completed step.
+- "async" (LangGraph's default): checkpoints are written in the background
+  while the next step runs. The run still waits for every pending write before
+  it returns, so a turn that has answered is durable; a crash mid-turn can also
+  lose the checkpoint of the step that had just finished.
+- "exit": only the final state is written, once, when the run ends (including
+  when it fails). Fewest writes; a crash mid-turn loses the whole turn, user
+  message included.
+
+CHATX_DURABILITY sets the server default; /api/chat and friends accept a
+`durability` field to override it per request.
+"""
+
+import os
+
+DURABILITY_MODES = ("sync", "async", "exit")
+
+
+def durability_from_env() -> str:
+    mode = os.getenv("CHATX_DURABILITY", "async").lower()
+    if mode not in DURABILITY_MODES:
+        print(f"[WARNING] Unknown CHATX_DURABILITY '{mode}', using async")
+        return "async"
+    return mode
+
+
+def resolve_durability(requested, default: str) -> str:
+    """The request's durability, or the server default; ValueError if it is not a known mode"""
+    if requested is None or requested == "":
+        return default
+    if requested not in DURABILITY_MODES:
+        raise ValueError(f"durability must be one of {', '.join(DURABILITY_MODES)}")
+    return requested
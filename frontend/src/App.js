@@ -645,8 +645,8 @@ const App = () => {
       const afterParts = parts[1].split(']');
       const filename = afterParts[0];
       const afterImage = afterParts[1] || '';
-      // Add timestamp to URL to prevent caching issues
-      const imageUrl = `/api/image/${filename}?t=${Date.now()}`;
+      // Image names are content hashes, so the browser may cache them forever
+      const imageUrl = `/api/image/${filename}`;
       
       // Debug log to verify parsing
       console.log('Rendering image:', { filename, imageUrl, content });
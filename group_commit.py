@@ -0,0 +1,199 @@
+"""
+Group commit for checkpoint writes.
+
+With many turns in flight, every superstep's put/put_writes is its own SQLite
+transaction and fsync, so commit latency caps throughput. GroupCommitSaver
+hands writes to a single background writer thread, which collects whatever
+arrives within `max_delay_ms` (up to `max_batch` items, and no longer than it
+takes to pick up every write submitted so far) and commits it as one
+transaction on the writer connection.
+
+- put()/put_writes() block until their batch is committed, so LangGraph's
+  durability modes keep their meaning; concurrent callers share one commit.
+- submit_put()/submit_put_writes() return a Future instead; wait on it (or call
+  flush()) when the write has to be durable.
+- Reads of a thread (get_tuple, list, message_count_at) first wait for that
+  thread's queued writes, so callers always read their own writes.
+
+Enable with CHATX_GROUP_COMMIT=1.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+
+from checkpointers import DelegatingSaver
+
+
+class GroupCommitSaver(DelegatingSaver):
+    """Queues checkpoint writes and commits them in batches from one writer thread"""
+
+    def __init__(self, inner, max_batch: int = 64, max_delay_ms: float = 2.0):
+        super().__init__(inner)
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max(0.0, max_delay_ms) / 1000
+        self._queue = queue.Queue()
+        self._pending = {}  # thread_id -> futures not yet committed
+        self._lock = threading.Lock()
+        self._writer = None
+        self._closed = False
+        self._batches = 0
+        self._items = 0
+        self._largest = 0
+
+    # Writes
+    def submit_put(self, config, checkpoint, metadata, new_versions) -> Future:
+        return self._submit(config, self.inner.put, config, checkpoint, metadata, new_versions)
+
+    def submit_put_writes(self, config, writes, task_id, task_path="") -> Future:
+        return self._submit(config, self.inner.put_writes, config, writes, task_id, task_path)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        return self.submit_put(config, checkpoint, metadata, new_versions).result()
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        return self.submit_put_writes(config, writes, task_id, task_path).result()
+
+    def _submit(self, config, call, *args) -> Future:
+        thread_id = config["configurable"]["thread_id"]
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("GroupCommitSaver is closed")
+            if self._writer is None:
+                # Started lazily so a saver built before a fork never carries a dead thread
+                self._writer = threading.Thread(target=self._run, name="checkpoint-group-commit", daemon=True)
+                self._writer.start()
+            self._pending.setdefault(thread_id, set()).add(future)
+        self._queue.put((thread_id, future, call, args))
+        return future
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            stop = False
+            while len(batch) < self.max_batch:
+                if len(batch) >= self._outstanding():
+                    # Everything submitted so far is in this batch; waiting
+                    # longer only delays callers that are blocked on it
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _outstanding(self) -> int:
+        with self._lock:
+            return sum(len(pending) for pending in self._pending.values())
+
+    def _commit(self, batch):
+        results = []
+        batch_context = getattr(self.inner, "batch", None)
+        try:
+            with batch_context() if batch_context else nullcontext():
+                for _, _, call, args in batch:
+                    try:
+                        results.append((call(*args), None))
+                    except Exception as e:
+                        results.append((None, e))
+        except Exception as e:
+            # The commit itself failed: none of the batch is durable
+            results = [(None, e)] * len(batch)
+
+        with self._lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._largest = max(self._largest, len(batch))
+            for thread_id, future, _, _ in batch:
+                pending = self._pending.get(thread_id)
+                if pending is not None:
+                    pending.discard(future)
+                    if not pending:
+                        del self._pending[thread_id]
+        for (_, future, _, _), (result, error) in zip(batch, results):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def flush(self, thread_id=None):
+        """Wait until queued writes (of one thread, or all) are committed"""
+        with self._lock:
+            if thread_id is None:
+                futures = [f for pending in self._pending.values() for f in pending]
+            else:
+                futures = list(self._pending.get(thread_id, ()))
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                pass  # reported to whoever submitted the write
+
+    # Reads see this process's queued writes
+    def get_tuple(self, config):
+        self.flush(config["configurable"]["thread_id"])
+        return self.inner.get_tuple(config)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        self.flush((config or {}).get("configurable", {}).get("thread_id"))
+        return self.inner.list(config, filter=filter, before=before, limit=limit)
+
+    def message_count_at(self, thread_id, checkpoint_id=None):
+        self.flush(thread_id)
+        return self.inner.message_count_at(thread_id, checkpoint_id)
+
+    def list_threads(self, *args, **kwargs):
+        self.flush()
+        return self.inner.list_threads(*args, **kwargs)
+
+    def thread_ids(self):
+        self.flush()
+        return self.inner.thread_ids()
+
+    def delete_thread(self, thread_id):
+        self.flush(thread_id)
+        return self.inner.delete_thread(thread_id)
+
+    def commit_stats(self) -> dict:
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "largest_batch": self._largest,
+                "mean_batch": round(self._items / self._batches, 2) if self._batches else 0,
+                "queued": sum(len(pending) for pending in self._pending.values()),
+            }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            writer = self._writer
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+        self.inner.close()
+
+
+def group_commit_from_env(inner):
+    """Wrap `inner` in a GroupCommitSaver if CHATX_GROUP_COMMIT=1"""
+    if os.getenv("CHATX_GROUP_COMMIT", "0") != "1":
+        return inner
+    return GroupCommitSaver(
+        inner,
+        max_batch=int(os.getenv("CHATX_GROUP_COMMIT_MAX_BATCH", "64")),
+        max_delay_ms=float(os.getenv("CHATX_GROUP_COMMIT_MS", "2")),
+    )
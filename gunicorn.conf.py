@@ -0,0 +1,39 @@
+"""
+Gunicorn configuration for ChatX (picked up automatically from the working directory).
+
+Preload mode (CHATX_PRELOAD=1, off by default) builds the graph and tools once in
+the master so forked workers start warm. Neither SQLite connections nor the
+Gemini client's gRPC channel may be shared across a fork, so the master closes its
+SQLite connection before forking, and every worker opens its own connection and
+builds its own LLM clients in post_fork.
+
+    gunicorn app:app                   # build the chatbot in each worker
+    CHATX_PRELOAD=1 gunicorn app:app   # build it once in the master
+"""
+
+import os
+import sys
+
+preload_app = os.getenv("CHATX_PRELOAD", "0") == "1"
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before any worker is forked
+    if preload_app:
+        import api_server
+        api_server.warm_up()
+        if "langgraph_tool_backend" in sys.modules:
+            sys.modules["langgraph_tool_backend"].close_checkpointer()
+
+
+def post_fork(server, worker):
+    if preload_app and "langgraph_tool_backend" in sys.modules:
+        backend = sys.modules["langgraph_tool_backend"]
+        backend.open_checkpointer()
+        backend.rebuild_models()
+
+
+def post_worker_init(worker):
+    # No-op when the master already warmed up; otherwise warm up before serving
+    import api_server
+    api_server.warm_up()
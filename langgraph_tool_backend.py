@@ -1,17 +1,29 @@
 from langgraph.graph import StateGraph, START, END
 from typing import TypedDict, Annotated
 from langchain_core.messages import BaseMessage, HumanMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
 from langchain_community.tools import DuckDuckGoSearchRun
 from langchain_core.tools import tool
 from dotenv import load_dotenv
-import sqlite3
 import requests
 import os
+import hashlib
+import uuid
 from PIL import Image, ImageDraw, ImageFont
+from llm_cache import cache_from_env
+from model_factory import make_llm as build_llm, provider_from_env
+from metrics import LLM_REQUEST_DURATION, LLM_ERRORS, IMAGE_GENERATIONS, instrument_tools
+from checkpointers import InstrumentedSaver
+from checkpoint_maintenance import RetentionSaver, keep_from_env
+from thread_catalog import CatalogSaver
+from sqlite_pool import saver_from_env
+from checkpoint_cache import CachingSaver, checkpoint_cache_from_env
+from group_commit import group_commit_from_env
+from sharded_saver import ShardedSaver, shard_paths, shards_from_env
+from context_window import window_from_env
+from tool_router import router_from_env
+from model_tiers import tiers_from_env
 
 
 load_dotenv()
@@ -84,12 +96,21 @@ print_api_key_validation_results()
 # -------------------
 # 1. LLM
 # -------------------
+# Opt-in persistent response cache (CHATX_LLM_CACHE=1)
+llm_cache = cache_from_env()
+
+LLM_MODEL = os.getenv("CHATX_MODEL", "gemini-2.0-flash")
+
+def make_llm(model: str):
+    # Gemini, or the offline scripted model with CHATX_LLM_PROVIDER=scripted
+    return build_llm(model, cache=llm_cache)
+
 # Initialize LLM with error handling
 try:
-    llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0.5)
-    print("✓ Google Generative AI LLM initialized successfully")
+    llm = make_llm(LLM_MODEL)
+    print(f"✓ LLM initialized successfully ({provider_from_env()}: {LLM_MODEL})")
 except Exception as e:
-    print(f"✗ Failed to initialize Google Generative AI LLM: {e}")
+    print(f"✗ Failed to initialize LLM: {e}")
     print("  Some AI features may not work properly")
 
 # -------------------
@@ -159,22 +180,51 @@ def get_stock_price(symbol: str) -> str:
     except Exception as e:
         return f"Error fetching stock price: {str(e)}"
 
+def pending_image_path() -> str:
+    """Return a unique, unservable (dot-prefixed) path to render a new image into"""
+    os.makedirs("static", exist_ok=True)
+    return os.path.join(os.getcwd(), "static", f".pending_{uuid.uuid4().hex}.png")
+
+def publish_image(filepath: str) -> str:
+    """
+    Move a finished image to its content-addressed name, generated_<sha256 prefix>.png.
+    The same name always means the same bytes, so clients may cache it forever.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    filename = f"generated_{digest.hexdigest()[:16]}.png"
+    target = os.path.join(os.path.dirname(filepath), filename)
+    if os.path.exists(target):
+        os.remove(filepath)
+    else:
+        os.replace(filepath, target)
+    return filename
+
+def discard_pending_image(filepath: str):
+    """Delete a pending render that was never published (a no-op once it was)"""
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"[WARNING] Could not remove pending image {filepath}: {e}")
+
 @tool
 def generate_image(user_prompt: str) -> str:
     """
     Generate images with AI. Always returns [IMAGE_GENERATED:filename] format.
     """
+    # Pending files of this call; whatever was not published is deleted at the end
+    pending = []
     try:
         print(f"[INFO] Starting image generation for: {user_prompt}")
         
-        # Create filename and ensure directory exists
-        os.makedirs("static", exist_ok=True)
-        filename = f"generated_{abs(hash(user_prompt)) % 10000}.png"
-        # Sanitize filename to prevent path traversal
-        filename = os.path.basename(filename)
-        filepath = os.path.join(os.getcwd(), "static", filename)
+        # Render into a private pending file; it is published under its content hash
+        filepath = pending_image_path()
+        pending.append(filepath)
         
-        print(f"[DEBUG] Generated filename: {filename}")
         print(f"[DEBUG] Filepath: {filepath}")
         
         # Optimize the prompt for better results
@@ -187,6 +237,7 @@ def generate_image(user_prompt: str) -> str:
         
         if success and os.path.exists(filepath):
             file_size = os.path.getsize(filepath)
+            filename = publish_image(filepath)
             print(f"[SUCCESS] Image generated successfully. File size: {file_size} bytes")
             return f"I've generated an image for '{user_prompt}'.\n\n[IMAGE_GENERATED:{filename}]"
         
@@ -195,6 +246,7 @@ def generate_image(user_prompt: str) -> str:
         enhanced_placeholder = create_enhanced_placeholder(filepath, user_prompt, optimized_prompt)
         if enhanced_placeholder:
             file_size = os.path.getsize(filepath)
+            filename = publish_image(filepath)
             print(f"[SUCCESS] Enhanced placeholder created. File size: {file_size} bytes")
             return f"I've created an enhanced image preview for '{user_prompt}'.\n\n[IMAGE_GENERATED:{filename}]"
         
@@ -203,11 +255,13 @@ def generate_image(user_prompt: str) -> str:
         simple_placeholder = create_simple_placeholder(filepath, user_prompt)
         if simple_placeholder:
             file_size = os.path.getsize(filepath)
+            filename = publish_image(filepath)
             print(f"[SUCCESS] Simple placeholder created. File size: {file_size} bytes")
             return f"I've created an image preview for '{user_prompt}'.\n\n[IMAGE_GENERATED:{filename}]"
         
         # If all fallbacks fail
         print(f"[ERROR] All image generation methods failed for prompt: {user_prompt}")
+        IMAGE_GENERATIONS.inc(outcome="failed")
         return "I'm having trouble generating images right now. Please try again later."
             
     except Exception as e:
@@ -216,28 +270,34 @@ def generate_image(user_prompt: str) -> str:
         print(f"[ERROR] Traceback: {traceback.format_exc()}")
         # Always create something as a last resort
         try:
-            os.makedirs("static", exist_ok=True)
-            filename = f"generated_{abs(hash(user_prompt)) % 10000}.png"
-            filepath = os.path.join(os.getcwd(), "static", filename)
-            print(f"[DEBUG] Emergency fallback - filename: {filename}")
+            filepath = pending_image_path()
+            pending.append(filepath)
+            print(f"[DEBUG] Emergency fallback - filepath: {filepath}")
             # Try enhanced placeholder first
             if create_enhanced_placeholder(filepath, user_prompt, user_prompt):
                 file_size = os.path.getsize(filepath)
+                filename = publish_image(filepath)
                 print(f"[SUCCESS] Emergency enhanced placeholder created. File size: {file_size} bytes")
                 return f"I've created an enhanced image preview for '{user_prompt}'.\n\n[IMAGE_GENERATED:{filename}]"
             # Fallback to simple placeholder
             elif create_simple_placeholder(filepath, user_prompt):
                 file_size = os.path.getsize(filepath)
+                filename = publish_image(filepath)
                 print(f"[SUCCESS] Emergency simple placeholder created. File size: {file_size} bytes")
                 return f"I've created an image preview for '{user_prompt}'.\n\n[IMAGE_GENERATED:{filename}]"
             else:
                 print(f"[ERROR] All emergency fallbacks failed for prompt: {user_prompt}")
+                IMAGE_GENERATIONS.inc(outcome="failed")
                 return "I'm having trouble generating images right now. Please try again later."
         except Exception as fallback_error:
             print(f"[CRITICAL] Image generation fallback error: {fallback_error}")
+            IMAGE_GENERATIONS.inc(outcome="failed")
             import traceback
             print(f"[CRITICAL] Fallback traceback: {traceback.format_exc()}")
             return "I'm having trouble generating images right now. Please try again later."
+    finally:
+        for path in pending:
+            discard_pending_image(path)
 
 def optimize_image_prompt_advanced(user_input: str) -> str:
     """Advanced prompt optimization with multi-layer enhancement"""
@@ -343,6 +403,7 @@ def generate_with_enhanced_api(optimized_prompt: str, filepath: str, original_pr
         freepik_result = try_freepik_generation_enhanced(optimized_prompt, filepath)
         if freepik_result:
             print("[SUCCESS] Freepik API generation successful")
+            IMAGE_GENERATIONS.inc(outcome="freepik")
             return freepik_result
         
         print("[WARNING] Freepik API failed, trying alternative methods...")
@@ -352,6 +413,7 @@ def generate_with_enhanced_api(optimized_prompt: str, filepath: str, original_pr
         freepik_simple = try_freepik_generation_enhanced(simplified_prompt, filepath)
         if freepik_simple:
             print("[SUCCESS] Simplified prompt generation successful")
+            IMAGE_GENERATIONS.inc(outcome="simplified_prompt")
             return freepik_simple
         
         # Fallback: Create enhanced placeholder
@@ -633,6 +695,7 @@ def create_simple_placeholder(filepath: str, prompt: str) -> str | None:
         img.save(filepath, 'PNG')
         file_size = os.path.getsize(filepath)
         print(f"[SUCCESS] Simple placeholder created: {filepath} ({file_size} bytes)")
+        IMAGE_GENERATIONS.inc(outcome="simple_placeholder")
         return filepath
         
     except Exception as e:
@@ -786,6 +849,7 @@ def create_enhanced_placeholder(filepath: str, original_prompt: str, optimized_p
         img.save(filepath, 'PNG', quality=95, optimize=True)
         file_size = os.path.getsize(filepath)
         print(f"[SUCCESS] Enhanced placeholder created: {filepath} ({file_size} bytes)")
+        IMAGE_GENERATIONS.inc(outcome="enhanced_placeholder")
         return filepath
         
     except Exception as e:
@@ -1749,41 +1813,138 @@ def create_placeholder_image(filepath: str, prompt_text: str) -> str | None:
 
 
 tools = [search_tool, get_stock_price, calculator, generate_image, code_analyzer, data_analyst, business_consultant, content_creator, project_manager, financial_advisor, legal_advisor, hr_specialist, cybersecurity_expert, knowledge_assistant]
-llm_with_tools = llm.bind_tools(tools)
+# Per-tool latency and error metrics
+instrument_tools(tools)
+
+def bind_models():
+    """Derive the tool-calling router and the history summarizer from `llm`"""
+    global llm_with_tools, context_window
+    # Each call binds only the tools its turn is likely to use (see tool_router.py),
+    # on the lite model when the turn looks easy (see model_tiers.py)
+    llm_with_tools = router_from_env(llm, tools, tiers=tiers_from_env(llm, make_llm))
+    # Older history is folded into a rolling summary; "nostream" keeps the
+    # summarizer's tokens out of stream_mode="messages"
+    context_window = window_from_env(llm.with_config(tags=["nostream"], run_name="summarize_history"))
+
+def rebuild_models():
+    """
+    Build new LLM clients (standard and lite tier) for the current process.
+    Called in every forked gunicorn worker (post_fork): the Gemini client holds a
+    gRPC channel, and gRPC clients must not be used on both sides of a fork.
+    """
+    global llm
+    llm = make_llm(LLM_MODEL)
+    bind_models()
+
+bind_models()
 
 # -------------------
 # 3. State
 # -------------------
 class ChatState(TypedDict):
     messages: Annotated[list[BaseMessage], add_messages]
+    # Rolling summary of messages[:summarized_messages] (see context_window.py)
+    summary: str
+    summarized_messages: int
 
 # -------------------
 # 4. Nodes
 # -------------------
 def chat_node(state: ChatState):
     """LLM node that may answer or request a tool call."""
-    messages = state["messages"]
-    response = llm_with_tools.invoke(messages)
-    return {"messages": [response]}
+    messages, update = context_window.prepare(state)
+    try:
+        with LLM_REQUEST_DURATION.time(node="chat_node"):
+            response = llm_with_tools.invoke(messages)
+    except Exception:
+        LLM_ERRORS.inc(node="chat_node")
+        raise
+    return {"messages": [response], **update}
+
+async def achat_node(state: ChatState):
+    """Async variant of chat_node used by the ASGI server."""
+    messages, update = await context_window.aprepare(state)
+    try:
+        with LLM_REQUEST_DURATION.time(node="chat_node"):
+            response = await llm_with_tools.ainvoke(messages)
+    except Exception:
+        LLM_ERRORS.inc(node="chat_node")
+        raise
+    return {"messages": [response], **update}
 
 tool_node = ToolNode(tools)
 
 # -------------------
 # 5. Checkpointer
 # -------------------
-conn = sqlite3.connect(database="chatbot.db", check_same_thread=False)
-checkpointer = SqliteSaver(conn=conn)
+DB_PATH = os.getenv("CHATX_DB_PATH", "chatbot.db")
+
+conn = None
+checkpointer = None
+pool = None
+chatbot = None
+# CachingSaver per shard, for /api/cache/stats
+checkpoint_caches = []
+
+def open_shard(path, shards=1):
+    """Checkpointer stack for one database file"""
+    # One writer connection plus a pool of readers (CHATX_SQLITE_* settings)
+    saver = saver_from_env(path)
+    # Keep only the newest CHATX_CHECKPOINT_KEEP checkpoints per thread
+    if keep_from_env():
+        saver = RetentionSaver(saver, keep=keep_from_env())
+    # Serve active threads' latest state from memory (CHATX_CHECKPOINT_CACHE_MB)
+    saver = checkpoint_cache_from_env(saver, shards)
+    if isinstance(saver, CachingSaver):
+        checkpoint_caches.append(saver)
+    # Maintain the threads table behind /api/threads
+    saver = CatalogSaver(saver)
+    # Batch commits from concurrent turns into shared transactions (CHATX_GROUP_COMMIT=1)
+    return group_commit_from_env(saver)
+
+def open_checkpointer():
+    """
+    Open fresh SQLite connections for the current process and attach them to the graph.
+    Called at import time and again in every forked gunicorn worker (post_fork),
+    since a SQLite connection must never be used on both sides of a fork.
+    """
+    global conn, checkpointer, pool
+    checkpoint_caches.clear()
+    # CHATX_DB_SHARDS > 1 spreads threads over that many database files
+    paths = shard_paths(DB_PATH, shards_from_env())
+    shards = [open_shard(path, len(paths)) for path in paths]
+    pool = shards[0] if len(shards) == 1 else ShardedSaver(shards)
+    conn = shards[0].conn
+    checkpointer = InstrumentedSaver(pool)
+    if chatbot is not None and chatbot.checkpointer is not None:
+        chatbot.checkpointer = checkpointer
+    return checkpointer
+
+def close_checkpointer():
+    """Close this process's SQLite connections (e.g. in the gunicorn master before forking)."""
+    global conn, pool
+    if pool is not None:
+        pool.close()
+        pool = None
+        conn = None
+
+open_checkpointer()
 
 # -------------------
 # 6. Graph
 # -------------------
-graph = StateGraph(ChatState)
-graph.add_node("chat_node", chat_node)
-graph.add_node("tools", tool_node)
+def build_graph(chat=chat_node) -> StateGraph:
+    """Build the chat graph; pass achat_node to get a graph for ainvoke/astream."""
+    graph = StateGraph(ChatState)
+    graph.add_node("chat_node", chat)
+    graph.add_node("tools", tool_node)
+
+    graph.add_edge(START, "chat_node")
+    graph.add_conditional_edges("chat_node", tools_condition)
+    graph.add_edge("tools", "chat_node")
+    return graph
 
-graph.add_edge(START, "chat_node")
-graph.add_conditional_edges("chat_node", tools_condition)
-graph.add_edge("tools", "chat_node")
+graph = build_graph()
 
 try:
     chatbot = graph.compile(checkpointer=checkpointer)
@@ -1795,7 +1956,5 @@ except Exception as e:
 # 7. Helper
 # -------------------
 def retrieve_all_threads():
-    all_threads = set()
-    for checkpoint in checkpointer.list(None):
-        all_threads.add(checkpoint.config["configurable"]["thread_id"])
-    return list(all_threads)
\ No newline at end of file
+    """All thread ids, most recently updated first (indexed catalog query)"""
+    return checkpointer.thread_ids()
\ No newline at end of file
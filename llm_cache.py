@@ -0,0 +1,188 @@
+"""
+Opt-in, size-bounded SQLite cache for chat model responses.
+
+Entries are keyed by a hash of the serialized message list plus LangChain's
+llm_string, which covers the model name, temperature and the bound tool schemas,
+so changing any of them never returns a stale answer. Message ids and metadata
+the model never sees are left out of the key, so the same question asked on two
+threads (where add_messages gives each message a fresh id) is one entry. Entries expire after a TTL
+and the least recently used ones are evicted once the cache exceeds its size limit.
+
+Enable with CHATX_LLM_CACHE=1.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from sqlite_utils import ProcessLocalConnection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_cache_accessed_at ON llm_cache (accessed_at);
+"""
+
+
+# Message fields that are not sent to the model
+IGNORED_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """The serialized message list without per-message ids and response metadata"""
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    if not isinstance(messages, list):
+        return prompt
+    for message in messages:
+        fields = message.get("kwargs") if isinstance(message, dict) else None
+        if isinstance(fields, dict):
+            for name in IGNORED_FIELDS:
+                fields.pop(name, None)
+    return json.dumps(messages, sort_keys=True)
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\x00{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+def vacuum(cur):
+    """Free every unused page. cursor.execute would step the pragma once, freeing a
+    single page; executescript runs it to the end (committing the open transaction first)"""
+    cur.executescript("PRAGMA incremental_vacuum;")
+
+
+class SQLiteLLMCache(BaseCache):
+    """LangChain cache backed by SQLite with TTL expiry and LRU eviction by size"""
+
+    def __init__(self, path: str = "llm_cache.db", max_bytes: int = 100 * 1024 * 1024,
+                 ttl_seconds: float = 24 * 3600):
+        # Incremental auto-vacuum lets eviction hand freed pages back to the filesystem
+        self.db = ProcessLocalConnection(path, SCHEMA, auto_vacuum="INCREMENTAL")
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def lookup(self, prompt: str, llm_string: str):
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self.db.cursor() as cur:
+            row = cur.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                cur.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._count("expired")
+                self._count("misses")
+                return None
+            cur.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+
+        self._count("hits")
+        generations = loads(value)
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            if message is not None:
+                message.response_metadata["cache_hit"] = True
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        value = dumps([self._without_id(generation) for generation in return_val])
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self.db.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (cache_key(prompt, llm_string), value, size, now, now),
+            )
+            self._evict(cur)
+
+    def clear(self, **kwargs) -> None:
+        with self.db.cursor() as cur:
+            cur.execute("DELETE FROM llm_cache")
+            vacuum(cur)
+
+    def stats(self) -> dict:
+        with self.db.cursor(transaction=False) as cur:
+            entries, total = cur.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "enabled": True,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+        })
+        return stats
+
+    @staticmethod
+    def _without_id(generation):
+        # Replayed answers must get fresh ids; reusing one would make add_messages
+        # replace the earlier message in the thread instead of appending
+        message = getattr(generation, "message", None)
+        if message is None or not message.id:
+            return generation
+        return generation.model_copy(update={"message": message.model_copy(update={"id": None})})
+
+    def _evict(self, cur):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        removed = 0
+        if self.ttl_seconds:
+            cur.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            if cur.rowcount > 0:
+                self._count("expired", cur.rowcount)
+                removed += cur.rowcount
+        (total,) = cur.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            freed = 0
+            victims = []
+            for key, size in cur.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at ASC").fetchall():
+                victims.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            cur.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+            self._count("evictions", len(victims))
+            removed += len(victims)
+        if removed:
+            # Truncate the freed pages off the file (at the next WAL checkpoint),
+            # so the file shrinks back towards max_bytes
+            vacuum(cur)
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+
+def cache_from_env():
+    """Return the configured cache, or None when CHATX_LLM_CACHE is off"""
+    if os.getenv("CHATX_LLM_CACHE", "0") != "1":
+        return None
+    return SQLiteLLMCache(
+        path=os.getenv("CHATX_LLM_CACHE_PATH", "llm_cache.db"),
+        max_bytes=int(float(os.getenv("CHATX_LLM_CACHE_MAX_MB", "100")) * 1024 * 1024),
+        ttl_seconds=float(os.getenv("CHATX_LLM_CACHE_TTL", str(24 * 3600))),
+    )
@@ -0,0 +1,72 @@
+"""
+Pages of a thread's message history for /api/threads/<id>/messages.
+
+Messages are addressed by their position in the thread. A response carries at
+most `limit` messages plus the checkpoint_id it was read from; clients pass that
+back as `since` to receive only the messages added after it, or pass the index
+of their oldest message as `before` to page further back.
+"""
+
+from chat_stream import message_text
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def parse_limit(value) -> int:
+    if value is None:
+        return DEFAULT_LIMIT
+    return max(1, min(int(value), MAX_LIMIT))
+
+
+def message_payload(index: int, message) -> dict:
+    payload = {
+        "index": index,
+        "id": getattr(message, "id", None),
+        "type": message.type,
+        "content": message_text(message.content),
+    }
+    if getattr(message, "name", None):
+        payload["name"] = message.name
+    if getattr(message, "tool_calls", None):
+        payload["tool_calls"] = [{"name": call["name"], "args": call["args"]} for call in message.tool_calls]
+    if message.type == "tool":
+        payload["tool_call_id"] = message.tool_call_id
+    return payload
+
+
+def history_page(messages, checkpoint_id: str, limit: int = DEFAULT_LIMIT, before: int = None,
+                 since_count: int = None) -> dict:
+    """
+    One page of `messages`:
+    - since_count: messages after that position (a delta), unless more than
+      `limit` arrived, in which case the newest page is returned with reset=True
+    - before: up to `limit` messages preceding that index
+    - neither: the newest `limit` messages
+    """
+    total = len(messages)
+    reset = False
+    if since_count is not None:
+        if since_count > total or total - since_count > limit:
+            reset = True
+            start, end = max(0, total - limit), total
+        else:
+            start, end = since_count, total
+    elif before is not None:
+        end = max(0, min(before, total))
+        start = max(0, end - limit)
+    else:
+        start, end = max(0, total - limit), total
+    return {
+        "checkpoint_id": checkpoint_id,
+        "message_count": total,
+        "messages": [message_payload(i, messages[i]) for i in range(start, end)],
+        "has_more": start > 0,
+        "reset": reset,
+    }
+
+
+def unchanged_page(checkpoint_id: str, message_count: int) -> dict:
+    """Response for a `since` that is already the latest checkpoint"""
+    return {"checkpoint_id": checkpoint_id, "message_count": message_count, "messages": [],
+            "has_more": message_count > 0, "reset": False}
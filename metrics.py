@@ -0,0 +1,244 @@
+"""
+In-process counters and latency histograms exposed in Prometheus text format.
+
+Kept dependency-free on purpose: a handful of metric families, each a dict of
+label values -> counts behind a lock, rendered by `render()` for /api/metrics.
+Values are per process; with several gunicorn workers Prometheus scrapes
+whichever worker answers, so aggregate with sum()/rate() across scrapes.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Seconds; spans cached LLM answers (ms) up to slow image generation (tens of seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self, items):
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, sum, count
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block, including when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def _render_samples(self, items):
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(float(bound)))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key, [("le", "+Inf")])
+            yield f"{self.name}_bucket{labels} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "chatx_http_request_duration_seconds",
+    "Time to produce the HTTP response (for streams, time until headers are sent).",
+    ["route", "method", "status"],
+))
+LLM_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "chatx_llm_request_duration_seconds",
+    "Latency of the LLM call made by a graph node.",
+    ["node"],
+))
+LLM_ERRORS = REGISTRY.register(Counter(
+    "chatx_llm_errors_total",
+    "LLM calls that raised.",
+    ["node"],
+))
+TOOL_DURATION = REGISTRY.register(Histogram(
+    "chatx_tool_duration_seconds",
+    "Tool execution latency.",
+    ["tool"],
+))
+TOOL_ERRORS = REGISTRY.register(Counter(
+    "chatx_tool_errors_total",
+    "Tool calls that raised.",
+    ["tool"],
+))
+CHECKPOINT_DURATION = REGISTRY.register(Histogram(
+    "chatx_checkpoint_duration_seconds",
+    "Checkpointer read/write latency.",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+))
+TOOL_ROUTES = REGISTRY.register(Counter(
+    "chatx_tool_routes_total",
+    "LLM calls by tool routing outcome: a routed subset, or the full set when ambiguous or unmatched.",
+    ["outcome"],
+))
+MODEL_TIER_CHOICES = REGISTRY.register(Counter(
+    "chatx_model_tier_choices_total",
+    "LLM calls by model tier and the signal that decided it.",
+    ["tier", "reason"],
+))
+MODEL_TIER_DURATION = REGISTRY.register(Histogram(
+    "chatx_model_tier_duration_seconds",
+    "LLM call latency by model tier.",
+    ["tier"],
+))
+IMAGE_GENERATIONS = REGISTRY.register(Counter(
+    "chatx_image_generations_total",
+    "Image generation results by outcome.",
+    ["outcome"],
+))
+
+
+class ToolMetricsHandler(BaseCallbackHandler):
+    """Records per-tool latency and errors; attach it to each tool's `callbacks`"""
+
+    def __init__(self):
+        self._started = {}
+        self._lock = threading.Lock()
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        with self._lock:
+            self._started[run_id] = (name, time.perf_counter())
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        name = self._finish(run_id)
+        if name is not None:
+            TOOL_ERRORS.inc(tool=name)
+
+    def _finish(self, run_id):
+        with self._lock:
+            started = self._started.pop(run_id, None)
+        if started is None:
+            return None
+        name, start = started
+        TOOL_DURATION.observe(time.perf_counter() - start, tool=name)
+        return name
+
+
+tool_metrics_handler = ToolMetricsHandler()
+
+
+def instrument_tools(tools):
+    """Attach the shared metrics handler to every tool in `tools`"""
+    for t in tools:
+        callbacks = list(t.callbacks or [])
+        if tool_metrics_handler not in callbacks:
+            t.callbacks = callbacks + [tool_metrics_handler]
+    return tools
+
+
+def render() -> str:
+    return REGISTRY.render()
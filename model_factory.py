@@ -0,0 +1,49 @@
+"""
+Chat model construction, selected by configuration.
+
+    CHATX_LLM_PROVIDER=google    Gemini via langchain-google-genai (default)
+    CHATX_LLM_PROVIDER=scripted  ScriptedChatModel: offline and deterministic,
+                                 for load tests of the graph, checkpointer and API
+
+The scripted model is tuned with CHATX_SCRIPTED_LATENCY_MS (before the first
+token), CHATX_SCRIPTED_TOKEN_MS (per streamed word), CHATX_SCRIPTED_ANSWER_WORDS
+and CHATX_SCRIPTED_RULES (path to a JSON list of rules, see scripted_llm.py).
+"""
+
+import os
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from scripted_llm import ScriptedChatModel, load_rules
+
+PROVIDERS = ("google", "scripted")
+
+
+def provider_from_env() -> str:
+    provider = os.getenv("CHATX_LLM_PROVIDER", "google").strip().lower()
+    if provider not in PROVIDERS:
+        raise ValueError(f"CHATX_LLM_PROVIDER must be one of {', '.join(PROVIDERS)}, got {provider!r}")
+    return provider
+
+
+def scripted_from_env(model: str, cache=None) -> ScriptedChatModel:
+    kwargs = {}
+    rules = os.getenv("CHATX_SCRIPTED_RULES")
+    if rules:
+        kwargs["rules"] = load_rules(rules)
+    return ScriptedChatModel(
+        model=model,
+        latency_ms=float(os.getenv("CHATX_SCRIPTED_LATENCY_MS", "0")),
+        token_ms=float(os.getenv("CHATX_SCRIPTED_TOKEN_MS", "0")),
+        answer_words=int(os.getenv("CHATX_SCRIPTED_ANSWER_WORDS", "40")),
+        cache=cache,
+        **kwargs,
+    )
+
+
+def make_llm(model: str, cache=None, provider: str = None):
+    """Chat model `model` from the configured (or given) provider"""
+    provider = provider or provider_from_env()
+    if provider == "scripted":
+        return scripted_from_env(model, cache)
+    return ChatGoogleGenerativeAI(model=model, temperature=0.5, cache=cache)
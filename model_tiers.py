@@ -0,0 +1,80 @@
+"""
+Complexity-based model tiers for chat_node.
+
+Greetings, thanks and short follow-ups do not need the same model as a
+multi-tool research question. TierPolicy looks at cheap signals of the prompt
+chat_node is about to send and picks the "lite" tier only when all of them say
+the turn is easy; anything else goes to the "standard" tier:
+
+- tools likely needed: ToolRouter matched the message to some tools, or to so
+  many that it bound the full set
+- a turn already in a tool loop (the model is answering from tool results)
+- a tool failed in the last few messages (the model has to recover)
+- a long user message
+- a deep thread (many user turns in the window, or a rolling summary)
+
+ToolRouter applies the choice and binds the tier's model; the tier and the
+reason are recorded in the turn trace and in chatx_model_tier_* metrics.
+
+Tiering is opt-in: CHATX_LITE_MODEL names the lite model (e.g.
+gemini-2.0-flash-lite). Unset or empty, every call goes to the standard model.
+"""
+
+import os
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from chat_stream import message_text
+
+LITE = "lite"
+STANDARD = "standard"
+
+
+def tool_failed(message) -> bool:
+    if not isinstance(message, ToolMessage):
+        return False
+    # ToolNode marks raised errors; the tools themselves return "Error..." strings
+    return message.status == "error" or message_text(message.content).lstrip().startswith("Error")
+
+
+class TierPolicy:
+    """Chooses the model tier of one chat_node call"""
+
+    def __init__(self, max_chars: int = 280, max_turns: int = 10, failure_window: int = 6):
+        self.max_chars = max_chars
+        self.max_turns = max_turns
+        self.failure_window = failure_window
+
+    def choose(self, messages, tool_names) -> tuple:
+        """(tier, reason) for a call with these prompt messages and routed tools (None: no match)"""
+        human_index = next((i for i in range(len(messages) - 1, -1, -1)
+                            if isinstance(messages[i], HumanMessage)), None)
+        if human_index is None:
+            return STANDARD, "no_user_message"
+        if any(tool_failed(m) for m in messages[-self.failure_window:]):
+            return STANDARD, "tool_failure"
+        if any(isinstance(m, AIMessage) and m.tool_calls for m in messages[human_index + 1:]):
+            return STANDARD, "tool_loop"
+        if tool_names:
+            return STANDARD, "tools_likely"
+        if len(message_text(messages[human_index].content)) > self.max_chars:
+            return STANDARD, "long_message"
+        turns = sum(isinstance(m, HumanMessage) for m in messages)
+        if turns > self.max_turns or any(isinstance(m, SystemMessage) for m in messages):
+            return STANDARD, "deep_thread"
+        return LITE, "simple"
+
+
+def tiers_from_env(standard, build):
+    """{tier: model} with the lite model built by `build(name)`, or None when tiering is off"""
+    lite = os.getenv("CHATX_LITE_MODEL", "").strip()
+    if not lite:
+        return None
+    return {LITE: build(lite), STANDARD: standard}
+
+
+def policy_from_env() -> TierPolicy:
+    return TierPolicy(
+        max_chars=int(os.getenv("CHATX_TIER_MAX_CHARS", "280")),
+        max_turns=int(os.getenv("CHATX_TIER_MAX_TURNS", "10")),
+    )
@@ -0,0 +1,157 @@
+"""
+Deterministic local chat model for offline load tests.
+
+ScriptedChatModel never leaves the process: it matches the latest user message
+against a list of rules and either calls the rule's tool (then answers from the
+tool's output on the next call) or answers directly with canned text. Latency
+is simulated: `latency_ms` before the first token, then `token_ms` per streamed
+word, with asyncio.sleep on the async paths so the ASGI server is not blocked.
+usage_metadata is filled in (characters / 4, tool schemas included), so traces,
+metrics and the tool-router benchmark see realistic token counts.
+
+Rules are dicts of `pattern` (regex, case-insensitive), `tool` and `args`,
+where "{message}" and "{match}" in argument values are replaced by the user
+message and the matched text. A rule whose tool is not bound is skipped.
+
+Selected with CHATX_LLM_PROVIDER=scripted (see model_factory.py).
+"""
+
+import asyncio
+import json
+import re
+import time
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from chat_stream import message_text
+from context_window import CHARS_PER_TOKEN
+
+# Offline tools only: search, stock prices and image generation go to the network
+DEFAULT_RULES = [
+    {"pattern": r"\(*\d[\d.\s()]*[-+*/][\d.\s()+*/-]*\d\)*", "tool": "calculator",
+     "args": {"expression": "{match}"}},
+    {"pattern": r"secur|password|phishing|malware", "tool": "cybersecurity_expert",
+     "args": {"security_query": "{message}"}},
+    {"pattern": r"project|timeline|sprint|roadmap", "tool": "project_manager", "args": {"task": "{message}"}},
+    {"pattern": r"blog|article|newsletter", "tool": "content_creator",
+     "args": {"content_type": "blog", "topic": "{message}"}},
+    {"pattern": r"hiring|interview|employee", "tool": "hr_specialist", "args": {"hr_query": "{message}"}},
+    {"pattern": r"explain|how does|what is|tell me about", "tool": "knowledge_assistant",
+     "args": {"question": "{message}"}},
+]
+
+FILLER = ("This is a scripted answer used for offline testing. It has the length and shape of a "
+          "typical reply so that checkpoints, streams and traces behave as they would with a real model.").split()
+
+
+def load_rules(path: str) -> list:
+    with open(path) as f:
+        return json.load(f)
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Rule-driven fake chat model with tool calls, streaming and simulated latency"""
+
+    model: str = "scripted"
+    latency_ms: float = 0.0
+    token_ms: float = 0.0
+    answer_words: int = 40
+    rules: list = DEFAULT_RULES
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model": self.model}
+
+    # Script
+    def respond(self, messages, tools=None) -> AIMessage:
+        """The message this model answers with; depends only on its inputs"""
+        bound = {t["function"]["name"] for t in tools or []}
+        last = messages[-1] if messages else None
+        if isinstance(last, HumanMessage):
+            text = message_text(last.content)
+            for rule in self.rules:
+                match = re.search(rule["pattern"], text, re.IGNORECASE)
+                if match and rule["tool"] in bound:
+                    args = {name: value.replace("{message}", text).replace("{match}", match.group(0).strip())
+                            for name, value in rule["args"].items()}
+                    call_id = f"call-{len(messages)}-{rule['tool']}"
+                    return self._with_usage(AIMessage(content="", tool_calls=[
+                        {"name": rule["tool"], "args": args, "id": call_id}
+                    ]), messages, tools)
+            content = self._answer(f"You said: {text[:200]}")
+        elif isinstance(last, ToolMessage):
+            lines = [line for line in message_text(last.content).splitlines() if line.strip()][:8]
+            content = self._answer(f"Here is what {last.name or 'the tool'} returned:\n\n" + "\n".join(lines))
+        else:
+            content = self._answer("Hello!")
+        return self._with_usage(AIMessage(content=content), messages, tools)
+
+    def _answer(self, opening: str) -> str:
+        words = [FILLER[i % len(FILLER)] for i in range(self.answer_words)]
+        return opening + "\n\n" + " ".join(words)
+
+    def _with_usage(self, message, messages, tools) -> AIMessage:
+        prompt_chars = sum(len(message_text(m.content)) for m in messages) + len(json.dumps(tools or []))
+        output_tokens = max(1, len(message.content) // CHARS_PER_TOKEN) + 10 * len(message.tool_calls)
+        input_tokens = prompt_chars // CHARS_PER_TOKEN
+        message.usage_metadata = {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                                  "total_tokens": input_tokens + output_tokens}
+        message.response_metadata = {"model_name": self.model}
+        return message
+
+    @staticmethod
+    def chunks(message):
+        """Word-sized content chunks, or one chunk carrying the tool calls"""
+        if message.tool_calls:
+            return [AIMessageChunk(content="", tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                for i, call in enumerate(message.tool_calls)
+            ])]
+        return [AIMessageChunk(content=word) for word in re.findall(r"\S+\s*|\s+", message.content)]
+
+    # LangChain hooks
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs: Any) -> ChatResult:
+        message = self.respond(messages, tools)
+        time.sleep((self.latency_ms + self.token_ms * len(self.chunks(message))) / 1000)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, tools=None, **kwargs: Any) -> ChatResult:
+        message = self.respond(messages, tools)
+        await asyncio.sleep((self.latency_ms + self.token_ms * len(self.chunks(message))) / 1000)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, tools=None, **kwargs: Any):
+        message = self.respond(messages, tools)
+        time.sleep(self.latency_ms / 1000)
+        for chunk in self._stream_chunks(message):
+            time.sleep(self.token_ms / 1000)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, tools=None, **kwargs: Any):
+        message = self.respond(messages, tools)
+        await asyncio.sleep(self.latency_ms / 1000)
+        for chunk in self._stream_chunks(message):
+            await asyncio.sleep(self.token_ms / 1000)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    def _stream_chunks(self, message):
+        chunks = self.chunks(message)
+        # Usage and metadata arrive with the last chunk, as with Gemini
+        chunks[-1].usage_metadata = message.usage_metadata
+        chunks[-1].response_metadata = message.response_metadata
+        return [ChatGenerationChunk(message=chunk) for chunk in chunks]
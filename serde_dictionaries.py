@@ -0,0 +1,826 @@
+"""
+Preset dictionaries for the compressed checkpoint serializer (compressed_serde.py).
+
+A dictionary primes the compressor with text that checkpoints are likely to
+contain, so even the first occurrence of a tool's output or of the message
+fields in a blob compresses well. Each one is built from what ChatX really
+writes: the output of every offline tool (one call per branch, empty query),
+the fixed parts of the network tools' output, and the msgpack field names and
+Gemini response metadata of a serialized checkpoint.
+
+Dictionaries are part of the on-disk format: a row tagged "zlib1" can only be
+read with dictionary 1, so never edit one. When the tools' output drifts, add a
+new version from `python serde_dictionaries.py` and point DICTIONARY_VERSION at
+it; older rows keep using theirs.
+"""
+
+import contextlib
+import io
+import json
+import re
+
+# (tool name, arguments), covering each branch of each offline tool's output
+SAMPLE_CALLS = [
+    ("calculator", {"expression": "1+1"}),
+    ("calculator", {"expression": "1/0"}),
+    ("code_analyzer", {"code": "def f():\n    print(eval(x))\nfrom os import *", "language": "python"}),
+    ("code_analyzer", {"code": "var a = b == c", "language": "javascript"}),
+    ("code_analyzer", {"code": "", "language": "python"}),
+    ("data_analyst", {"data_query": "sales"}),
+    ("data_analyst", {"data_query": ""}),
+    ("business_consultant", {"business_query": "startup"}),
+    ("business_consultant", {"business_query": "marketing"}),
+    ("business_consultant", {"business_query": "growth"}),
+    ("business_consultant", {"business_query": ""}),
+    ("content_creator", {"content_type": "blog", "topic": ""}),
+    ("content_creator", {"content_type": "social", "topic": ""}),
+    ("content_creator", {"content_type": "email", "topic": ""}),
+    ("content_creator", {"content_type": "", "topic": ""}),
+    ("project_manager", {"task": "timeline"}),
+    ("project_manager", {"task": "risk"}),
+    ("project_manager", {"task": ""}),
+    ("financial_advisor", {"financial_query": "budget"}),
+    ("financial_advisor", {"financial_query": "investment"}),
+    ("financial_advisor", {"financial_query": ""}),
+    ("legal_advisor", {"legal_query": "contract"}),
+    ("legal_advisor", {"legal_query": "intellectual property"}),
+    ("legal_advisor", {"legal_query": ""}),
+    ("hr_specialist", {"hr_query": "hiring"}),
+    ("hr_specialist", {"hr_query": "performance"}),
+    ("hr_specialist", {"hr_query": ""}),
+    ("cybersecurity_expert", {"security_query": "password"}),
+    ("cybersecurity_expert", {"security_query": "data"}),
+    ("cybersecurity_expert", {"security_query": ""}),
+    ("knowledge_assistant", {"question": "quantum"}),
+    ("knowledge_assistant", {"question": "ai"}),
+    ("knowledge_assistant", {"question": ""}),
+]
+
+# Fixed parts of the output of tools that need the network (langgraph_tool_backend.py)
+NETWORK_FRAGMENTS = [
+    " stock price: $", " (Change: ", "Could not fetch stock price for ", "Error fetching stock price: ",
+    "I've generated an image for '", "I've created an enhanced image preview for '",
+    "I've created an image preview for '", "'.\n\n[IMAGE_GENERATED:generated_", ".png]",
+    "I'm having trouble generating images right now. Please try again later.",
+]
+
+# What ChatGoogleGenerativeAI (langchain-google-genai 2.x) puts on an answer
+GEMINI_METADATA = {
+    "response_metadata": {
+        "prompt_feedback": {"block_reason": 0, "safety_ratings": []},
+        "finish_reason": "STOP",
+        "model_name": "gemini-2.0-flash",
+        "safety_ratings": [],
+    },
+    "usage_metadata": {
+        "input_tokens": 1, "output_tokens": 1, "total_tokens": 2,
+        "input_token_details": {"cache_read": 0},
+        "output_token_details": {"reasoning": 0},
+    },
+}
+
+# Ids, timestamps and version counters differ in every checkpoint
+VOLATILE = re.compile(r"[0-9a-f]{8}-|^\d|^[0-9a-f]{16,}")
+
+
+def tool_texts(tools) -> list:
+    by_name = {t.name: t for t in tools}
+    with contextlib.redirect_stdout(io.StringIO()):  # the tools log with print
+        return [by_name[name].func(**args) for name, args in SAMPLE_CALLS]
+
+
+def structure_texts(graph) -> list:
+    """Field names and metadata of a serialized checkpoint, in order of first appearance"""
+    from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+    from langgraph.checkpoint.base import empty_checkpoint
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {
+        "messages": [
+            HumanMessage(content="", id="h"),
+            AIMessage(content="", tool_calls=[{"name": "calculator", "args": {"expression": ""}, "id": "c"}],
+                      additional_kwargs={"function_call": {"name": "calculator", "arguments": ""}},
+                      id="run--", **GEMINI_METADATA),
+            ToolMessage(content="", tool_call_id="c", name="calculator", id="t"),
+            AIMessage(content="", id="run--", **GEMINI_METADATA),
+        ],
+        "summary": "",
+        "summarized_messages": 0,
+    }
+    checkpoint["channel_versions"] = {channel: "" for channel in graph.channels}
+    checkpoint["versions_seen"] = {node: {"": ""} for node in graph.nodes}
+    _, blob = JsonPlusSerializer().dumps_typed(checkpoint)
+    strings = []
+    for run in re.findall(rb"[\x20-\x7e]{3,}", blob):
+        text = run.decode().strip()
+        if text and not VOLATILE.search(text) and text not in strings:
+            strings.append(text)
+    strings.append("gemini-2.0-flash-lite")  # the lite tier (model_tiers.py)
+    return strings
+
+
+def build() -> str:
+    """A new dictionary from the current tools and message format"""
+    import langgraph_tool_backend as backend
+
+    graph = backend.build_graph().compile()
+    # zlib favours matches near the end of the dictionary: what every checkpoint has goes last
+    return "".join((
+        "\n".join(tool_texts(backend.tools)),
+        "".join(NETWORK_FRAGMENTS),
+        # Tool calls carry the tool's name and argument names
+        "".join(t.name + "".join(t.args) for t in backend.tools),
+        "".join(structure_texts(graph)),
+    ))
+
+
+def as_source(text: str, width: int = 100) -> str:
+    """`text` as a parenthesized run of string literals, for pasting in as a new version"""
+    lines = []
+    for line in text.splitlines(keepends=True):
+        while line:
+            chunk, line = line[:width], line[width:]
+            lines.append("    " + json.dumps(chunk, ensure_ascii=False))
+    return "(\n" + "\n".join(lines) + "\n)"
+
+
+# Version 1: built by build() from the tools and message format of this revision
+DICTIONARIES = {
+    1: (
+        "Result: 1+1 = 2\n"
+        "Error: Division by zero\n"
+        "Code Analysis for python:\n"
+        "\n"
+        "Issues Found:\n"
+        "- Security: Avoid using eval() - use ast.literal_eval() instead\n"
+        "- Style: Avoid wildcard imports\n"
+        "Suggestions:\n"
+        "- Consider using logging instead of print statements\n"
+        "Code Analysis for javascript:\n"
+        "\n"
+        "Suggestions:\n"
+        "- Use 'let' or 'const' instead of 'var'\n"
+        "- Use strict equality (===) instead of loose equality (==)\n"
+        "Code Analysis for python:\n"
+        "\n"
+        "Code looks good! No major issues found.\n"
+        "Data Analysis Result:\n"
+        "Sales data shows 15% growth YoY with peak in Q4\n"
+        "\n"
+        "Recommendations:\n"
+        "- Monitor trends closely\n"
+        "- Implement data-driven strategies\n"
+        "- Focus on high-performing segments\n"
+        "Data Analysis for '':\n"
+        "Processed successfully. Key metrics extracted and trends identified. Consider implementing dashboard"
+        " for real-time monitoring.\n"
+        "Startup Strategy Recommendations:\n"
+        "1. Validate your MVP with target customers\n"
+        "2. Focus on product-market fit before scaling\n"
+        "3. Build a strong founding team\n"
+        "4. Secure adequate runway (18-24 months)\n"
+        "5. Establish clear metrics and KPIs\n"
+        "\n"
+        "Next Steps: Conduct market research and create a lean business model canvas.\n"
+        "Marketing Strategy Framework:\n"
+        "1. Define target audience and personas\n"
+        "2. Choose appropriate channels (digital/traditional)\n"
+        "3. Create compelling value proposition\n"
+        "4. Implement content marketing strategy\n"
+        "5. Track ROI and optimize campaigns\n"
+        "\n"
+        "Recommended Tools: Google Analytics, social media platforms, email marketing.\n"
+        "Scaling Strategy:\n"
+        "1. Optimize core operations and processes\n"
+        "2. Invest in technology and automation\n"
+        "3. Build scalable team structure\n"
+        "4. Expand to new markets/segments\n"
+        "5. Maintain quality while growing\n"
+        "\n"
+        "Key Metrics: Customer acquisition cost, lifetime value, churn rate.\n"
+        "Business Analysis for '':\n"
+        "\n"
+        "Key Considerations:\n"
+        "- Market positioning and competitive advantage\n"
+        "- Revenue model optimization\n"
+        "- Operational efficiency improvements\n"
+        "- Risk management strategies\n"
+        "\n"
+        "Recommendation: Conduct SWOT analysis and develop 90-day action plan.\n"
+        "Blog Post Outline for '':\n"
+        "\n"
+        "Title: \"The Ultimate Guide to : Everything You Need to Know\"\n"
+        "\n"
+        "1. Introduction\n"
+        "   - Hook: Compelling statistic or question\n"
+        "   - Problem statement\n"
+        "   - What readers will learn\n"
+        "\n"
+        "2. Main Content\n"
+        "   - Key concepts and definitions\n"
+        "   - Step-by-step process\n"
+        "   - Real-world examples\n"
+        "   - Best practices\n"
+        "\n"
+        "3. Conclusion\n"
+        "   - Summary of key points\n"
+        "   - Call-to-action\n"
+        "   - Next steps for readers\n"
+        "\n"
+        "SEO Keywords: Include '' variations throughout\n"
+        "Word Count: 1500-2000 words\n"
+        "Social Media Content for '':\n"
+        "\n"
+        "📱 LinkedIn Post:\n"
+        "\"Excited to share insights about ! Here are 3 key takeaways that can transform your approach... [Thr"
+        "ead 1/3]\"\n"
+        "\n"
+        "🐦 Twitter Thread:\n"
+        "\"🧵 Everything you need to know about :\n"
+        "1/ The fundamentals\n"
+        "2/ Common mistakes to avoid\n"
+        "3/ Pro tips for success\"\n"
+        "\n"
+        "📸 Instagram Caption:\n"
+        "\"Behind the scenes of  ✨ Swipe to see the process that changed everything! #innovation #growth\"\n"
+        "\n"
+        "Hashtags: # #professional #insights\n"
+        "Email Campaign for '':\n"
+        "\n"
+        "Subject: \"Master  in 5 Minutes (Proven Framework Inside)\"\n"
+        "\n"
+        "Hi [Name],\n"
+        "\n"
+        "I've been getting tons of questions about , so I put together this quick guide.\n"
+        "\n"
+        "Here's what you'll discover:\n"
+        "✓ The #1 mistake people make with \n"
+        "✓ My proven 3-step framework\n"
+        "✓ Real results from our clients\n"
+        "\n"
+        "[CTA Button: Get the Free Guide]\n"
+        "\n"
+        "Best regards,\n"
+        "[Your Name]\n"
+        "\n"
+        "P.S. This guide has helped 1000+ professionals level up their skills.\n"
+        "Content created for  about ''. Professional copy with engaging headlines, clear structure, and compe"
+        "lling call-to-actions included.\n"
+        "Project Timeline Template:\n"
+        "\n"
+        "Phase 1: Planning (Weeks 1-2)\n"
+        "- Requirements gathering\n"
+        "- Stakeholder alignment\n"
+        "- Resource allocation\n"
+        "- Risk assessment\n"
+        "\n"
+        "Phase 2: Execution (Weeks 3-8)\n"
+        "- Development/Implementation\n"
+        "- Regular check-ins\n"
+        "\n"
+        "- Quality assurance\n"
+        "- Progress tracking\n"
+        "\n"
+        "Phase 3: Delivery (Weeks 9-10)\n"
+        "- Final testing\n"
+        "- Documentation\n"
+        "- Deployment\n"
+        "- Post-launch review\n"
+        "\n"
+        "Key Milestones:\n"
+        "✓ Week 2: Project kickoff\n"
+        "✓ Week 5: Mid-point review\n"
+        "✓ Week 8: Pre-launch testing\n"
+        "✓ Week 10: Project completion\n"
+        "Risk Management Framework:\n"
+        "\n"
+        "High Priority Risks:\n"
+        "1. Scope creep - Mitigation: Clear requirements documentation\n"
+        "2. Resource constraints - Mitigation: Buffer time and backup resources\n"
+        "3. Technical challenges - Mitigation: Proof of concept early\n"
+        "\n"
+        "Medium Priority Risks:\n"
+        "1. Stakeholder availability - Mitigation: Scheduled check-ins\n"
+        "2. Budget overrun - Mitigation: Regular budget reviews\n"
+        "\n"
+        "Risk Monitoring:\n"
+        "- Weekly risk assessment\n"
+        "- Escalation procedures\n"
+        "- Contingency plans activated\n"
+        "Project Management Plan for '':\n"
+        "\n"
+        "📋 Scope Definition:\n"
+        "- Clear objectives and deliverables\n"
+        "- Success criteria established\n"
+        "- Stakeholder responsibilities defined\n"
+        "\n"
+        "⏱️ Timeline:\n"
+        "- Milestone-based approach\n"
+        "- Buffer time included\n"
+        "- Dependencies mapped\n"
+        "\n"
+        "👥 Team Structure:\n"
+        "- Roles and responsibilities\n"
+        "- Communication protocols\n"
+        "- Reporting structure\n"
+        "\n"
+        "📊 Tracking:\n"
+        "- KPIs and metrics\n"
+        "- Regular status updates\n"
+        "- Issue escalation process\n"
+        "\n"
+        "Next Steps: Schedule kickoff meeting and finalize project charter.\n"
+        "Personal Budget Framework (50/30/20 Rule):\n"
+        "\n"
+        "💰 Income Allocation:\n"
+        "- 50% Needs (rent, utilities, groceries)\n"
+        "- 30% Wants (entertainment, dining out)\n"
+        "- 20% Savings & Debt Payment\n"
+        "\n"
+        "📊 Budget Categories:\n"
+        "1. Fixed Expenses: Rent, insurance, loans\n"
+        "2. Variable Expenses: Food, transportation\n"
+        "3. Discretionary: Entertainment, hobbies\n"
+        "4. Savings: Emergency fund, retirement\n"
+        "\n"
+        "🎯 Action Steps:\n"
+        "- Track expenses for 30 days\n"
+        "- Identify spending patterns\n"
+        "- Set realistic savings goals\n"
+        "- Review monthly and adjust\n"
+        "Investment Strategy Guidelines:\n"
+        "\n"
+        "📈 Portfolio Diversification:\n"
+        "- 60% Stocks (mix of growth/value)\n"
+        "- 30% Bonds (government/corporate)\n"
+        "- 10% Alternative investments\n"
+        "\n"
+        "⏰ Time Horizon Strategy:\n"
+        "- Short-term (1-3 years): Conservative bonds, CDs\n"
+        "- Medium-term (3-10 years): Balanced portfolio\n"
+        "- Long-term (10+ years): Growth-focused stocks\n"
+        "\n"
+        "🛡️ Risk Management:\n"
+        "- Dollar-cost averaging\n"
+        "- Regular rebalancing\n"
+        "- Emergency fund (3-6 months expenses)\n"
+        "\n"
+        "Note: Consult with licensed financial advisor for personalized advice.\n"
+        "Financial Analysis for '':\n"
+        "\n"
+        "💡 Key Recommendations:\n"
+        "1. Establish clear financial goals\n"
+        "2. Create comprehensive budget\n"
+        "3. Build emergency fund\n"
+        "4. Optimize tax strategies\n"
+        "5. Plan for retirement\n"
+        "\n"
+        "📋 Next Steps:\n"
+        "- Calculate net worth\n"
+        "- Review insurance coverage\n"
+        "- Assess investment portfolio\n"
+        "- Consider professional consultation\n"
+        "\n"
+        "Reminder: This is general guidance. Seek professional advice for specific situations.\n"
+        "Contract Review Checklist:\n"
+        "\n"
+        "📋 Essential Elements:\n"
+        "1. Clear parties identification\n"
+        "2. Detailed scope of work/deliverables\n"
+        "3. Payment terms and schedule\n"
+        "4. Timeline and milestones\n"
+        "5. Termination clauses\n"
+        "6. Liability and indemnification\n"
+        "7. Dispute resolution process\n"
+        "\n"
+        "⚠️ Red Flags:\n"
+        "- Vague or ambiguous language\n"
+        "- Unlimited liability clauses\n"
+        "- Automatic renewal terms\n"
+        "- Excessive penalties\n"
+        "\n"
+        "✅ Best Practices:\n"
+        "- Get everything in writing\n"
+        "- Define all technical terms\n"
+        "- Include change order process\n"
+        "- Specify governing law\n"
+        "\n"
+        "Disclaimer: Consult qualified attorney for legal advice.\n"
+        "Intellectual Property Protection:\n"
+        "\n"
+        "🔒 Types of IP:\n"
+        "1. Trademarks: Brand names, logos, slogans\n"
+        "2. Copyrights: Creative works, software code\n"
+        "3. Patents: Inventions, processes, designs\n"
+        "4. Trade Secrets: Confidential business info\n"
+        "\n"
+        "📝 Protection Steps:\n"
+        "- Document creation dates\n"
+        "- File appropriate registrations\n"
+        "- Use proper notices (©, ™, ®)\n"
+        "- Implement confidentiality agreements\n"
+        "- Monitor for infringement\n"
+        "\n"
+        "⚖️ Enforcement:\n"
+        "- Send cease and desist letters\n"
+        "- File infringement claims\n"
+        "- Seek damages and injunctions\n"
+        "\n"
+        "Recommendation: Work with IP attorney for comprehensive strategy.\n"
+        "Legal Guidance for '':\n"
+        "\n"
+        "⚖️ General Considerations:\n"
+        "1. Understand applicable laws and regulations\n"
+        "2. Document all business transactions\n"
+        "3. Maintain proper corporate records\n"
+        "4. Ensure compliance with industry standards\n"
+        "5. Regular legal health checks\n"
+        "\n"
+        "🛡️ Risk Mitigation:\n"
+        "- Comprehensive insurance coverage\n"
+        "- Clear policies and procedures\n"
+        "- Regular legal updates and training\n"
+        "- Professional legal counsel relationship\n"
+        "\n"
+        "Important: This is general information only. Consult licensed attorney for specific legal advice.\n"
+        "Recruitment Best Practices:\n"
+        "\n"
+        "📋 Hiring Process:\n"
+        "1. Job Analysis & Description\n"
+        "   - Clear role requirements\n"
+        "   - Skills and qualifications\n"
+        "   - Compensation range\n"
+        "\n"
+        "2. Sourcing Candidates\n"
+        "   - Job boards and LinkedIn\n"
+        "   - Employee referrals\n"
+        "   - Professional networks\n"
+        "\n"
+        "3. Screening & Interviews\n"
+        "   - Resume screening criteria\n"
+        "   - Structured interview questions\n"
+        "   - Skills assessments\n"
+        "\n"
+        "4. Selection & Onboarding\n"
+        "   - Reference checks\n"
+        "   - Background verification\n"
+        "   - Comprehensive onboarding plan\n"
+        "\n"
+        "🎯 Key Metrics:\n"
+        "- Time to hire\n"
+        "- Cost per hire\n"
+        "- Quality of hire\n"
+        "- Retention rates\n"
+        "Performance Management Framework:\n"
+        "\n"
+        "📊 Performance Cycle:\n"
+        "1. Goal Setting (SMART objectives)\n"
+        "2. Regular Check-ins (monthly/quarterly)\n"
+        "3. Mid-year Review\n"
+        "4. Annual Performance Review\n"
+        "5. Development Planning\n"
+        "\n"
+        "🎯 Evaluation Criteria:\n"
+        "- Job-specific competencies\n"
+        "- Behavioral indicators\n"
+        "- Goal achievement\n"
+        "- Professional development\n"
+        "\n"
+        "📈 Improvement Plans:\n"
+        "- Clear expectations\n"
+        "- Specific timelines\n"
+        "- Regular feedback\n"
+        "- Support and resources\n"
+        "- Progress monitoring\n"
+        "\n"
+        "💡 Best Practices:\n"
+        "- Document everything\n"
+        "- Focus on behaviors, not personality\n"
+        "- Provide constructive feedback\n"
+        "- Recognize achievements\n"
+        "HR Guidance for '':\n"
+        "\n"
+        "👥 Key HR Principles:\n"
+        "1. Fair and consistent treatment\n"
+        "2. Clear communication\n"
+        "3. Compliance with employment laws\n"
+        "4. Employee development focus\n"
+        "5. Positive workplace culture\n"
+        "\n"
+        "📚 Essential Policies:\n"
+        "- Code of conduct\n"
+        "- Anti-discrimination/harassment\n"
+        "- Leave and attendance\n"
+        "- Performance management\n"
+        "- Disciplinary procedures\n"
+        "\n"
+        "🔄 Continuous Improvement:\n"
+        "- Regular policy reviews\n"
+        "- Employee feedback surveys\n"
+        "- Training and development\n"
+        "- Stay updated on labor laws\n"
+        "\n"
+        "Recommendation: Consult HR professionals for complex situations.\n"
+        "Password & Authentication Security:\n"
+        "\n"
+        "🔐 Strong Password Policy:\n"
+        "- Minimum 12 characters\n"
+        "- Mix of uppercase, lowercase, numbers, symbols\n"
+        "- No dictionary words or personal info\n"
+        "- Unique passwords for each account\n"
+        "- Regular password updates\n"
+        "\n"
+        "🛡️ Multi-Factor Authentication (MFA):\n"
+        "- Something you know (password)\n"
+        "- Something you have (phone/token)\n"
+        "- Something you are (biometric)\n"
+        "\n"
+        "📱 Best Practices:\n"
+        "- Use password managers\n"
+        "- Enable MFA everywhere possible\n"
+        "- Avoid password reuse\n"
+        "- Regular security training\n"
+        "- Monitor for breaches\n"
+        "\n"
+        "⚠️ Red Flags:\n"
+        "- Suspicious login attempts\n"
+        "- Unexpected password reset emails\n"
+        "- Unfamiliar device notifications\n"
+        "Data Protection Framework:\n"
+        "\n"
+        "🔒 Data Classification:\n"
+        "1. Public: Marketing materials\n"
+        "2. Internal: Employee directories\n"
+        "3. Confidential: Financial records\n"
+        "4. Restricted: Personal data, trade secrets\n"
+        "\n"
+        "🛡️ Protection Measures:\n"
+        "- Encryption at rest and in transit\n"
+        "- Access controls and permissions\n"
+        "- Regular backups and testing\n"
+        "- Data loss prevention (DLP)\n"
+        "- Secure disposal procedures\n"
+        "\n"
+        "📋 Compliance Requirements:\n"
+        "- GDPR (EU residents)\n"
+        "- CCPA (California residents)\n"
+        "- HIPAA (Healthcare)\n"
+        "- SOX (Financial)\n"
+        "- Industry-specific regulations\n"
+        "\n"
+        "🚨 Incident Response:\n"
+        "- Detection and containment\n"
+        "- Assessment and notification\n"
+        "- Recovery and lessons learned\n"
+        "Cybersecurity Assessment for '':\n"
+        "\n"
+        "🔍 Security Checklist:\n"
+        "1. Network Security\n"
+        "   - Firewall configuration\n"
+        "   - VPN for remote access\n"
+        "   - Network monitoring\n"
+        "\n"
+        "2. Endpoint Protection\n"
+        "   - Antivirus/anti-malware\n"
+        "   - Device encryption\n"
+        "   - Patch management\n"
+        "\n"
+        "3. User Security\n"
+        "   - Security awareness training\n"
+        "   - Access management\n"
+        "   - Incident reporting\n"
+        "\n"
+        "4. Data Security\n"
+        "   - Backup strategies\n"
+        "   - Encryption protocols\n"
+        "   - Access controls\n"
+        "\n"
+        "🎯 Priority Actions:\n"
+        "- Conduct security audit\n"
+        "- Implement security policies\n"
+        "- Regular security training\n"
+        "- Incident response plan\n"
+        "# Quantum Physics: A Comprehensive Guide\n"
+        "\n"
+        "## What is Quantum Physics?\n"
+        "\n"
+        "Quantum physics is the fundamental theory in physics that describes the behavior of matter and energ"
+        "y at the atomic and subatomic scale. It reveals a strange world where particles can exist in multipl"
+        "e states simultaneously.\n"
+        "\n"
+        "## Core Principles\n"
+        "\n"
+        "### 1. Quantization\n"
+        "- Energy exists in discrete packets called \"quanta\"\n"
+        "- You can't have half a photon - energy comes in whole units\n"
+        "- **Example**: Light bulbs emit specific energy levels, creating distinct colors\n"
+        "\n"
+        "### 2. Wave-Particle Duality\n"
+        "- Matter and energy exhibit both wave and particle properties\n"
+        "- **Example**: Light acts as waves (interference patterns) and particles (photons)\n"
+        "\n"
+        "### 3. Uncertainty Principle\n"
+        "- Cannot simultaneously know exact position and momentum of a particle\n"
+        "- **Example**: Trying to measure an electron's position changes its momentum\n"
+        "\n"
+        "### 4. Superposition\n"
+        "- Particles can exist in multiple states at once until observed\n"
+        "- **Example**: Schrödinger's cat - theoretically both alive and dead until observed\n"
+        "\n"
+        "### 5. Quantum Entanglement\n"
+        "- Particles become connected and instantly affect each other regardless of distance\n"
+        "- **Example**: Measuring one entangled photon instantly determines its partner's state\n"
+        "\n"
+        "## Real-World Applications\n"
+        "\n"
+        "### Technology We Use Daily\n"
+        "- **Smartphones**: Transistors rely on quantum tunneling\n"
+        "- **Lasers**: Quantum energy transitions produce coherent light\n"
+        "- **MRI Machines**: Quantum spin of hydrogen atoms creates medical images\n"
+        "- **GPS Systems**: Require quantum corrections for accuracy\n"
+        "\n"
+        "### Emerging Technologies\n"
+        "- **Quantum Computers**: Solve complex problems exponentially faster\n"
+        "- **Quantum Cryptography**: Unbreakable secure communications\n"
+        "- **Quantum Sensors**: Ultra-precise measurements\n"
+        "\n"
+        "## Why It Matters\n"
+        "\n"
+        "Quantum physics isn't just abstract theory - it's the foundation of modern technology. From computer"
+        "s to solar panels, quantum mechanics makes our digital world possible.\n"
+        "\n"
+        "## Key Takeaway\n"
+        "\n"
+        "While quantum physics seems counterintuitive, it's one of the most successful theories in science, e"
+        "nabling technologies that seemed impossible just decades ago.\n"
+        "# Artificial Intelligence: The Technology Reshaping Our World\n"
+        "\n"
+        "## What is Artificial Intelligence?\n"
+        "\n"
+        "AI refers to computer systems that can perform tasks typically requiring human intelligence - learni"
+        "ng, reasoning, problem-solving, and decision-making.\n"
+        "\n"
+        "## Types of AI\n"
+        "\n"
+        "### Narrow AI (Current Reality)\n"
+        "- Specialized systems designed for specific tasks\n"
+        "- **Examples**: Siri, Netflix recommendations, chess programs\n"
+        "\n"
+        "### General AI (Future Goal)\n"
+        "- Human-level intelligence across all cognitive tasks\n"
+        "- **Status**: Still theoretical, possibly decades away\n"
+        "\n"
+        "## Core Technologies\n"
+        "\n"
+        "### Machine Learning\n"
+        "- Algorithms that improve through experience\n"
+        "- **Example**: Email spam filters learning to identify unwanted messages\n"
+        "\n"
+        "### Neural Networks\n"
+        "- Computing systems inspired by biological brain structure\n"
+        "- **Example**: Image recognition systems identifying objects in photos\n"
+        "\n"
+        "### Deep Learning\n"
+        "- Advanced neural networks with multiple layers\n"
+        "- **Example**: ChatGPT understanding and generating human-like text\n"
+        "\n"
+        "## AI in Your Daily Life\n"
+        "\n"
+        "### Entertainment & Media\n"
+        "- **Streaming**: Netflix, Spotify recommendations\n"
+        "- **Social Media**: Facebook's news feed algorithm\n"
+        "- **Gaming**: AI opponents that adapt to your style\n"
+        "\n"
+        "### Communication\n"
+        "- **Virtual Assistants**: Siri, Alexa, Google Assistant\n"
+        "- **Email**: Smart compose and spam filtering\n"
+        "- **Translation**: Google Translate converting 100+ languages\n"
+        "\n"
+        "## Transformative Applications\n"
+        "\n"
+        "### Healthcare Revolution\n"
+        "- **Medical Imaging**: AI detecting cancer in X-rays\n"
+        "- **Drug Discovery**: Accelerating new medication development\n"
+        "- **Example**: AI systems diagnose skin cancer more accurately than dermatologists\n"
+        "\n"
+        "### Scientific Breakthroughs\n"
+        "- **Climate Modeling**: Predicting weather and climate change\n"
+        "- **Space Exploration**: Analyzing telescope and rover data\n"
+        "- **Example**: AI helped design COVID-19 vaccines in record time\n"
+        "\n"
+        "## The Future of AI\n"
+        "\n"
+        "### Emerging Trends\n"
+        "- **Multimodal AI**: Understanding text, images, and audio together\n"
+        "- **Edge AI**: Processing on local devices for privacy and speed\n"
+        "- **Explainable AI**: Systems that can explain their decisions\n"
+        "\n"
+        "## Key Takeaway\n"
+        "\n"
+        "AI isn't replacing human intelligence - it's augmenting it. The most powerful applications combine A"
+        "I's computational abilities with human creativity and judgment.\n"
+        "# Exploring : Your Comprehensive Guide\n"
+        "\n"
+        "## How I Can Help You Learn\n"
+        "\n"
+        "I'm designed to provide detailed, well-structured explanations on virtually any topic. Think of me a"
+        "s your personal tutor who breaks down complex subjects into understandable concepts.\n"
+        "\n"
+        "## My Knowledge Areas\n"
+        "\n"
+        "### Science & Nature\n"
+        "- **Physics**: Quantum mechanics, relativity, thermodynamics\n"
+        "- **Chemistry**: Molecular interactions, reactions, materials\n"
+        "- **Biology**: Genetics, evolution, ecology, human body\n"
+        "- **Astronomy**: Space exploration, cosmology, planets\n"
+        "\n"
+        "### Technology & Innovation\n"
+        "- **Artificial Intelligence**: Machine learning, neural networks\n"
+        "- **Computer Science**: Programming, algorithms, cybersecurity\n"
+        "- **Engineering**: Mechanical, electrical, civil engineering\n"
+        "- **Emerging Tech**: Blockchain, IoT, renewable energy\n"
+        "\n"
+        "### Mathematics & Logic\n"
+        "- **Pure Math**: Algebra, calculus, geometry, statistics\n"
+        "- **Applied Math**: Financial modeling, data analysis\n"
+        "- **Logic**: Problem-solving, critical thinking\n"
+        "\n"
+        "### History & Culture\n"
+        "- **World History**: Ancient civilizations to modern events\n"
+        "- **Philosophy**: Ethics, logic, major thinkers\n"
+        "- **Arts**: Literature, music, visual arts, architecture\n"
+        "- **Geography**: Physical features, cultures, economics\n"
+        "\n"
+        "## My Response Style\n"
+        "\n"
+        "### Professional Formatting\n"
+        "- **Clear Headings**: Organized information hierarchy\n"
+        "- **Subheadings**: Breaking down complex topics\n"
+        "- **Examples**: Real-world applications and illustrations\n"
+        "- **Key Takeaways**: Essential points summarized\n"
+        "\n"
+        "### Comprehensive Coverage\n"
+        "- **Multiple Perspectives**: Different angles on topics\n"
+        "- **Progressive Complexity**: Building from basics to advanced\n"
+        "- **Practical Applications**: How knowledge applies to real life\n"
+        "- **Current Relevance**: Modern context and implications\n"
+        "\n"
+        "## Sample Questions I Excel At\n"
+        "\n"
+        "### Deep Explanations\n"
+        "- \"How does photosynthesis work at the molecular level?\"\n"
+        "- \"What caused the fall of the Roman Empire?\"\n"
+        "- \"Explain calculus in simple terms with examples\"\n"
+        "\n"
+        "### Practical Applications\n"
+        "- \"How can I use statistics in everyday decisions?\"\n"
+        "- \"What are the real-world uses of blockchain?\"\n"
+        "- \"How do vaccines work to prevent disease?\"\n"
+        "\n"
+        "### Comparative Analysis\n"
+        "- \"What's the difference between classical and quantum physics?\"\n"
+        "- \"How do different economic systems compare?\"\n"
+        "- \"What are the pros and cons of renewable energy?\"\n"
+        "\n"
+        "## Ready to Learn?\n"
+        "\n"
+        "Ask me about any topic and I'll provide:\n"
+        "- **Clear definitions** and core concepts\n"
+        "- **Step-by-step explanations** of complex processes\n"
+        "- **Real-world examples** and practical applications\n"
+        "- **Historical context** when relevant\n"
+        "- **Future implications** and emerging trends\n"
+        "\n"
+        "**What would you like to explore today?** stock price: $ (Change: Could not fetch stock price for Er"
+        "ror fetching stock price: I've generated an image for 'I've created an enhanced image preview for 'I"
+        "'ve created an image preview for ''.\n"
+        "\n"
+        "[IMAGE_GENERATED:generated_.png]I'm having trouble generating images right now. Please try again lat"
+        "er.duckduckgo_searchqueryget_stock_pricesymbolcalculatorexpressiongenerate_imageuser_promptcode_anal"
+        "yzercodelanguagedata_analystdata_querybusiness_consultantbusiness_querycontent_creatorcontent_typeto"
+        "picproject_managertaskfinancial_advisorfinancial_querylegal_advisorlegal_queryhr_specialisthr_queryc"
+        "ybersecurity_expertsecurity_queryknowledge_assistantquestionchannel_valuesmessageslangchain_core.mes"
+        "sages.humanHumanMessagecontentadditional_kwargsresponse_metadatatypehumannameexamplemodel_validate_j"
+        "sonlangchain_core.messages.aiAIMessagefunction_callcalculatorargumentsprompt_feedbackblock_reasonsaf"
+        "ety_ratingsfinish_reasonSTOPmodel_namegemini-2.0-flashrun--tool_callsargsexpressiontool_callinvalid_"
+        "tool_callsusage_metadatainput_tokensoutput_tokenstotal_tokensinput_token_detailscache_readoutput_tok"
+        "en_detailsreasoninglangchain_core.messages.toolToolMessagetooltool_call_idartifactstatussuccesssumma"
+        "rysummarized_messageschannel_versions__start____pregel_tasksbranch:to:chat_nodebranch:to:toolsversio"
+        "ns_seenchat_nodetoolspending_sendsgemini-2.0-flash-lite"
+    ).encode("utf-8"),
+}
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import tempfile
+
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    os.environ.setdefault("GOOGLE_API_KEY", "build-key")
+    os.environ.setdefault("CHATX_DB_PATH", os.path.join(tempfile.mkdtemp(), "chatbot.db"))
+    with contextlib.redirect_stdout(sys.stderr):  # the backend logs its setup with print
+        text = build()
+    print(f"# {len(text.encode('utf-8'))} bytes")
+    print(as_source(text))
@@ -0,0 +1,143 @@
+"""
+Checkpointer sharded across several SQLite files.
+
+SQLite allows one writer per database file, so with every worker writing every
+superstep into chatbot.db, writes queue on that file's lock. ShardedSaver hashes
+each thread_id to one of N savers (one file each), so turns on different threads
+write to different files in parallel. Calls scoped to a thread go to its shard;
+calls without a thread_id (`list(None)`, the thread catalog) fan out across all
+shards and merge the results.
+
+Changing the shard count moves threads to other files, so existing threads are
+only found again after migrating them (or going back to the old count).
+"""
+
+import heapq
+import os
+import zlib
+from itertools import islice
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+from thread_catalog import MAX_PAGE_SIZE, encode_cursor
+
+
+def shard_paths(path: str, shards: int) -> list:
+    """chatbot.db -> [chatbot.db] for one shard, [chatbot.shard0.db, ...] for more"""
+    if shards <= 1:
+        return [path]
+    root, ext = os.path.splitext(path)
+    return [f"{root}.shard{i}{ext or '.db'}" for i in range(shards)]
+
+
+def shard_index(thread_id, shards: int) -> int:
+    # crc32 is stable across processes and restarts, unlike hash()
+    return zlib.crc32(str(thread_id).encode("utf-8")) % shards
+
+
+def shards_from_env() -> int:
+    return max(1, int(os.getenv("CHATX_DB_SHARDS", "1")))
+
+
+def _checkpoint_id(item):
+    return item.config["configurable"]["checkpoint_id"]
+
+
+class ShardedSaver(BaseCheckpointSaver):
+    """Routes each thread to one of several savers by a stable hash of its thread_id"""
+
+    def __init__(self, shards: list):
+        if not shards:
+            raise ValueError("ShardedSaver needs at least one shard")
+        super().__init__(serde=shards[0].serde)
+        self.shards = list(shards)
+
+    def shard_for(self, config) -> BaseCheckpointSaver:
+        return self.shards[shard_index(config["configurable"]["thread_id"], len(self.shards))]
+
+    def _scoped(self, config) -> bool:
+        return bool(config) and config.get("configurable", {}).get("thread_id") is not None
+
+    def get_tuple(self, config):
+        return self.shard_for(config).get_tuple(config)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        if self._scoped(config):
+            yield from self.shard_for(config).list(config, filter=filter, before=before, limit=limit)
+            return
+        # Each shard lists newest first; merge them into one newest-first stream
+        merged = heapq.merge(
+            *(shard.list(config, filter=filter, before=before, limit=limit) for shard in self.shards),
+            key=_checkpoint_id, reverse=True,
+        )
+        yield from (islice(merged, limit) if limit else merged)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        return self.shard_for(config).put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        return self.shard_for(config).put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id):
+        return self.shards[shard_index(thread_id, len(self.shards))].delete_thread(thread_id)
+
+    async def aget_tuple(self, config):
+        return await self.shard_for(config).aget_tuple(config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        if self._scoped(config):
+            async for item in self.shard_for(config).alist(config, filter=filter, before=before, limit=limit):
+                yield item
+            return
+        items = []
+        for shard in self.shards:
+            items.extend([item async for item in shard.alist(config, filter=filter, before=before, limit=limit)])
+        items.sort(key=_checkpoint_id, reverse=True)
+        for item in items[:limit] if limit else items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await self.shard_for(config).aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await self.shard_for(config).aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await self.shards[shard_index(thread_id, len(self.shards))].adelete_thread(thread_id)
+
+    def get_next_version(self, current, channel):
+        return self.shards[0].get_next_version(current, channel)
+
+    def message_count_at(self, thread_id: str, checkpoint_id: str = None):
+        return self.shards[shard_index(thread_id, len(self.shards))].message_count_at(thread_id, checkpoint_id)
+
+    # Thread catalog: each shard is a thread_catalog.CatalogSaver over its own file
+    def list_threads(self, limit: int = 50, sort: str = "updated_at", order: str = "desc", cursor: str = None):
+        """
+        Merge one page from every shard. The keyset cursor is a (value, thread_id)
+        position in the global order, so each shard can resume from it directly.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        pages = [shard.list_threads(limit=limit, sort=sort, order=order, cursor=cursor) for shard in self.shards]
+        rows = sorted((row for page in pages for row in page["threads"]),
+                      key=lambda row: (row[sort], row["thread_id"]), reverse=(order == "desc"))
+        threads = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit or any(page["next_cursor"] for page in pages):
+            last = threads[-1]
+            next_cursor = encode_cursor(last[sort], last["thread_id"])
+        return {"threads": threads, "next_cursor": next_cursor}
+
+    def thread_ids(self) -> list:
+        """All thread ids, most recently updated first"""
+        rows, cursor = [], None
+        while True:
+            page = self.list_threads(limit=MAX_PAGE_SIZE, cursor=cursor)
+            rows.extend(row["thread_id"] for row in page["threads"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return rows
+
+    def close(self):
+        for shard in self.shards:
+            shard.close()
@@ -0,0 +1,160 @@
+"""
+Pooled SQLite checkpointer.
+
+SqliteSaver funnels every read and write through one connection and one lock, so
+loading a thread's state waits behind whatever checkpoint write is in progress.
+PooledSqliteSaver keeps that connection as the single writer and serves reads
+(get_tuple, list, catalog queries) from a small pool of read-only connections.
+In WAL mode readers see the last committed snapshot and never block the writer.
+
+Every connection gets the same tunable pragmas (see pragmas_from_env).
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from typing import cast
+
+from langgraph.checkpoint.base import CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.utils import search_where
+
+from compressed_serde import serde_from_env
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,           # ms to wait for a lock before SQLITE_BUSY
+    "mmap_size": 256 * 1024 * 1024,  # bytes of the file memory-mapped for reads
+    "cache_size": -16000,           # negative = KiB of page cache per connection
+}
+
+
+def pragmas_from_env() -> dict:
+    return {
+        "journal_mode": "WAL",
+        "synchronous": os.getenv("CHATX_SQLITE_SYNCHRONOUS", DEFAULT_PRAGMAS["synchronous"]),
+        "busy_timeout": int(os.getenv("CHATX_SQLITE_BUSY_TIMEOUT_MS", DEFAULT_PRAGMAS["busy_timeout"])),
+        "mmap_size": int(os.getenv("CHATX_SQLITE_MMAP_SIZE", DEFAULT_PRAGMAS["mmap_size"])),
+        "cache_size": int(os.getenv("CHATX_SQLITE_CACHE_SIZE", DEFAULT_PRAGMAS["cache_size"])),
+    }
+
+
+def connect(path: str, pragmas: dict, read_only: bool = False) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=pragmas.get("busy_timeout", 5000) / 1000)
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    if read_only:
+        conn.execute("PRAGMA query_only=1")
+    return conn
+
+
+class PooledSqliteSaver(SqliteSaver):
+    """SqliteSaver with one writer connection and a pool of reader connections"""
+
+    def __init__(self, path: str, readers: int = 4, pragmas: dict = None, **kwargs):
+        if path == ":memory:" or path.startswith("file::memory:"):
+            raise ValueError("PooledSqliteSaver needs a database file; in-memory databases are per connection")
+        self.path = path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        super().__init__(connect(path, self.pragmas), **kwargs)
+        self.max_readers = max(1, readers)
+        self._readers = queue.LifoQueue()
+        self._opened = []
+        self._pool_lock = threading.Lock()
+        self._batch_thread = None
+
+    @contextmanager
+    def _reader(self):
+        """Borrow a reader connection, opening one if the pool is not full yet"""
+        if not self.is_setup:
+            with self.lock:
+                self.setup()
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._pool_lock:
+                if len(self._opened) < self.max_readers:
+                    conn = connect(self.path, self.pragmas, read_only=True)
+                    self._opened.append(conn)
+            if conn is None:
+                conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def cursor(self, transaction: bool = True):
+        if transaction:
+            # Writes stay serialized on the writer connection; inside batch()
+            # the commit is left to the end of the batch
+            with super().cursor(transaction=self._batch_thread != threading.get_ident()) as cur:
+                yield cur
+            return
+        with self._reader() as conn, closing(conn.cursor()) as cur:
+            yield cur
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        # Same as SqliteSaver.list, but both cursors come from one reader
+        # connection (the base class opens the writes cursor on self.conn)
+        where, param_values = search_where(config, filter, before)
+        query = f"""SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata
+        FROM checkpoints
+        {where}
+        ORDER BY checkpoint_id DESC"""
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        with self._reader() as conn, closing(conn.cursor()) as cur, closing(conn.cursor()) as wcur:
+            cur.execute(query, param_values)
+            for thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata in cur:
+                wcur.execute(
+                    "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                )
+                yield CheckpointTuple(
+                    {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+                    self.serde.loads_typed((type, checkpoint)),
+                    cast(CheckpointMetadata, self.jsonplus_serde.loads(metadata) if metadata is not None else {}),
+                    (
+                        {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_checkpoint_id}}
+                        if parent_checkpoint_id
+                        else None
+                    ),
+                    [(task_id, channel, self.serde.loads_typed((type, value))) for task_id, channel, type, value in wcur],
+                )
+
+    @contextmanager
+    def batch(self):
+        """Commit every write made by this thread inside the block in one transaction"""
+        self._batch_thread = threading.get_ident()
+        try:
+            yield
+        finally:
+            self._batch_thread = None
+            with self.lock:
+                self.conn.commit()
+
+    def stats(self) -> dict:
+        return {"readers_open": len(self._opened), "readers_idle": self._readers.qsize(),
+                "max_readers": self.max_readers}
+
+    def close(self):
+        with self._pool_lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened = []
+            self._readers = queue.LifoQueue()
+        self.conn.close()
+
+
+def saver_from_env(path: str) -> PooledSqliteSaver:
+    return PooledSqliteSaver(
+        path,
+        readers=int(os.getenv("CHATX_SQLITE_READERS", "4")),
+        pragmas=pragmas_from_env(),
+        serde=serde_from_env(),
+    )
@@ -0,0 +1,80 @@
+"""
+Small SQLite helpers shared by the side tables ChatX keeps next to the checkpointer
+(LLM cache, traces, ...).
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# PRAGMA auto_vacuum values as SQLite reports them
+AUTO_VACUUM_MODES = {"NONE": 0, "FULL": 1, "INCREMENTAL": 2}
+
+
+class ProcessLocalConnection:
+    """
+    A lazily opened SQLite connection guarded by a lock.
+
+    The connection is (re)opened on first use in each process, so objects holding
+    one can be created at import time in the gunicorn master and still be safe to
+    use in forked workers.
+
+    `auto_vacuum` (e.g. "INCREMENTAL") is set before anything is written, as
+    SQLite requires; an existing file created with another mode is rebuilt with
+    VACUUM once so the mode takes effect.
+    """
+
+    def __init__(self, path: str, schema: str = "", auto_vacuum: str = None):
+        self.path = path
+        self.schema = schema
+        self.auto_vacuum = auto_vacuum
+        self.lock = threading.RLock()
+        self._conn = None
+        self._pid = None
+
+    def _open(self) -> sqlite3.Connection:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.auto_vacuum:
+            # Must come first: switching to WAL already writes the database header
+            conn.execute(f"PRAGMA auto_vacuum={self.auto_vacuum}")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if self.schema:
+            conn.executescript(self.schema)
+        if self.auto_vacuum:
+            (mode,) = conn.execute("PRAGMA auto_vacuum").fetchone()
+            if mode != AUTO_VACUUM_MODES[self.auto_vacuum.upper()]:
+                print(f"Rebuilding {self.path} with auto_vacuum={self.auto_vacuum}")
+                conn.execute(f"PRAGMA auto_vacuum={self.auto_vacuum}")
+                conn.execute("VACUUM")
+        return conn
+
+    @contextmanager
+    def cursor(self, transaction: bool = True):
+        """Yield a cursor under the lock, committing afterwards if `transaction`"""
+        with self.lock:
+            if self._conn is None or self._pid != os.getpid():
+                # Never reuse a connection inherited across fork
+                self._conn = self._open()
+                self._pid = os.getpid()
+            cur = self._conn.cursor()
+            try:
+                yield cur
+                if transaction:
+                    self._conn.commit()
+            except Exception:
+                if transaction:
+                    self._conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+    def close(self):
+        with self.lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
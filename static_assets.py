@@ -0,0 +1,174 @@
+"""
+In-memory serving of the React build with precompressed variants.
+
+At startup every file under frontend/build is read once into a manifest together
+with gzip (and, when the `brotli` package is installed, brotli) variants of the
+compressible ones. Requests are answered from memory: the encoding is negotiated
+from Accept-Encoding, each representation carries its own strong ETag, and CRA's
+content-hashed files (main.3f2a1b4c.js) are cached by browsers for a year.
+
+Running `python static_assets.py [build_dir]` after `npm run build` writes the
+.gz/.br files next to the originals so workers load them instead of compressing
+at startup.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# CRA puts an 8+ hex digit content hash in the names of everything under static/
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}\.(?:chunk\.)?[a-z0-9]+(?:\.map)?$')
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json',
+                      'application/manifest+json', 'image/svg+xml', 'application/xml')
+# Below this size compression saves less than the header overhead
+MIN_COMPRESS_SIZE = 512
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def guess_mime_type(path: str) -> str:
+    if path.endswith('.js') or path.endswith('.mjs'):
+        return 'application/javascript'
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'gzip':
+        # mtime=0 keeps the output (and so its ETag) stable across restarts
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    raise ValueError(f"Unknown encoding: {encoding}")
+
+
+def available_encodings():
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+class Asset:
+    """One build file and its encoded variants, held in memory"""
+
+    def __init__(self, path: str, data: bytes, mime_type: str, hashed: bool):
+        self.path = path
+        self.mime_type = mime_type
+        self.hashed = hashed
+        self.etag = hashlib.sha256(data).hexdigest()[:32]
+        # encoding -> bytes; None is the identity representation
+        self.variants = {None: data}
+
+    @property
+    def compressible(self) -> bool:
+        return self.mime_type.startswith(COMPRESSIBLE_TYPES) and len(self.variants[None]) >= MIN_COMPRESS_SIZE
+
+
+class StaticAssets:
+    """Manifest of a build directory, keyed by path relative to it ('static/js/main.abc123.js')"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.assets = {}
+        self.load()
+
+    def load(self):
+        assets = {}
+        if os.path.isdir(self.root):
+            for dirpath, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    full_path = os.path.join(dirpath, filename)
+                    if filename.endswith(('.gz', '.br')):
+                        continue
+                    relpath = os.path.relpath(full_path, self.root).replace(os.sep, '/')
+                    assets[relpath] = self._load_asset(full_path, relpath)
+        self.assets = assets
+        total = sum(len(a.variants[None]) for a in assets.values())
+        print(f"[INFO] Loaded {len(assets)} static assets ({total} bytes) from {self.root}, "
+              f"encodings: {', '.join(available_encodings())}")
+
+    def _load_asset(self, full_path: str, relpath: str) -> Asset:
+        with open(full_path, 'rb') as f:
+            data = f.read()
+        asset = Asset(relpath, data, guess_mime_type(relpath), bool(HASHED_NAME.search(relpath)))
+        if not asset.compressible:
+            return asset
+        mtime = os.stat(full_path).st_mtime
+        for encoding in available_encodings():
+            precompressed = full_path + ENCODING_SUFFIXES[encoding]
+            if os.path.exists(precompressed) and os.stat(precompressed).st_mtime >= mtime:
+                with open(precompressed, 'rb') as f:
+                    encoded = f.read()
+            else:
+                encoded = compress(data, encoding)
+            # Only keep variants that actually save bytes
+            if len(encoded) < len(data):
+                asset.variants[encoding] = encoded
+        return asset
+
+    def get(self, relpath: str):
+        return self.assets.get(relpath)
+
+    def response(self, relpath: str):
+        """Build the response for `relpath` in the current request, or None if unknown"""
+        asset = self.assets.get(relpath)
+        if asset is None:
+            return None
+
+        encoding = self.negotiate(asset)
+        body = asset.variants[encoding]
+        response = Response(body, mimetype=asset.mime_type)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if len(asset.variants) > 1:
+            response.vary.add('Accept-Encoding')
+        # Each representation needs its own strong validator
+        response.set_etag(f"{asset.etag}-{encoding}" if encoding else asset.etag)
+        response.headers['Cache-Control'] = (
+            IMMUTABLE_CACHE_CONTROL if asset.hashed else REVALIDATE_CACHE_CONTROL
+        )
+        return response.make_conditional(request)
+
+    @staticmethod
+    def negotiate(asset: Asset):
+        accepted = request.accept_encodings
+        for encoding in ('br', 'gzip'):
+            if encoding in asset.variants and accepted[encoding] > 0:
+                return encoding
+        return None
+
+
+def precompress(root: str):
+    """Write .gz/.br siblings for every compressible file under `root`"""
+    written = 0
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(('.gz', '.br')):
+                continue
+            full_path = os.path.join(dirpath, filename)
+            if not guess_mime_type(filename).startswith(COMPRESSIBLE_TYPES):
+                continue
+            with open(full_path, 'rb') as f:
+                data = f.read()
+            if len(data) < MIN_COMPRESS_SIZE:
+                continue
+            for encoding in available_encodings():
+                encoded = compress(data, encoding)
+                with open(full_path + ENCODING_SUFFIXES[encoding], 'wb') as f:
+                    f.write(encoded)
+                written += 1
+                print(f"[INFO] {os.path.relpath(full_path, root)} {encoding}: {len(data)} -> {len(encoded)} bytes")
+    print(f"[INFO] Wrote {written} precompressed files")
+
+
+if __name__ == '__main__':
+    precompress(sys.argv[1] if len(sys.argv) > 1 else os.path.join('frontend', 'build'))
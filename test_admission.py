@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for per-thread serialization and global admission control
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import test_support  # noqa: F401  sets the test environment, so it comes before the backend is imported
+
+from langchain_core.messages import AIMessage
+
+import api_server
+from admission import AdmissionController, Overloaded
+
+
+def test_same_thread_turns_run_in_order():
+    """Turns on one thread never overlap; other threads run alongside"""
+    print("Testing per-thread serialization...")
+
+    controller = AdmissionController(max_concurrent=4, max_queued=8, queue_timeout=5)
+    log = []
+    active = {"t1": 0}
+    overlaps = []
+
+    def turn(thread_id, label):
+        with controller.admit(thread_id):
+            if thread_id == "t1":
+                active["t1"] += 1
+                if active["t1"] > 1:
+                    overlaps.append(label)
+            time.sleep(0.05)
+            log.append(label)
+            if thread_id == "t1":
+                active["t1"] -= 1
+
+    workers = [threading.Thread(target=turn, args=("t1", f"t1-{i}")) for i in range(4)]
+    workers.append(threading.Thread(target=turn, args=("t2", "t2-0")))
+    for worker in workers:
+        worker.start()
+        time.sleep(0.005)
+    for worker in workers:
+        worker.join()
+
+    assert not overlaps
+    assert len(log) == 5
+    assert controller.stats()["in_flight"] == 0
+    assert controller.stats()["active_threads"] == 0
+    print("✓ Same-thread turns serialized")
+
+
+def test_global_limit_and_fast_rejection():
+    """Runs beyond concurrency + queue depth are rejected immediately"""
+    print("Testing global admission limit...")
+
+    controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=5, retry_after=3)
+    release = threading.Event()
+    started = threading.Event()
+
+    def hold(thread_id):
+        with controller.admit(thread_id):
+            started.set()
+            release.wait()
+
+    running = threading.Thread(target=hold, args=("a",))
+    running.start()
+    started.wait()
+    queued = threading.Thread(target=hold, args=("b",))
+    queued.start()
+    time.sleep(0.05)
+
+    start = time.perf_counter()
+    try:
+        controller.acquire("c")
+        raise AssertionError("third run should have been rejected")
+    except Overloaded as e:
+        assert e.retry_after == 3
+    assert time.perf_counter() - start < 0.1
+
+    release.set()
+    running.join()
+    queued.join()
+    with controller.admit("c"):
+        pass
+    print("✓ Overload rejected without waiting")
+
+
+def test_queue_timeout():
+    """A queued run gives up after queue_timeout"""
+    print("Testing queue timeout...")
+
+    controller = AdmissionController(max_concurrent=1, max_queued=4, queue_timeout=0.1)
+    ticket = controller.acquire("busy")
+    try:
+        controller.acquire("other")
+        raise AssertionError("expected Overloaded")
+    except Overloaded:
+        pass
+    ticket.release()
+    ticket.release()  # releasing twice is harmless
+    assert controller.stats()["in_flight"] == 0
+    print("✓ Queue timeout enforced")
+
+
+def test_chat_returns_429_with_retry_after():
+    """/api/chat answers 429 with Retry-After when the server is saturated"""
+    print("Testing /api/chat overload response...")
+
+    class InstantChatbot:
+        def invoke(self, inputs, config=None, durability=None):
+            return {"messages": inputs["messages"] + [AIMessage(content="ok")]}
+
+    original_chatbot, original_admission = api_server.chatbot, api_server.admission
+    api_server.chatbot = InstantChatbot()
+    api_server.admission = AdmissionController(max_concurrent=1, max_queued=0, retry_after=5)
+    ticket = api_server.admission.acquire("someone-else")
+    try:
+        client = api_server.app.test_client()
+        response = client.post('/api/chat', json={'message': 'hi', 'thread_id': 't'})
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '5'
+
+        response = client.post('/api/chat/stream', json={'message': 'hi', 'thread_id': 't'})
+        assert response.status_code == 429
+
+        ticket.release()
+        response = client.post('/api/chat', json={'message': 'hi', 'thread_id': 't'})
+        assert response.status_code == 200
+        assert response.json['response'] == 'ok'
+    finally:
+        api_server.chatbot, api_server.admission = original_chatbot, original_admission
+    print("✓ Overload surfaced as 429 with Retry-After")
+
+
+if __name__ == "__main__":
+    test_same_thread_turns_run_in_order()
+    test_global_limit_and_fast_rejection()
+    test_queue_timeout()
+    test_chat_returns_429_with_retry_after()
+    print("\nAdmission control tests completed!")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test script for the ASGI entry point (ainvoke/astream on AsyncSqliteSaver)
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import chat_model, temp_db_path
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import asgi
+import langgraph_tool_backend
+from admission import AsyncAdmissionController
+
+
+class SlowEchoModel(BaseChatModel):
+    """Answers with the last user message after an artificial async delay"""
+
+    delay: float = 0.2
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"echo: {messages[-1].content}"))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"echo: {messages[-1].content}"))])
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow-echo"
+
+
+async def run_with_app(scenario):
+    original_db = langgraph_tool_backend.DB_PATH
+    langgraph_tool_backend.DB_PATH = temp_db_path()
+    try:
+        with chat_model(SlowEchoModel()):
+            async with asgi.lifespan(asgi.app):
+                transport = httpx.ASGITransport(app=asgi.app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                    return await scenario(client)
+    finally:
+        langgraph_tool_backend.DB_PATH = original_db
+
+
+def test_async_chat_persists_history():
+    """Turns on the same thread accumulate in the async checkpointer"""
+    print("Testing ASGI /api/chat with AsyncSqliteSaver...")
+
+    async def scenario(client):
+        first = await client.post('/api/chat', json={'message': 'hello', 'thread_id': 'a1'})
+        second = await client.post('/api/chat', json={'message': 'again', 'thread_id': 'a1'})
+        state = await asgi.chatbot.aget_state({"configurable": {"thread_id": "a1"}})
+        return first, second, state
+
+    first, second, state = asyncio.run(run_with_app(scenario))
+    assert first.status_code == 200
+    assert first.json() == {'response': 'echo: hello', 'thread_id': 'a1'}
+    assert second.json()['response'] == 'echo: again'
+    assert len(state.values["messages"]) == 4
+    print("✓ Async chat turns persisted")
+
+
+def test_concurrent_requests_overlap():
+    """Many in-flight turns wait on I/O concurrently instead of one at a time"""
+    print("Testing concurrent ASGI chat requests...")
+
+    async def scenario(client):
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post('/api/chat', json={'message': f'm{i}', 'thread_id': f'c{i}'})
+            for i in range(20)
+        ])
+        return responses, time.perf_counter() - start
+
+    responses, elapsed = asyncio.run(run_with_app(scenario))
+    assert all(r.status_code == 200 for r in responses)
+    # 20 sequential turns would take at least 4 seconds
+    assert elapsed < 2.0, f"requests did not overlap ({elapsed:.2f}s)"
+    print(f"✓ 20 concurrent turns finished in {elapsed:.2f}s")
+
+
+def test_same_thread_turns_serialized():
+    """Concurrent turns on one thread run one after another, so none is lost"""
+    print("Testing concurrent turns on one ASGI thread...")
+
+    async def scenario(client):
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post('/api/chat', json={'message': f'turn {i}', 'thread_id': 'same'})
+            for i in range(3)
+        ])
+        elapsed = time.perf_counter() - start
+        state = await asgi.chatbot.aget_state({"configurable": {"thread_id": "same"}})
+        return responses, elapsed, state
+
+    responses, elapsed, state = asyncio.run(run_with_app(scenario))
+    assert all(r.status_code == 200 for r in responses)
+    assert len(state.values["messages"]) == 6
+    assert elapsed >= 3 * SlowEchoModel().delay
+    print(f"✓ 3 turns on one thread kept, {elapsed:.2f}s")
+
+
+def test_overload_returns_429():
+    """Requests beyond the run limit and queue get 429 with Retry-After"""
+    print("Testing ASGI overload response...")
+
+    async def scenario(client):
+        asgi.admission = AsyncAdmissionController(max_concurrent=1, max_queued=0, retry_after=5)
+        ticket = await asgi.admission.acquire("someone-else")
+        busy = await client.post('/api/chat', json={'message': 'hi', 'thread_id': 't'})
+        busy_stream = await client.post('/api/chat/stream', json={'message': 'hi', 'thread_id': 't'})
+        ticket.release()
+        ok = await client.post('/api/chat', json={'message': 'hi', 'thread_id': 't'})
+        return busy, busy_stream, ok, asgi.admission.stats()
+
+    busy, busy_stream, ok, stats = asyncio.run(run_with_app(scenario))
+    assert busy.status_code == 429 and busy.headers['Retry-After'] == '5'
+    assert busy_stream.status_code == 429
+    assert ok.status_code == 200
+    assert stats["in_flight"] == 0
+    print("✓ Overload surfaced as 429 with Retry-After")
+
+
+def test_async_stream_endpoint():
+    """astream chunks are forwarded as SSE and end with done"""
+    print("Testing ASGI /api/chat/stream...")
+
+    async def scenario(client):
+        response = await client.post('/api/chat/stream', json={'message': 'stream me', 'thread_id': 's1'})
+        return response, asgi.admission.stats()
+
+    response, stats = asyncio.run(run_with_app(scenario))
+    assert stats["in_flight"] == 0  # the ticket is released when the stream ends
+    events = [json.loads(line[6:]) for line in response.text.splitlines() if line.startswith('data: ')]
+    assert response.headers['content-type'].startswith('text/event-stream')
+    assert ''.join(e.get('content', '') for e in events if e['type'] == 'chunk') == 'echo: stream me'
+    assert events[-1] == {'type': 'done', 'thread_id': 's1'}
+    print("✓ Async stream forwarded correctly")
+
+
+if __name__ == "__main__":
+    test_async_chat_persists_history()
+    test_concurrent_requests_overlap()
+    test_same_thread_turns_serialized()
+    test_overload_returns_429()
+    test_async_stream_endpoint()
+    print("\nASGI entry point tests completed!")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the end-to-end HTTP load benchmark
+"""
+
+import json
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_http import IMAGE_DIR, build_parser, percentile, run
+
+
+def test_percentile():
+    """Nearest-rank percentiles"""
+    print("Testing percentiles...")
+
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile([7], 0.99) == 7
+    assert percentile([], 0.5) is None
+    print("✓ Percentiles")
+
+
+def test_short_run():
+    """A short run against a real server reports every metric without errors"""
+    print("Testing a short benchmark run...")
+
+    image_dir_existed = os.path.isdir(IMAGE_DIR)
+    images_before = set(os.listdir(IMAGE_DIR)) if image_dir_existed else set()
+    args = build_parser().parse_args(["--server", "flask", "--duration", "2", "--concurrency", "3",
+                                      "--llm-latency-ms", "5", "--threads", "4"])
+    result = run(args)
+    json.dumps(result)
+
+    assert result["latency"]["requests"] > 0 and result["throughput_rps"] > 0
+    assert result["error_rate"] == 0.0, result["errors"]
+    assert set(result["latency_by_kind"]) == {"chat", "image", "static"}
+    summary = result["latency_by_kind"]["chat"]
+    assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+    assert result["db_growth_bytes"] > 0
+    assert result["memory_after"]["master_rss_kb"] > 0
+
+    # The benchmark image is removed again
+    assert os.path.isdir(IMAGE_DIR) == image_dir_existed
+    if image_dir_existed:
+        assert set(os.listdir(IMAGE_DIR)) == images_before
+    print(f"✓ {result['latency']['requests']} requests at {result['throughput_rps']} req/s")
+
+
+if __name__ == "__main__":
+    test_percentile()
+    test_short_run()
+    print("\nHTTP benchmark tests completed!")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test script for the backend microbenchmarks
+"""
+
+import json
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import test_support  # noqa: F401  sets the test environment, so it comes before the backend is imported
+
+from benchmark_micro import compare, run
+
+
+def test_quick_run():
+    """Every case reports a positive time per call, as JSON"""
+    print("Testing a quick microbenchmark run...")
+
+    result = run(quick=True)
+    json.dumps(result)
+    names = set(result["results"])
+    for expected in ("detect_image_style", "optimize_image_prompt_advanced", "simplify_prompt_for_api",
+                     "create_enhanced_placeholder", "create_simple_placeholder", "expert.knowledge_assistant",
+                     "checkpoint_round_trip.100_messages", "retrieve_all_threads.10000_checkpoints"):
+        assert expected in names, expected
+    assert all(case["us_per_call"] > 0 and case["best_us"] <= case["us_per_call"]
+               for case in result["results"].values())
+    print(f"✓ {len(names)} cases")
+
+
+def test_compare_flags_regressions():
+    """Only cases slower than the baseline by more than the threshold are reported"""
+    print("Testing baseline comparison...")
+
+    baseline = {"results": {"fast": {"us_per_call": 10.0}, "slow": {"us_per_call": 10.0}}}
+    current = {"results": {"fast": {"us_per_call": 11.0}, "slow": {"us_per_call": 20.0},
+                           "new": {"us_per_call": 5.0}}}
+    assert compare(current, baseline, 0.25) == [("slow", 10.0, 20.0, 2.0)]
+    assert compare(current, baseline, 1.5) == []
+    print("✓ Regressions flagged")
+
+
+if __name__ == "__main__":
+    test_quick_run()
+    test_compare_flags_regressions()
+    print("\nMicrobenchmark tests completed!")
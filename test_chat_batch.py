@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the bulk chat endpoint /api/chat/batch
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import test_support  # noqa: F401  sets the test environment, so it comes before the backend is imported
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+import api_server
+
+
+def make_fake_chatbot(delay=0.0, fail_on=None):
+    """A Runnable with real batch()/max_concurrency semantics standing in for the graph"""
+    state = {"active": 0, "peak": 0, "configs": []}
+    lock = threading.Lock()
+
+    def run_turn(inputs, config, **kwargs):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            state["configs"].append(config)
+        try:
+            time.sleep(delay)
+            message = inputs["messages"][0].content
+            if message == fail_on:
+                raise RuntimeError(f"failed on {message}")
+            return {"messages": inputs["messages"] + [AIMessage(content=f"reply to {message}")]}
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    return RunnableLambda(run_turn), state
+
+
+def post_batch(fake, payload):
+    original = api_server.chatbot
+    api_server.chatbot = fake
+    try:
+        return api_server.app.test_client().post('/api/chat/batch', json=payload)
+    finally:
+        api_server.chatbot = original
+
+
+def test_batch_results_in_input_order_with_errors():
+    """Results keep input order and failures are recorded per item"""
+    print("Testing /api/chat/batch ordering and per-item errors...")
+
+    fake, _ = make_fake_chatbot(fail_on="boom")
+    response = post_batch(fake, {'items': [
+        {'thread_id': 't1', 'message': 'first'},
+        {'thread_id': 't2', 'message': 'boom'},
+        {'thread_id': 't3', 'message': ''},
+        {'thread_id': 't1', 'message': 'again'},
+        {'thread_id': 't4', 'message': 'last'},
+    ]})
+    assert response.status_code == 200
+    results = response.json['results']
+    assert results[0] == {'thread_id': 't1', 'response': 'reply to first'}
+    assert results[1] == {'thread_id': 't2', 'error': 'failed on boom'}
+    assert results[2] == {'thread_id': 't3', 'error': 'Message is required'}
+    assert results[3] == {'thread_id': 't1', 'error': 'Duplicate thread_id in batch'}
+    assert results[4] == {'thread_id': 't4', 'response': 'reply to last'}
+    print("✓ Batch results ordered with per-item errors")
+
+
+def test_batch_respects_max_concurrency():
+    """Items run concurrently, but never more than max_concurrency at once"""
+    print("Testing /api/chat/batch concurrency...")
+
+    fake, state = make_fake_chatbot(delay=0.1)
+    items = [{'thread_id': f't{i}', 'message': f'm{i}'} for i in range(8)]
+
+    start = time.perf_counter()
+    response = post_batch(fake, {'items': items, 'max_concurrency': 4})
+    elapsed = time.perf_counter() - start
+
+    assert response.status_code == 200
+    assert [r['response'] for r in response.json['results']] == [f'reply to m{i}' for i in range(8)]
+    assert state["peak"] == 4
+    assert elapsed < 0.6, f"batch did not run concurrently ({elapsed:.2f}s)"
+    assert {c["configurable"]["thread_id"] for c in state["configs"]} == {f't{i}' for i in range(8)}
+    print(f"✓ 8 items with max_concurrency=4 finished in {elapsed:.2f}s")
+
+
+def test_batch_validation():
+    """Malformed batch requests are rejected up front"""
+    print("Testing /api/chat/batch validation...")
+
+    fake, _ = make_fake_chatbot()
+    assert post_batch(fake, {}).status_code == 400
+    assert post_batch(fake, {'items': []}).status_code == 400
+    assert post_batch(fake, {'items': [{'message': 'x'}], 'max_concurrency': 'lots'}).status_code == 400
+    too_many = [{'message': 'x'}] * (api_server.BATCH_MAX_ITEMS + 1)
+    assert post_batch(fake, {'items': too_many}).status_code == 400
+    print("✓ Invalid batches rejected")
+
+
+if __name__ == "__main__":
+    test_batch_results_in_input_order_with_errors()
+    test_batch_respects_max_concurrency()
+    test_batch_validation()
+    print("\nBatch endpoint tests completed!")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the Server-Sent Events chat streaming endpoint
+"""
+
+import json
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import test_support  # noqa: F401  sets the test environment, so it comes before the backend is imported
+
+from langchain_core.messages import AIMessageChunk, ToolMessage
+
+import api_server
+
+
+class FakeChatbot:
+    """Stands in for the compiled graph and replays a fixed message stream"""
+
+    def __init__(self, stream_items):
+        self.stream_items = stream_items
+        self.calls = []
+
+    def stream(self, input, config=None, stream_mode=None, durability=None):
+        self.calls.append((input, config, stream_mode))
+        for item in self.stream_items:
+            yield item
+
+
+def post_with_chatbot(fake, path, payload):
+    """POST to the API with the compiled graph swapped for a fake"""
+    original = api_server.chatbot
+    api_server.chatbot = fake
+    try:
+        return api_server.app.test_client().post(path, json=payload)
+    finally:
+        api_server.chatbot = original
+
+
+def parse_events(body: str) -> list[dict]:
+    return [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+
+
+def test_stream_endpoint_forwards_chunks_and_tool_events():
+    """Chunks, tool_start/tool_end and done are forwarded in order"""
+    print("Testing /api/chat/stream event forwarding...")
+
+    fake = FakeChatbot([
+        (AIMessageChunk(content="", tool_call_chunks=[
+            {"name": "calculator", "args": '{"expression": "2+2"}', "id": "call-1", "index": 0}
+        ]), {"langgraph_node": "chat_node"}),
+        (ToolMessage(content="Result: 2+2 = 4", name="calculator", tool_call_id="call-1"), {"langgraph_node": "tools"}),
+        (AIMessageChunk(content="The answer "), {"langgraph_node": "chat_node"}),
+        (AIMessageChunk(content="is 4."), {"langgraph_node": "chat_node"}),
+    ])
+    response = post_with_chatbot(fake, '/api/chat/stream', {'message': 'What is 2+2?', 'thread_id': 'thread-1'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    events = parse_events(response.get_data(as_text=True))
+    assert [e['type'] for e in events] == ['tool_start', 'tool_end', 'chunk', 'chunk', 'done']
+    assert events[0]['name'] == 'calculator'
+    assert events[1]['tool_call_id'] == 'call-1'
+    assert ''.join(e['content'] for e in events if e['type'] == 'chunk') == 'The answer is 4.'
+    assert events[-1]['thread_id'] == 'thread-1'
+
+    _, config, stream_mode = fake.calls[0]
+    assert stream_mode == 'messages'
+    assert config['configurable']['thread_id'] == 'thread-1'
+    print("✓ Stream events forwarded correctly")
+
+
+def test_chat_stream_flag_uses_streaming():
+    """`"stream": true` on /api/chat returns the same SSE stream"""
+    print("Testing /api/chat with stream flag...")
+
+    fake = FakeChatbot([(AIMessageChunk(content="Hello"), {"langgraph_node": "chat_node"})])
+    response = post_with_chatbot(fake, '/api/chat', {'message': 'Hi', 'stream': True})
+    events = parse_events(response.get_data(as_text=True))
+    assert response.mimetype == 'text/event-stream'
+    assert events[0] == {'type': 'chunk', 'content': 'Hello'}
+    assert events[-1]['type'] == 'done' and events[-1]['thread_id']
+    print("✓ Stream flag handled correctly")
+
+
+def test_stream_errors_are_reported_as_events():
+    """Graph failures mid-stream end the stream with an error event"""
+    print("Testing stream error handling...")
+
+    class FailingChatbot:
+        def stream(self, *args, **kwargs):
+            yield (AIMessageChunk(content="Partial"), {"langgraph_node": "chat_node"})
+            raise RuntimeError("Gemini unavailable")
+
+    response = post_with_chatbot(FailingChatbot(), '/api/chat/stream', {'message': 'Hi', 'thread_id': 'thread-2'})
+    events = parse_events(response.get_data(as_text=True))
+    assert events[-1] == {'type': 'error', 'error': 'Gemini unavailable', 'thread_id': 'thread-2'}
+
+    response = post_with_chatbot(FailingChatbot(), '/api/chat/stream', {})
+    assert response.status_code == 400
+    print("✓ Stream errors reported correctly")
+
+
+if __name__ == "__main__":
+    test_stream_endpoint_forwards_chunks_and_tool_events()
+    test_chat_stream_flag_uses_streaming()
+    test_stream_errors_are_reported_as_events()
+    print("\nStreaming endpoint tests completed!")
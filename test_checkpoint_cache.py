@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory cache of hot thread states
+"""
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import EchoModel, chat_model, temp_db_path
+
+from langchain_core.messages import HumanMessage
+
+import api_server
+import langgraph_tool_backend as backend
+from checkpoint_cache import CachingSaver
+from sqlite_pool import PooledSqliteSaver
+
+
+def chat(saver, thread_id, turns, first=0):
+    with chat_model(EchoModel(content="answer {n}")):
+        graph = backend.build_graph().compile(checkpointer=saver)
+        for turn in range(first, first + turns):
+            graph.invoke({"messages": [HumanMessage(content=f"question {turn}")]},
+                         config={"configurable": {"thread_id": thread_id}})
+        return graph
+
+
+def test_active_thread_served_from_memory():
+    """Turns after the first read their starting state from the cache, unchanged"""
+    print("Testing cache hits...")
+
+    pool = PooledSqliteSaver(temp_db_path())
+    saver = CachingSaver(pool)
+    chat(saver, "hot", 4)
+    stats = saver.cache_stats()
+    assert stats["misses"] == 1 and stats["hits"] == 3, stats
+
+    config = {"configurable": {"thread_id": "hot"}}
+    cached, stored = saver.get_tuple(config), pool.get_tuple(config)
+    assert cached.config == stored.config and cached.parent_config == stored.parent_config
+    assert cached.checkpoint["channel_values"] == stored.checkpoint["channel_values"]
+    assert cached.checkpoint["channel_versions"] == stored.checkpoint["channel_versions"]
+    assert cached.checkpoint["versions_seen"] == stored.checkpoint["versions_seen"]
+    assert cached.metadata == stored.metadata
+    assert cached.pending_writes == stored.pending_writes == []
+    print("✓ Cached state matches SQLite")
+
+
+def test_other_workers_writes_invalidate():
+    """A newer checkpoint written by another worker is never hidden by the cache"""
+    print("Testing validation against the latest checkpoint...")
+
+    path = temp_db_path()
+    worker_a, worker_b = CachingSaver(PooledSqliteSaver(path)), CachingSaver(PooledSqliteSaver(path))
+    chat(worker_a, "shared", 1)
+    chat(worker_b, "shared", 1, first=1)
+    graph_a = chat(worker_a, "shared", 0)
+
+    state = graph_a.get_state({"configurable": {"thread_id": "shared"}})
+    assert [m.content for m in state.values["messages"]][-2:] == ["question 1", "answer 3"]
+    assert worker_a.cache_stats()["stale"] == 1
+
+    # Without validation a hit never touches SQLite (its connection is closed here)
+    unchecked = CachingSaver(PooledSqliteSaver(path), validate=False)
+    unchecked.get_tuple({"configurable": {"thread_id": "shared"}})
+    unchecked.inner.close()
+    assert unchecked.get_tuple({"configurable": {"thread_id": "shared"}}) is not None
+    print("✓ Stale entries detected")
+
+
+def test_bounded_by_bytes():
+    """Least recently used threads are evicted to stay under max_bytes"""
+    print("Testing the byte bound...")
+
+    saver = CachingSaver(PooledSqliteSaver(temp_db_path()), max_bytes=8 * 1024)
+    for i in range(10):
+        chat(saver, f"thread-{i}", 2)
+    stats = saver.cache_stats()
+    assert stats["bytes"] <= 8 * 1024 and stats["evictions"] > 0
+    assert stats["entries"] < 10
+
+    state = chat(saver, "thread-0", 0).get_state({"configurable": {"thread_id": "thread-0"}})
+    assert len(state.values["messages"]) == 4
+    print(f"✓ {stats['entries']} threads in {stats['bytes']} bytes, {stats['evictions']} evictions")
+
+
+def test_stats_endpoint():
+    """/api/cache/stats reports the app's checkpoint cache"""
+    print("Testing /api/cache/stats...")
+
+    chat(backend.checkpointer, "stats", 2)
+    stats = api_server.app.test_client().get('/api/cache/stats').json['checkpoint_cache']
+    assert stats['enabled'] and stats['hits'] >= 1 and 'hit_rate' in stats
+    print("✓ Stats exposed")
+
+
+if __name__ == "__main__":
+    test_active_thread_served_from_memory()
+    test_other_workers_writes_invalidate()
+    test_bounded_by_bytes()
+    test_stats_endpoint()
+    print("\nCheckpoint cache tests completed!")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for checkpoint retention and the compaction command
+"""
+
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import EchoModel, chat_model, temp_db_path
+
+import aiosqlite
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+import langgraph_tool_backend as backend
+from checkpoint_maintenance import RetentionSaver, compact
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_turns(saver, threads, turns):
+    graph = backend.build_graph().compile(checkpointer=saver)
+    for thread_id in threads:
+        config = {"configurable": {"thread_id": thread_id}}
+        for turn in range(turns):
+            graph.invoke({"messages": [HumanMessage(content=f"message {turn}")]}, config=config)
+    return graph
+
+
+def checkpoint_counts(path):
+    conn = sqlite3.connect(path)
+    try:
+        counts = dict(conn.execute("SELECT thread_id, COUNT(*) FROM checkpoints GROUP BY thread_id"))
+        orphans = conn.execute(
+            "SELECT COUNT(*) FROM writes w WHERE NOT EXISTS (SELECT 1 FROM checkpoints c "
+            "WHERE c.thread_id = w.thread_id AND c.checkpoint_ns = w.checkpoint_ns "
+            "AND c.checkpoint_id = w.checkpoint_id)"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    return counts, orphans
+
+
+def with_echo_model(fn):
+    with chat_model(EchoModel(content="reply " * 100)):
+        return fn()
+
+
+def test_online_retention():
+    """Each thread keeps only its newest checkpoints and the latest state is intact"""
+    print("Testing online retention...")
+
+    path = temp_db_path()
+    saver = RetentionSaver(SqliteSaver(sqlite3.connect(path, check_same_thread=False)), keep=3)
+    graph = with_echo_model(lambda: run_turns(saver, ["a", "b"], 8))
+
+    counts, orphans = checkpoint_counts(path)
+    assert counts == {"a": 3, "b": 3}
+    assert orphans == 0
+    state = graph.get_state({"configurable": {"thread_id": "a"}})
+    assert len(state.values["messages"]) == 16
+    assert state.values["messages"][-2].content == "message 7"
+    print("✓ Online retention keeps the newest checkpoints")
+
+
+def test_online_retention_async():
+    """The async saver used by the ASGI app is pruned the same way"""
+    print("Testing async online retention...")
+
+    path = temp_db_path()
+
+    async def run():
+        async with aiosqlite.connect(path) as conn:
+            saver = AsyncSqliteSaver(conn)
+            await saver.setup()
+            graph = backend.build_graph(backend.achat_node).compile(checkpointer=RetentionSaver(saver, keep=2))
+            config = {"configurable": {"thread_id": "async-thread"}}
+            for turn in range(5):
+                await graph.ainvoke({"messages": [HumanMessage(content=f"message {turn}")]}, config=config)
+            return (await graph.aget_state(config)).values
+
+    values = with_echo_model(lambda: asyncio.run(run()))
+    assert len(values["messages"]) == 10
+    counts, orphans = checkpoint_counts(path)
+    assert counts == {"async-thread": 2}
+    assert orphans == 0
+    print("✓ Async retention keeps the newest checkpoints")
+
+
+def test_compaction_reclaims_space():
+    """compact prunes every thread, truncates the WAL and shrinks the file"""
+    print("Testing compaction...")
+
+    path = temp_db_path()
+    conn = sqlite3.connect(path, check_same_thread=False)
+    graph = with_echo_model(lambda: run_turns(SqliteSaver(conn), ["x", "y", "z"], 10))
+    conn.close()
+    counts, _ = checkpoint_counts(path)
+    assert all(count > 20 for count in counts.values())
+
+    result = compact(path, keep=2)
+    assert result["checkpoints_deleted"] == result["checkpoints_before"] - 6
+    assert result["bytes_reclaimed"] > 0
+    assert result["bytes_after"] < result["bytes_before"]
+    assert not os.path.exists(path + "-wal") or os.path.getsize(path + "-wal") == 0
+
+    counts, orphans = checkpoint_counts(path)
+    assert counts == {"x": 2, "y": 2, "z": 2}
+    assert orphans == 0
+
+    graph = backend.build_graph().compile(checkpointer=SqliteSaver(sqlite3.connect(path, check_same_thread=False)))
+    state = graph.get_state({"configurable": {"thread_id": "y"}})
+    assert len(state.values["messages"]) == 20
+    print(f"✓ Compaction reclaimed {result['bytes_reclaimed']} bytes")
+
+
+def test_compaction_command():
+    """The command-line entry point reports what it reclaimed"""
+    print("Testing compaction command...")
+
+    path = temp_db_path()
+    conn = sqlite3.connect(path, check_same_thread=False)
+    with_echo_model(lambda: run_turns(SqliteSaver(conn), ["cli"], 5))
+    conn.close()
+
+    output = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "checkpoint_maintenance.py"), "--db", path, "--keep", "1"],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    assert "bytes reclaimed" in output
+    assert checkpoint_counts(path)[0] == {"cli": 1}
+    print("✓ Compaction command works")
+
+
+if __name__ == "__main__":
+    test_online_retention()
+    test_online_retention_async()
+    test_compaction_reclaims_space()
+    test_compaction_command()
+    print("\nCheckpoint maintenance tests completed!")
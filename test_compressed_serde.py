@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the compressed checkpoint serializer
+"""
+
+import os
+import sqlite3
+import sys
+import zlib
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import chat_model, temp_db_path
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import langgraph_tool_backend as backend
+from compressed_serde import DICTIONARIES, DICTIONARY_VERSION, CompressedSerializer, zstandard
+from sqlite_pool import PooledSqliteSaver
+
+ANSWER = "## Key Takeaway\n\n" + "\n".join(f"- **Point {i}**: a long markdown answer line" for i in range(60))
+
+
+class MarkdownModel(BaseChatModel):
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=ANSWER))])
+
+    @property
+    def _llm_type(self) -> str:
+        return "markdown"
+
+
+def chat(saver, thread_id, turns=2):
+    with chat_model(MarkdownModel()):
+        graph = backend.build_graph().compile(checkpointer=saver)
+        for turn in range(turns):
+            graph.invoke({"messages": [HumanMessage(content=f"question {turn}")]},
+                         config={"configurable": {"thread_id": thread_id}})
+        return graph
+
+
+def stored(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT type, LENGTH(checkpoint) FROM checkpoints ORDER BY checkpoint_id DESC").fetchall()
+
+
+def test_round_trip_and_size():
+    """Checkpoints are stored compressed, tagged with the codec, and load back intact"""
+    print("Testing compressed round trip...")
+
+    sizes = {}
+    codecs = ["none", "zlib"] + (["zstd"] if zstandard is not None else [])
+    for codec in codecs:
+        path = temp_db_path()
+        saver = PooledSqliteSaver(path, serde=CompressedSerializer(codec=codec))
+        graph = chat(saver, "t")
+        state = graph.get_state({"configurable": {"thread_id": "t"}})
+        assert [m.content for m in state.values["messages"]] == ["question 0", ANSWER, "question 1", ANSWER]
+
+        type_, size = stored(path)[0]
+        assert type_ == ("msgpack" if codec == "none" else f"msgpack+{codec}1")
+        sizes[codec] = size
+        saver.close()
+
+    for codec in codecs[1:]:
+        assert sizes[codec] * 3 < sizes["none"], sizes
+    print(f"✓ Latest checkpoint bytes: {sizes}")
+
+
+def test_uncompressed_rows_stay_readable():
+    """A database written without compression keeps working after turning it on"""
+    print("Testing old rows...")
+
+    path = temp_db_path()
+    plain = PooledSqliteSaver(path, serde=CompressedSerializer(codec="none"))
+    chat(plain, "old", turns=1)
+    plain.close()
+
+    saver = PooledSqliteSaver(path, serde=CompressedSerializer(codec="zlib"))
+    graph = chat(saver, "old", turns=1)
+    types = {type_ for type_, _ in stored(path)}
+    assert {"msgpack", "msgpack+zlib1"} <= types
+    history = list(graph.get_state_history({"configurable": {"thread_id": "old"}}))
+    assert len(history[0].values["messages"]) == 4
+    assert all(snapshot.values is not None for snapshot in history)
+
+    serde = CompressedSerializer()
+    assert serde.dumps_typed({"small": 1})[0] == "msgpack"
+    for tag in ("lz4", "brotli1", "zlib99"):
+        try:
+            serde.loads_typed((f"msgpack+{tag}", b""))
+            raise AssertionError("unknown codecs must be rejected")
+        except ValueError:
+            pass
+    saver.close()
+    print("✓ Mixed compressed and uncompressed rows load")
+
+
+def test_dictionary_primes_tool_output():
+    """The preset dictionary fits zlib's window and shrinks a short tool result"""
+    print("Testing preset dictionary...")
+
+    assert len(DICTIONARIES[DICTIONARY_VERSION]) <= 32 * 1024  # zlib only uses the last 32KB
+    result = ToolMessage(content=backend.financial_advisor.func("budget"), tool_call_id="c", name="financial_advisor")
+    type_, data = CompressedSerializer(codec="none").dumps_typed(result)
+    plain = zlib.compress(data, 6)
+    primed = CompressedSerializer().compress(data, "zlib")
+    assert len(primed) * 3 < len(plain), (len(primed), len(plain))
+    print(f"✓ Tool result: {len(data)} bytes, {len(plain)} with zlib, {len(primed)} with the dictionary")
+
+
+def test_backend_uses_compression():
+    """The app's checkpointer compresses by default"""
+    print("Testing backend wiring...")
+
+    path = temp_db_path()
+    chat(backend.open_shard(path), "wired", turns=1)
+    assert stored(path)[0][0] == "msgpack+zlib1"
+    print("✓ Backend checkpoints compressed")
+
+
+if __name__ == "__main__":
+    test_round_trip_and_size()
+    test_uncompressed_rows_stay_readable()
+    test_dictionary_primes_tool_output()
+    test_backend_uses_compression()
+    print("\nCompressed serializer tests completed!")
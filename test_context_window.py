@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test script for token-budgeted history windowing with rolling summaries
+"""
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import chat_model
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import InMemorySaver
+
+import langgraph_tool_backend as backend
+from context_window import ContextWindow, estimate_tokens, window_start
+
+
+class RecordingModel(BaseChatModel):
+    """Answers every turn with a long reply and remembers each prompt's size"""
+
+    prompt_tokens: list = []
+    calls: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        self.prompt_tokens.append(sum(estimate_tokens(m) for m in messages))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="word " * 200))])
+
+    @property
+    def _llm_type(self) -> str:
+        return "recording"
+
+
+class FakeSummarizer(BaseChatModel):
+    calls: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"SUMMARY v{self.calls}"))])
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-summarizer"
+
+
+def tool_turn(question, call_id):
+    return [
+        HumanMessage(content=question),
+        AIMessage(content="", tool_calls=[{"name": "calculator", "args": {"expression": "2+2"}, "id": call_id}]),
+        ToolMessage(content="Result: 4 " * 100, name="calculator", tool_call_id=call_id),
+        AIMessage(content="It is 4."),
+    ]
+
+
+def test_window_keeps_tool_pairs_together():
+    """The window starts at a user message, never between a tool call and its result"""
+    print("Testing window boundaries...")
+
+    messages = tool_turn("first?", "c1") + tool_turn("second?", "c2") + tool_turn("third?", "c3")
+    turn_tokens = sum(estimate_tokens(m) for m in messages[:4])
+
+    start = window_start(messages, 0, keep_tokens=turn_tokens + 10)
+    assert start == 8
+    assert isinstance(messages[start], HumanMessage)
+
+    # Even a budget smaller than one turn keeps the whole current turn
+    start = window_start(messages, 0, keep_tokens=10)
+    assert start == 8
+
+    tool_call_ids = {m.tool_call_id for m in messages[start:] if isinstance(m, ToolMessage)}
+    issued = {c["id"] for m in messages[start:] if isinstance(m, AIMessage) for c in m.tool_calls}
+    assert tool_call_ids <= issued
+    print("✓ Tool-call/tool-result pairs kept intact")
+
+
+def test_short_threads_are_untouched():
+    """Below the budget the prompt is exactly the history and no summary is made"""
+    print("Testing short threads...")
+
+    summarizer = FakeSummarizer()
+    window = ContextWindow(summarizer, max_tokens=5000)
+    state = {"messages": tool_turn("hi", "c1")}
+    prompt, update = window.prepare(state)
+    assert prompt == state["messages"]
+    assert update == {}
+    assert summarizer.calls == 0
+    print("✓ Short threads sent verbatim")
+
+
+def test_prompt_size_stays_flat_for_long_threads():
+    """Prompt size is bounded by the budget however many turns the thread has"""
+    print("Testing long thread prompt sizes...")
+
+    model = RecordingModel(prompt_tokens=[])
+    summarizer = FakeSummarizer()
+    original_window = backend.context_window
+    backend.context_window = ContextWindow(summarizer.with_config(tags=["nostream"]),
+                                           max_tokens=2000, keep_tokens=1000)
+    try:
+        with chat_model(model):
+            graph = backend.build_graph().compile(checkpointer=InMemorySaver())
+            config = {"configurable": {"thread_id": "long-thread"}}
+            streamed = []
+            for turn in range(40):
+                for chunk, metadata in graph.stream(
+                    {"messages": [HumanMessage(content=f"question {turn} " + "detail " * 50)]},
+                    config=config, stream_mode="messages",
+                ):
+                    streamed.append(chunk.content)
+
+            state = graph.get_state(config).values
+    finally:
+        backend.context_window = original_window
+
+    assert len(state["messages"]) == 80
+    assert state["summary"].startswith("SUMMARY")
+    assert 0 < state["summarized_messages"] < 80
+    # Budget plus the summary message and the current turn
+    assert max(model.prompt_tokens) <= 2000 + 300
+    assert max(model.prompt_tokens[20:]) - min(model.prompt_tokens[20:]) < 1500
+    # One summary per ~(max_tokens - keep_tokens) of new history, not per turn
+    assert 1 < summarizer.calls < 20
+    # The summarizer's output never reaches the client stream
+    assert not any("SUMMARY" in str(content) for content in streamed)
+    print(f"✓ Prompt stayed within {max(model.prompt_tokens)} tokens over 40 turns "
+          f"({summarizer.calls} summaries)")
+
+
+def test_summary_is_prepended_and_failures_degrade():
+    """The summary leads the prompt; a failing summarizer still bounds the prompt"""
+    print("Testing summary prompt and summarizer failure...")
+
+    messages = []
+    for i in range(6):
+        messages += tool_turn(f"q{i}", f"c{i}")
+
+    window = ContextWindow(FakeSummarizer(), max_tokens=300, keep_tokens=150)
+    prompt, update = window.prepare({"messages": messages, "summary": "old", "summarized_messages": 4})
+    assert isinstance(prompt[0], SystemMessage) and "SUMMARY v1" in prompt[0].content
+    assert isinstance(prompt[1], HumanMessage)
+    assert update["summarized_messages"] == 20
+
+    class BrokenSummarizer:
+        def invoke(self, messages):
+            raise RuntimeError("quota exceeded")
+
+    window = ContextWindow(BrokenSummarizer(), max_tokens=300, keep_tokens=150)
+    prompt, update = window.prepare({"messages": messages, "summary": "old", "summarized_messages": 4})
+    assert update == {}
+    assert "old" in prompt[0].content
+    assert len(prompt) == 1 + 4
+    print("✓ Summary prepended; failures fall back to the trimmed window")
+
+
+if __name__ == "__main__":
+    test_window_keeps_tool_pairs_together()
+    test_short_threads_are_untouched()
+    test_prompt_size_stays_flat_for_long_threads()
+    test_summary_is_prepended_and_failures_degrade()
+    print("\nContext window tests completed!")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for checkpoint durability modes (sync / async / exit)
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import CalculatorModel, chat_model, temp_db_path
+
+from langchain_core.messages import HumanMessage
+
+import api_server
+import langgraph_tool_backend as backend
+from sqlite_pool import PooledSqliteSaver
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+# Runs one turn in a child process that dies before the final chat_node finishes
+CRASH_SCRIPT = textwrap.dedent("""
+    import sys
+    sys.path.insert(0, sys.argv[3])
+    from langchain_core.messages import HumanMessage
+    import langgraph_tool_backend as backend
+    from sqlite_pool import PooledSqliteSaver
+    from test_support import CalculatorModel
+
+    backend.llm_with_tools = CalculatorModel(crash=True)
+    graph = backend.build_graph().compile(checkpointer=PooledSqliteSaver(sys.argv[1]))
+    graph.invoke({"messages": [HumanMessage(content="what is 6*7?")]},
+                 config={"configurable": {"thread_id": "crash"}}, durability=sys.argv[2])
+""")
+
+
+def checkpoints(thread_id):
+    return list(backend.checkpointer.list({"configurable": {"thread_id": thread_id}}))
+
+
+def test_checkpoints_written_per_mode():
+    """sync and async write every step, exit writes once; the override is validated"""
+    print("Testing checkpoints per mode...")
+
+    client = api_server.app.test_client()
+    with chat_model(CalculatorModel()):
+        counts = {}
+        for mode in ("sync", "async", "exit"):
+            response = client.post('/api/chat', json={'message': 'what is 6*7?', 'thread_id': f'mode-{mode}',
+                                                      'durability': mode})
+            assert response.status_code == 200 and response.json['response'] == '42'
+            counts[mode] = len(checkpoints(f'mode-{mode}'))
+            state = backend.chatbot.get_state({"configurable": {"thread_id": f'mode-{mode}'}})
+            assert len(state.values["messages"]) == 4 and state.next == ()
+
+        assert counts["sync"] == counts["async"] == 5
+        assert counts["exit"] == 1
+
+        response = client.post('/api/chat', json={'message': 'hi', 'durability': 'eventually'})
+        assert response.status_code == 400
+    print(f"✓ Checkpoints per turn: {counts}")
+
+
+def crash_turn(mode):
+    path = temp_db_path()
+    result = subprocess.run([sys.executable, "-c", CRASH_SCRIPT, path, mode, ROOT],
+                            capture_output=True, text=True, timeout=120,
+                            env={**os.environ, "CHATX_DB_PATH": path})
+    assert result.returncode == 1, result.stderr
+    saver = PooledSqliteSaver(path)
+    return saver, saver.get_tuple({"configurable": {"thread_id": "crash"}})
+
+
+def test_crash_consistency():
+    """What survives a process dying mid-turn in each mode"""
+    print("Testing crash consistency...")
+
+    # sync: every completed step survives and the turn can be resumed
+    saver, saved = crash_turn("sync")
+    messages = saved.checkpoint["channel_values"]["messages"]
+    assert [m.type for m in messages] == ["human", "ai", "tool"]
+    with chat_model(CalculatorModel()):
+        graph = backend.build_graph().compile(checkpointer=saver)
+        final = graph.invoke(None, config={"configurable": {"thread_id": "crash"}})
+        assert final["messages"][-1].content == "42" and len(final["messages"]) == 4
+
+    # async: completed steps survive, but the newest may still have been in flight
+    _, saved = crash_turn("async")
+    messages = saved.checkpoint["channel_values"]["messages"]
+    assert [m.type for m in messages] == ["human", "ai", "tool"][:len(messages)] and messages
+
+    # exit: nothing from the interrupted turn is stored
+    _, saved = crash_turn("exit")
+    assert saved is None
+    print("✓ sync resumable, async loses at most the last step, exit loses the turn")
+
+
+if __name__ == "__main__":
+    test_checkpoints_written_per_mode()
+    test_crash_consistency()
+    print("\nDurability tests completed!")
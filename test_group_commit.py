@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the group-commit checkpoint writer
+"""
+
+import os
+import sys
+import threading
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import EchoModel, chat_model, temp_db_path
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+
+import langgraph_tool_backend as backend
+from group_commit import GroupCommitSaver
+from sqlite_pool import PooledSqliteSaver
+from thread_catalog import CatalogSaver
+
+
+def new_saver(**kwargs):
+    path = temp_db_path()
+    return GroupCommitSaver(CatalogSaver(PooledSqliteSaver(path)), **kwargs)
+
+
+def config(thread_id):
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+
+def test_concurrent_turns_share_commits():
+    """Turns on many threads all persist, with fewer commits than writes"""
+    print("Testing concurrent turns...")
+
+    saver = new_saver(max_delay_ms=5)
+    graph = backend.build_graph().compile(checkpointer=saver)
+    errors = []
+
+    def run(index):
+        try:
+            for turn in range(3):
+                graph.invoke({"messages": [HumanMessage(content=f"turn {turn}")]},
+                             config={"configurable": {"thread_id": f"worker-{index}"}}, durability="sync")
+        except Exception as e:
+            errors.append(e)
+
+    with chat_model(EchoModel()):
+        workers = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    assert not errors, errors
+    for i in range(8):
+        state = graph.get_state({"configurable": {"thread_id": f"worker-{i}"}})
+        assert len(state.values["messages"]) == 6
+    assert len(saver.thread_ids()) == 8
+    stats = saver.commit_stats()
+    assert stats["queued"] == 0
+    assert stats["batches"] < stats["items"], stats
+    saver.close()
+    print(f"✓ {stats['items']} writes in {stats['batches']} commits")
+
+
+def test_futures_and_read_your_writes():
+    """submit_put returns a future; reads wait for the thread's queued writes"""
+    print("Testing futures and read-your-writes...")
+
+    saver = new_saver(max_delay_ms=50)
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": []}
+    future = saver.submit_put(config("queued"), checkpoint, {}, {})
+
+    saved = saver.get_tuple(config("queued"))
+    assert saved is not None and saved.checkpoint["id"] == checkpoint["id"]
+    assert future.done()
+    assert future.result()["configurable"]["checkpoint_id"] == checkpoint["id"]
+
+    # A failing write fails its own future only
+    bad = saver.submit_put_writes({"configurable": {"thread_id": "queued"}}, [("messages", [])], "task")
+    good = saver.submit_put(config("other"), empty_checkpoint(), {}, {})
+    saver.flush()
+    assert isinstance(bad.exception(), KeyError)
+    assert good.exception() is None and saver.get_tuple(config("other")) is not None
+
+    saver.close()
+    try:
+        saver.submit_put(config("late"), empty_checkpoint(), {}, {})
+        raise AssertionError("writes after close must be rejected")
+    except RuntimeError:
+        pass
+    print("✓ Futures resolve after commit; reads see queued writes")
+
+
+def test_enabled_from_env():
+    """CHATX_GROUP_COMMIT=1 adds the writer to the app's checkpointer"""
+    print("Testing CHATX_GROUP_COMMIT...")
+
+    path = temp_db_path()
+    os.environ["CHATX_GROUP_COMMIT"] = "1"
+    try:
+        saver = backend.open_shard(path)
+    finally:
+        del os.environ["CHATX_GROUP_COMMIT"]
+    assert isinstance(saver, GroupCommitSaver)
+    assert not isinstance(backend.open_shard(temp_db_path()), GroupCommitSaver)
+    saver.close()
+    print("✓ Enabled by environment")
+
+
+if __name__ == "__main__":
+    test_concurrent_turns_share_commits()
+    test_futures_and_read_your_writes()
+    test_enabled_from_env()
+    print("\nGroup commit tests completed!")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test script for content-addressed image delivery (ETag, 304, Range, immutable caching)
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import test_support  # noqa: F401  sets the test environment, so it comes before the backend is imported
+
+import api_server
+
+
+def with_image_dir(files):
+    """Point the image route at a temporary directory holding `files`"""
+    image_dir = tempfile.mkdtemp()
+    for name, data in files.items():
+        with open(os.path.join(image_dir, name), "wb") as f:
+            f.write(data)
+    api_server.IMAGE_DIR = image_dir
+    return api_server.app.test_client()
+
+
+def test_generated_images_are_content_addressed():
+    """generate_image publishes files under the hash of their bytes"""
+    print("Testing content-addressed image names...")
+
+    import langgraph_tool_backend as backend
+
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        filepath = backend.pending_image_path()
+        assert os.path.basename(filepath).startswith(".pending_")
+        backend.create_simple_placeholder(filepath, "A red bicycle")
+        first = backend.publish_image(filepath)
+
+        again = backend.pending_image_path()
+        backend.create_simple_placeholder(again, "A red bicycle")
+        second = backend.publish_image(again)
+
+        assert first == second
+        assert api_server.CONTENT_ADDRESSED_IMAGE.match(first)
+        assert os.listdir(os.path.join(workdir, "static")) == [first]
+    finally:
+        os.chdir(cwd)
+    print(f"✓ Identical images share one name: {first}")
+
+
+def test_failed_generation_leaves_no_pending_files():
+    """Pending renders of failed attempts are deleted, whichever path failed"""
+    print("Testing pending image cleanup...")
+
+    import langgraph_tool_backend as backend
+
+    def partial_render(prompt, filepath, user_prompt):
+        with open(filepath, "wb") as f:
+            f.write(b"\x89PNG partial")
+        return False
+
+    def crashing_render(prompt, filepath, user_prompt):
+        partial_render(prompt, filepath, user_prompt)
+        raise RuntimeError("connection reset")
+
+    def partial_placeholder(filepath, *args):
+        partial_render(None, filepath, None)
+        return None
+
+    names = ("generate_with_enhanced_api", "create_enhanced_placeholder", "create_simple_placeholder")
+    originals = {name: getattr(backend, name) for name in names}
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        backend.create_enhanced_placeholder = partial_placeholder
+        backend.create_simple_placeholder = partial_placeholder
+        for render in (partial_render, crashing_render):
+            backend.generate_with_enhanced_api = render
+            result = backend.generate_image.func("A red bicycle")
+            assert "trouble generating images" in result
+            assert os.listdir(os.path.join(workdir, "static")) == []
+    finally:
+        os.chdir(cwd)
+        for name, original in originals.items():
+            setattr(backend, name, original)
+    print("✓ No pending files left behind")
+
+
+def test_immutable_caching_and_conditional_get():
+    """Hashed names get immutable caching, strong ETags and 304 on revalidation"""
+    print("Testing immutable caching and 304...")
+
+    data = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+    client = with_image_dir({"generated_0123456789abcdef.png": data})
+
+    response = client.get('/api/image/generated_0123456789abcdef.png')
+    assert response.status_code == 200
+    assert response.data == data
+    assert response.mimetype == 'image/png'
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert response.headers['ETag'] == '"0123456789abcdef"'
+    assert response.headers['Accept-Ranges'] == 'bytes'
+
+    response = client.get('/api/image/generated_0123456789abcdef.png',
+                          headers={'If-None-Match': '"0123456789abcdef"'})
+    assert response.status_code == 304
+    assert response.data == b''
+    print("✓ Immutable caching with 304 revalidation")
+
+
+def test_range_requests():
+    """Byte ranges are served as 206 Partial Content"""
+    print("Testing byte-range requests...")
+
+    data = bytes(range(256)) * 4
+    client = with_image_dir({"generated_fedcba9876543210.png": data})
+
+    response = client.get('/api/image/generated_fedcba9876543210.png', headers={'Range': 'bytes=100-199'})
+    assert response.status_code == 206
+    assert response.data == data[100:200]
+    assert response.headers['Content-Range'] == f'bytes 100-199/{len(data)}'
+    print("✓ Range request served")
+
+
+def test_legacy_names_revalidate():
+    """Non-hashed names can be overwritten, so they revalidate via a content ETag"""
+    print("Testing legacy image names...")
+
+    client = with_image_dir({"generated_1234.png": b"old bytes"})
+    response = client.get('/api/image/generated_1234.png')
+    assert response.headers['Cache-Control'] == 'no-cache'
+    etag = response.headers['ETag']
+
+    with open(os.path.join(api_server.IMAGE_DIR, "generated_1234.png"), "wb") as f:
+        f.write(b"new bytes, different size")
+    response = client.get('/api/image/generated_1234.png', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    print("✓ Legacy images revalidate by content")
+
+
+def test_invalid_requests_still_rejected():
+    """Path traversal, non-image extensions and missing files are refused"""
+    print("Testing image route validation...")
+
+    client = with_image_dir({"notes.txt": b"text", "generated_0000000000000000.png": b"x"})
+    assert client.get('/api/image/.hidden.png').status_code == 400
+    assert client.get('/api/image/notes.txt').status_code == 400
+    assert client.get('/api/image/missing.png').status_code == 404
+    assert client.get('/api/image/..%2Fapi_server.py').status_code in (400, 404)
+    print("✓ Invalid image requests rejected")
+
+
+if __name__ == "__main__":
+    test_generated_images_are_content_addressed()
+    test_failed_generation_leaves_no_pending_files()
+    test_immutable_caching_and_conditional_get()
+    test_range_requests()
+    test_legacy_names_revalidate()
+    test_invalid_requests_still_rejected()
+    print("\nImage caching tests completed!")
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent, size-bounded LLM response cache
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import chat_model
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult, Generation
+from langgraph.graph.message import add_messages
+
+import langgraph_tool_backend as backend
+from llm_cache import SQLiteLLMCache
+
+
+class CountingModel(BaseChatModel):
+    """Answers with a counter so cache hits are distinguishable from fresh calls"""
+
+    model: str = "fake-flash"
+    temperature: float = 0.5
+    calls: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"answer {self.calls}"))])
+
+    @property
+    def _identifying_params(self):
+        return {"model": self.model, "temperature": self.temperature}
+
+    @property
+    def _llm_type(self) -> str:
+        return "counting"
+
+
+def new_cache(**kwargs):
+    return SQLiteLLMCache(path=os.path.join(tempfile.mkdtemp(), "llm_cache.db"), **kwargs)
+
+
+def test_repeat_prompts_hit_cache():
+    """Identical message lists are answered from the cache with fresh message ids"""
+    print("Testing cache hits for repeated prompts...")
+
+    cache = new_cache()
+    model = CountingModel(cache=cache)
+    messages = [HumanMessage(content="Hi, what can you do?")]
+
+    first = model.invoke(messages)
+    second = model.invoke(messages)
+    assert model.calls == 1
+    assert second.content == first.content == "answer 1"
+    assert second.response_metadata.get("cache_hit") is True
+
+    # A replayed answer must append to a thread, not replace the earlier message
+    history = add_messages(messages, [first])
+    history = add_messages(history, [HumanMessage(content="Hi, what can you do?")])
+    history = add_messages(history, [second])
+    assert len(history) == 4
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["entries"] == 1
+    print("✓ Repeated prompt served from cache")
+
+
+def test_same_question_on_new_threads_hits():
+    """Messages get a fresh id on every thread, which must not change the key"""
+    print("Testing cache hits through the graph...")
+
+    cache = new_cache()
+    model = CountingModel(cache=cache)
+    with chat_model(model):
+        answers = [backend.chatbot.invoke({"messages": [HumanMessage(content="What can you do?")]},
+                                          config={"configurable": {"thread_id": f"cache-{i}"}})
+                   for i in range(2)]
+    assert model.calls == 1
+    assert answers[0]["messages"][-1].content == answers[1]["messages"][-1].content == "answer 1"
+    assert answers[0]["messages"][0].id != answers[1]["messages"][0].id
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    print("✓ Same question on two threads served from cache")
+
+
+def test_key_covers_model_temperature_and_tools():
+    """Changing the model, temperature or bound tools is a cache miss"""
+    print("Testing cache key components...")
+
+    cache = new_cache()
+    messages = [HumanMessage(content="What is 2+2?")]
+    tool_schema = {"type": "function", "function": {"name": "calculator", "parameters": {}}}
+
+    base = CountingModel(cache=cache)
+    base.invoke(messages)
+    CountingModel(cache=cache, temperature=0.9).invoke(messages)
+    CountingModel(cache=cache, model="fake-lite").invoke(messages)
+    base.bind(tools=[tool_schema]).invoke(messages)
+    base.bind(tools=[tool_schema]).invoke(messages)
+
+    stats = cache.stats()
+    assert stats["misses"] == 4
+    assert stats["hits"] == 1
+    print("✓ Model, temperature and tools are part of the key")
+
+
+def test_ttl_expiry():
+    """Entries older than the TTL are not returned"""
+    print("Testing TTL expiry...")
+
+    cache = new_cache(ttl_seconds=60)
+    model = CountingModel(cache=cache)
+    messages = [HumanMessage(content="hello")]
+    model.invoke(messages)
+    with cache.db.cursor() as cur:
+        cur.execute("UPDATE llm_cache SET created_at = created_at - 3600")
+
+    model.invoke(messages)
+    assert model.calls == 2
+    assert cache.stats()["expired"] == 1
+    print("✓ Expired entries ignored")
+
+
+def test_lru_eviction_by_size():
+    """The least recently used entries are evicted once max_bytes is exceeded"""
+    print("Testing LRU eviction...")
+
+    cache = new_cache()
+    model = CountingModel(cache=cache)
+    prompts = [[HumanMessage(content=f"prompt {i}")] for i in range(4)]
+    model.invoke(prompts[0])
+    entry_size = cache.stats()["bytes"]
+    cache.max_bytes = int(entry_size * 3.5)
+
+    model.invoke(prompts[1])
+    model.invoke(prompts[2])
+    model.invoke(prompts[0])  # touch: prompt 0 is now most recently used
+    model.invoke(prompts[3])  # over budget: evicts prompt 1
+
+    calls = model.calls
+    model.invoke(prompts[0])
+    assert model.calls == calls
+    model.invoke(prompts[1])
+    assert model.calls == calls + 1
+    assert cache.stats()["evictions"] >= 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    print("✓ Least recently used entry evicted")
+
+
+def file_bytes(cache) -> int:
+    """Size of the cache's database file once the WAL is checkpointed into it"""
+    with cache.db.cursor(transaction=False) as cur:
+        cur.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return os.path.getsize(cache.db.path)
+
+
+def test_file_shrinks_after_eviction():
+    """Evicted and cleared entries give their pages back, so the file stays near max_bytes"""
+    print("Testing cache file size...")
+
+    cache = new_cache(max_bytes=8 * 1024 * 1024)
+    with cache.db.cursor(transaction=False) as cur:
+        assert cur.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # INCREMENTAL
+    for i in range(40):
+        cache.update(f"prompt {i}", "fake", [Generation(text=f"{i} " + "x" * 100_000)])
+    full = file_bytes(cache)
+    assert full > 3 * 1024 * 1024, full
+
+    cache.max_bytes = 512 * 1024
+    cache.update("one more", "fake", [Generation(text="y" * 100_000)])
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    after_eviction = file_bytes(cache)
+    assert after_eviction <= 2 * cache.max_bytes, after_eviction
+
+    cache.clear()
+    assert file_bytes(cache) < 64 * 1024
+    print(f"✓ File shrank from {full // 1024}KB to {after_eviction // 1024}KB after eviction")
+
+
+def test_existing_file_converted():
+    """A cache file created without auto_vacuum is rebuilt once so eviction can shrink it"""
+    print("Testing existing cache file...")
+
+    path = os.path.join(tempfile.mkdtemp(), "llm_cache.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                     "created_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+        conn.execute("INSERT INTO llm_cache VALUES ('k', 'v', 1, 0, 0)")
+    conn.close()
+
+    cache = SQLiteLLMCache(path=path)
+    with cache.db.cursor(transaction=False) as cur:
+        assert cur.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert cur.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] == 1
+    cache.db.close()
+    print("✓ Existing file switched to incremental auto-vacuum")
+
+
+if __name__ == "__main__":
+    test_repeat_prompts_hit_cache()
+    test_same_question_on_new_threads_hits()
+    test_key_covers_model_temperature_and_tools()
+    test_ttl_expiry()
+    test_lru_eviction_by_size()
+    test_file_shrinks_after_eviction()
+    test_existing_file_converted()
+    print("\nLLM cache tests completed!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for the paginated /api/threads/<id>/messages endpoint
+"""
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import EchoModel, chat_model
+
+from langchain_core.messages import HumanMessage
+
+import api_server
+import langgraph_tool_backend as backend
+
+
+def chat(thread_id, turns, first=0):
+    with chat_model(EchoModel(content="answer {n}")):
+        for turn in range(first, first + turns):
+            backend.chatbot.invoke({"messages": [HumanMessage(content=f"question {turn}")]},
+                                   config={"configurable": {"thread_id": thread_id}})
+
+
+def test_pages_and_before():
+    """Newest page by default, older pages with before=<index>"""
+    print("Testing history pages...")
+
+    chat("history", 10)
+    client = api_server.app.test_client()
+
+    page = client.get('/api/threads/history/messages?limit=4').json
+    assert page['message_count'] == 20
+    assert [m['index'] for m in page['messages']] == [16, 17, 18, 19]
+    assert page['messages'][-2] == {'index': 18, 'id': page['messages'][-2]['id'], 'type': 'human',
+                                    'content': 'question 9'}
+    assert page['messages'][-1]['type'] == 'ai' and page['has_more']
+
+    older = client.get('/api/threads/history/messages?limit=4&before=16').json
+    assert [m['index'] for m in older['messages']] == [12, 13, 14, 15]
+    first = client.get('/api/threads/history/messages?limit=4&before=2').json
+    assert [m['content'] for m in first['messages']] == ['question 0', 'answer 1']
+    assert not first['has_more']
+
+    assert client.get('/api/threads/missing/messages').status_code == 404
+    print("✓ Pages bounded by limit")
+
+
+def test_since_returns_deltas():
+    """since=<checkpoint_id> returns only the messages added after that checkpoint"""
+    print("Testing since deltas...")
+
+    chat("sync", 3)
+    client = api_server.app.test_client()
+    page = client.get('/api/threads/sync/messages').json
+    checkpoint_id = page['checkpoint_id']
+
+    unchanged = client.get(f'/api/threads/sync/messages?since={checkpoint_id}').json
+    assert unchanged['messages'] == [] and unchanged['checkpoint_id'] == checkpoint_id
+    assert unchanged['message_count'] == 6 and not unchanged['reset']
+
+    chat("sync", 1, first=3)
+    delta = client.get(f'/api/threads/sync/messages?since={checkpoint_id}').json
+    assert [m['content'] for m in delta['messages']] == ['question 3', 'answer 7']
+    assert [m['index'] for m in delta['messages']] == [6, 7]
+    assert delta['checkpoint_id'] != checkpoint_id and not delta['reset']
+
+    # More new messages than fit in one response: start over from the newest page
+    chat("sync", 3, first=4)
+    behind = client.get(f"/api/threads/sync/messages?since={delta['checkpoint_id']}&limit=4").json
+    assert behind['reset'] and [m['index'] for m in behind['messages']] == [10, 11, 12, 13]
+
+    pruned = client.get('/api/threads/sync/messages?since=not-a-checkpoint&limit=2').json
+    assert pruned['reset'] and [m['index'] for m in pruned['messages']] == [12, 13]
+    print("✓ Deltas since a checkpoint")
+
+
+def test_message_count_in_metadata():
+    """Each checkpoint records its message count in metadata"""
+    print("Testing metadata stamp...")
+
+    chat("stamped", 2)
+    latest = backend.checkpointer.get_tuple({"configurable": {"thread_id": "stamped"}})
+    assert latest.metadata["message_count"] == 4
+    assert backend.checkpointer.message_count_at("stamped") == (
+        latest.config["configurable"]["checkpoint_id"], 4
+    )
+    print("✓ message_count stamped")
+
+
+if __name__ == "__main__":
+    test_pages_and_before()
+    test_since_returns_deltas()
+    test_message_count_in_metadata()
+    print("\nMessage history tests completed!")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test script for the /api/metrics endpoint and the latency/outcome metrics behind it
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import chat_model
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import tool
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+import api_server
+import langgraph_tool_backend as backend
+import metrics
+from checkpointers import InstrumentedSaver
+from metrics import Counter, Histogram
+
+
+def test_prometheus_text_format():
+    """Histograms render cumulative buckets, sum and count; counters render values"""
+    print("Testing Prometheus text rendering...")
+
+    histogram = Histogram("demo_seconds", "Demo latency.", ["route"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5, route="/a")
+    lines = histogram.render()
+    assert "# TYPE demo_seconds histogram" in lines
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_sum{route="/a"} 5.55' in lines
+    assert 'demo_seconds_count{route="/a"} 3' in lines
+
+    counter = Counter("demo_total", "Demo counter.", ["outcome"])
+    counter.inc(outcome='say "hi"')
+    assert 'demo_total{outcome="say \\"hi\\""} 1' in counter.render()
+
+    try:
+        counter.inc(wrong="label")
+        raise AssertionError("unknown labels should be rejected")
+    except ValueError:
+        pass
+    print("✓ Text format correct")
+
+
+def test_tool_latency_and_errors():
+    """Every tool reports latency; raising tools are counted as errors"""
+    print("Testing per-tool metrics...")
+
+    assert all(metrics.tool_metrics_handler in t.callbacks for t in backend.tools)
+    before = metrics.TOOL_DURATION.count(tool="calculator")
+    backend.calculator.invoke({"expression": "2+2"})
+    assert metrics.TOOL_DURATION.count(tool="calculator") == before + 1
+
+    @tool
+    def broken_tool(query: str) -> str:
+        """Always fails"""
+        raise RuntimeError("boom")
+
+    metrics.instrument_tools([broken_tool])
+    metrics.instrument_tools([broken_tool])  # idempotent
+    assert broken_tool.callbacks.count(metrics.tool_metrics_handler) == 1
+    try:
+        broken_tool.invoke({"query": "x"})
+    except RuntimeError:
+        pass
+    assert metrics.TOOL_ERRORS.value(tool="broken_tool") == 1
+    assert metrics.TOOL_DURATION.count(tool="broken_tool") == 1
+    print("✓ Tool latency and errors recorded")
+
+
+def test_llm_and_checkpoint_latency():
+    """chat_node times its LLM call; the instrumented saver times reads and writes"""
+    print("Testing LLM and checkpoint metrics...")
+
+    with chat_model(RunnableLambda(lambda messages: AIMessage(content="hello"))):
+        saver = InstrumentedSaver(SqliteSaver(sqlite3.connect(":memory:", check_same_thread=False)))
+        graph = backend.build_graph().compile(checkpointer=saver)
+        llm_before = metrics.LLM_REQUEST_DURATION.count(node="chat_node")
+        puts_before = metrics.CHECKPOINT_DURATION.count(operation="put")
+        reads_before = metrics.CHECKPOINT_DURATION.count(operation="get_tuple")
+
+        config = {"configurable": {"thread_id": "metrics-thread"}}
+        graph.invoke({"messages": [HumanMessage(content="hi")]}, config=config)
+        graph.get_state(config)
+
+        assert metrics.LLM_REQUEST_DURATION.count(node="chat_node") == llm_before + 1
+        assert metrics.CHECKPOINT_DURATION.count(operation="put") > puts_before
+        assert metrics.CHECKPOINT_DURATION.count(operation="get_tuple") > reads_before
+        # Attributes of the wrapped saver stay reachable
+        assert saver.conn is saver.inner.conn
+
+        # Listing stays lazy: a caller taking the first item reads only that far,
+        # and the listing is timed once it is closed
+        lists_before = metrics.CHECKPOINT_DURATION.count(operation="list")
+        fetched = []
+        inner_list = saver.inner.list
+        saver.inner.list = lambda *args, **kwargs: (fetched.append(item) or item
+                                                    for item in inner_list(*args, **kwargs))
+        listing = saver.list(config)
+        assert next(listing).config["configurable"]["thread_id"] == "metrics-thread"
+        assert len(fetched) == 1
+        assert metrics.CHECKPOINT_DURATION.count(operation="list") == lists_before
+        listing.close()
+        assert metrics.CHECKPOINT_DURATION.count(operation="list") == lists_before + 1
+        del saver.inner.list
+
+    def failing(messages):
+        raise RuntimeError("quota exceeded")
+
+    with chat_model(RunnableLambda(failing)):
+        errors_before = metrics.LLM_ERRORS.value(node="chat_node")
+        try:
+            backend.chat_node({"messages": [HumanMessage(content="hi")]})
+        except RuntimeError:
+            pass
+        assert metrics.LLM_ERRORS.value(node="chat_node") == errors_before + 1
+    print("✓ LLM and checkpoint latency recorded")
+
+
+def test_image_generation_outcome():
+    """Without a Freepik key the enhanced placeholder outcome is counted"""
+    print("Testing image generation outcome counter...")
+
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    saved_key = os.environ.get("FREEPIK_API_KEY")
+    os.environ["FREEPIK_API_KEY"] = ""
+    os.chdir(workdir)
+    try:
+        before = metrics.IMAGE_GENERATIONS.value(outcome="enhanced_placeholder")
+        result = backend.generate_image.invoke({"user_prompt": "a lighthouse at dusk"})
+        assert "[IMAGE_GENERATED:" in result
+        assert metrics.IMAGE_GENERATIONS.value(outcome="enhanced_placeholder") == before + 1
+        assert metrics.IMAGE_GENERATIONS.value(outcome="freepik") == 0
+    finally:
+        os.chdir(cwd)
+        if saved_key is None:
+            os.environ.pop("FREEPIK_API_KEY", None)
+        else:
+            os.environ["FREEPIK_API_KEY"] = saved_key
+    print("✓ Image outcome counted")
+
+
+def test_metrics_endpoint():
+    """/api/metrics serves every family, including per-route request latency"""
+    print("Testing /api/metrics...")
+
+    client = api_server.app.test_client()
+    client.get('/api/health')
+    client.get('/api/image/missing.png')
+
+    response = client.get('/api/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    body = response.get_data(as_text=True)
+    for family in ("chatx_http_request_duration_seconds", "chatx_llm_request_duration_seconds",
+                   "chatx_tool_duration_seconds", "chatx_tool_errors_total",
+                   "chatx_checkpoint_duration_seconds", "chatx_image_generations_total"):
+        assert f"# TYPE {family}" in body
+    assert 'route="/api/health",method="GET",status="200"' in body
+    assert 'route="/api/image/<filename>",method="GET",status="404"' in body
+    print("✓ Metrics endpoint serves all families")
+
+
+if __name__ == "__main__":
+    test_prometheus_text_format()
+    test_tool_latency_and_errors()
+    test_llm_and_checkpoint_latency()
+    test_image_generation_outcome()
+    test_metrics_endpoint()
+    print("\nMetrics tests completed!")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the model factory and the scripted offline chat model
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import test_support  # noqa: F401  sets the test environment, so it comes before the backend is imported
+
+from langchain_core.messages import HumanMessage
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+import langgraph_tool_backend as backend
+from model_factory import make_llm, provider_from_env
+from scripted_llm import ScriptedChatModel
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Imports the whole app with the scripted provider and serves two requests offline
+APP_SCRIPT = textwrap.dedent("""
+    import json, sys
+    sys.path.insert(0, sys.argv[1])
+    import api_server
+
+    client = api_server.app.test_client()
+    chat = client.post('/api/chat', json={'message': 'what is 6*7?', 'thread_id': 'offline'}).json
+    stream = client.post('/api/chat/stream', json={'message': 'hello', 'thread_id': 'offline'})
+    events = [json.loads(line[len('data: '):]) for line in stream.get_data(as_text=True).splitlines()
+              if line.startswith('data: ')]
+    print(json.dumps({'chat': chat, 'events': events}))
+""")
+
+
+def test_factory_selects_provider():
+    """CHATX_LLM_PROVIDER picks the model class; unknown providers are rejected"""
+    print("Testing provider selection...")
+
+    assert provider_from_env() == "google"
+    assert isinstance(make_llm("gemini-2.0-flash"), ChatGoogleGenerativeAI)
+
+    os.environ["CHATX_LLM_PROVIDER"] = "scripted"
+    os.environ["CHATX_SCRIPTED_LATENCY_MS"] = "5"
+    try:
+        model = make_llm("bench-model")
+        os.environ["CHATX_LLM_PROVIDER"] = "openai"
+        try:
+            make_llm("gpt")
+            raise AssertionError("unknown providers must be rejected")
+        except ValueError:
+            pass
+    finally:
+        for name in ("CHATX_LLM_PROVIDER", "CHATX_SCRIPTED_LATENCY_MS"):
+            del os.environ[name]
+    assert isinstance(model, ScriptedChatModel)
+    assert model.model == "bench-model" and model.latency_ms == 5
+    print("✓ Provider chosen by environment")
+
+
+def test_script_is_deterministic():
+    """Same prompt, same answer; tools are only called when bound; custom rules load from JSON"""
+    print("Testing the script...")
+
+    model = ScriptedChatModel().bind_tools(backend.tools)
+    prompt = [HumanMessage(content="what is (12 + 30) * 2?")]
+    first, second = model.invoke(prompt), model.invoke(prompt)
+    assert first.tool_calls == second.tool_calls
+    assert first.tool_calls[0]["name"] == "calculator"
+    assert first.tool_calls[0]["args"] == {"expression": "(12 + 30) * 2"}
+    assert first.usage_metadata["input_tokens"] > 0
+
+    assert not ScriptedChatModel().invoke(prompt).tool_calls  # no tools bound
+
+    path = os.path.join(tempfile.mkdtemp(), "rules.json")
+    with open(path, "w") as f:
+        json.dump([{"pattern": "weather", "tool": "duckduckgo_search", "args": {"query": "{message}"}}], f)
+    os.environ.update({"CHATX_LLM_PROVIDER": "scripted", "CHATX_SCRIPTED_RULES": path})
+    try:
+        custom = make_llm("custom").bind_tools(backend.tools)
+    finally:
+        for name in ("CHATX_LLM_PROVIDER", "CHATX_SCRIPTED_RULES"):
+            del os.environ[name]
+    call = custom.invoke([HumanMessage(content="weather in Oslo")]).tool_calls[0]
+    assert call["name"] == "duckduckgo_search" and call["args"] == {"query": "weather in Oslo"}
+    print("✓ Deterministic script")
+
+
+def test_latency_and_streaming():
+    """Latency before the first token, per-token delay, and non-blocking async calls"""
+    print("Testing simulated latency...")
+
+    model = ScriptedChatModel(latency_ms=50, token_ms=2, answer_words=10)
+    prompt = [HumanMessage(content="hi")]
+    start = time.perf_counter()
+    chunks = list(model.stream(prompt))
+    elapsed = time.perf_counter() - start
+    assert len(chunks) > 10
+    assert "".join(chunk.content for chunk in chunks) == model.invoke(prompt).content
+    assert chunks[-1].usage_metadata["output_tokens"] > 0
+    assert elapsed >= 0.05 + 0.002 * len(chunks) * 0.9
+
+    async def concurrent():
+        await asyncio.gather(*(model.ainvoke(prompt) for _ in range(10)))
+
+    start = time.perf_counter()
+    asyncio.run(concurrent())
+    assert time.perf_counter() - start < 0.05 * 5  # not 10 x 50ms one after another
+    print(f"✓ {len(chunks)} chunks in {elapsed * 1000:.0f}ms")
+
+
+def test_app_runs_offline():
+    """With CHATX_LLM_PROVIDER=scripted the API serves tool calls and streams without Gemini"""
+    print("Testing the app offline...")
+
+    path = os.path.join(tempfile.mkdtemp(), "chatbot.db")
+    env = {**os.environ, "CHATX_DB_PATH": path, "CHATX_LLM_PROVIDER": "scripted", "GOOGLE_API_KEY": ""}
+    result = subprocess.run([sys.executable, "-c", APP_SCRIPT, ROOT], capture_output=True, text=True,
+                            timeout=120, env=env)
+    assert result.returncode == 0, result.stderr
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert "Result: 6*7 = 42" in output["chat"]["response"]
+    types = [event["type"] for event in output["events"]]
+    assert types.count("chunk") > 10 and types[-1] == "done"
+    print("✓ Chat and stream served offline")
+
+
+if __name__ == "__main__":
+    test_factory_selects_provider()
+    test_script_is_deterministic()
+    test_latency_and_streaming()
+    test_app_runs_offline()
+    print("\nModel factory tests completed!")
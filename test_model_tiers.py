@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for complexity-based model tiers
+"""
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import chat_model
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import InMemorySaver
+
+import langgraph_tool_backend as backend
+from metrics import MODEL_TIER_CHOICES
+from model_tiers import LITE, STANDARD, TierPolicy, tiers_from_env
+from tool_router import ToolRouter
+from tracing import TurnTracer
+
+# Tier label of each call, in order
+tier_calls = []
+
+
+class TierModel(BaseChatModel):
+    """Records its tier; calls the calculator for arithmetic, otherwise answers"""
+
+    label: str
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[t.name for t in tools])
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        tier_calls.append(self.label)
+        if messages[-1].type == "human" and "*" in messages[-1].content:
+            message = AIMessage(content="", tool_calls=[
+                {"name": "calculator", "args": {"expression": "6*7"}, "id": f"call-{len(messages)}"}
+            ])
+        else:
+            message = AIMessage(content=f"{self.label} answer")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @property
+    def _llm_type(self) -> str:
+        return "tier"
+
+
+def test_policy_signals():
+    """Only calls where every signal says easy go to the lite tier"""
+    print("Testing tier signals...")
+
+    policy = TierPolicy(max_chars=50, max_turns=3)
+    hi = HumanMessage(content="hi!")
+    assert policy.choose([hi], None) == (LITE, "simple")
+    assert policy.choose([hi], frozenset({"calculator"})) == (STANDARD, "tools_likely")
+    assert policy.choose([HumanMessage(content="x" * 51)], None) == (STANDARD, "long_message")
+
+    deep = [HumanMessage(content="ok"), AIMessage(content="ok")] * 4
+    assert policy.choose(deep, None) == (STANDARD, "deep_thread")
+    summarized = [SystemMessage(content="Summary of the earlier conversation: ..."), hi]
+    assert policy.choose(summarized, None) == (STANDARD, "deep_thread")
+
+    call = AIMessage(content="", tool_calls=[{"name": "calculator", "args": {}, "id": "c1"}])
+    assert policy.choose([hi, call, ToolMessage(content="42", tool_call_id="c1")], None) == (STANDARD, "tool_loop")
+    failed = [hi, call, ToolMessage(content="Error: Division by zero", tool_call_id="c1"),
+              AIMessage(content="Sorry"), HumanMessage(content="try again")]
+    assert policy.choose(failed, None) == (STANDARD, "tool_failure")
+    assert policy.choose([AIMessage(content="hello")], None) == (STANDARD, "no_user_message")
+    print("✓ Signals map to tiers")
+
+
+def test_tier_applied_and_traced():
+    """The chosen tier's model answers, and the trace and metrics record the choice"""
+    print("Testing tiers in the graph...")
+
+    tiers = {LITE: TierModel(label=LITE), STANDARD: TierModel(label=STANDARD)}
+    tier_calls.clear()
+    lite_before = MODEL_TIER_CHOICES.value(tier=LITE, reason="simple")
+    tracer = TurnTracer("tiers")
+    with chat_model(ToolRouter(tiers[STANDARD], backend.tools, tiers=tiers)):
+        graph = backend.build_graph().compile(checkpointer=InMemorySaver())
+        config = {"configurable": {"thread_id": "tiers"}}
+        graph.invoke({"messages": [HumanMessage(content="hello!")]}, config={**config, "callbacks": [tracer]})
+        final = graph.invoke({"messages": [HumanMessage(content="what is 6*7?")]}, config=config)
+
+    assert tier_calls == [LITE, STANDARD, STANDARD]
+    assert final["messages"][-1].content == "standard answer"
+    assert MODEL_TIER_CHOICES.value(tier=LITE, reason="simple") == lite_before + 1
+
+    calls = [call for step in tracer.finish()["steps"] for call in step["llm_calls"]]
+    assert [(call["tier"], call["tier_reason"]) for call in calls] == [(LITE, "simple")]
+    print(f"✓ Calls by tier: {tier_calls}")
+
+
+def test_ambiguous_query_uses_standard():
+    """A short query matching too many tools to route binds every tool on the standard tier"""
+    print("Testing ambiguous routing...")
+
+    tiers = {LITE: TierModel(label=LITE), STANDARD: TierModel(label=STANDARD)}
+    router = ToolRouter(tiers[STANDARD], backend.tools, tiers=tiers)
+    tied = [HumanMessage(content="Plan the budget, hiring and legal contract for our startup launch, "
+                                 "with a security review")]
+    assert router.route(tied) == router.all_tools
+    bound, metadata = router.select(tied)
+    assert (metadata["chatx_tier"], metadata["chatx_tier_reason"]) == (STANDARD, "tools_likely")
+    assert bound is router.bind(router.all_tools, STANDARD)
+
+    # Nothing matched is still eligible for the lite tier
+    assert router.route([HumanMessage(content="hi")]) is None
+    assert router.select([HumanMessage(content="hi")])[1]["chatx_tier"] == LITE
+    print("✓ Ambiguous query kept on the standard tier")
+
+
+def build(name):
+    return TierModel(label=name)
+
+
+def test_disabled_from_env():
+    """Tiering is off unless CHATX_LITE_MODEL names a model"""
+    print("Testing CHATX_LITE_MODEL...")
+
+    standard = TierModel(label=STANDARD)
+    saved = os.environ.pop("CHATX_LITE_MODEL", None)
+    try:
+        assert tiers_from_env(standard, build) is None
+        os.environ["CHATX_LITE_MODEL"] = ""
+        assert tiers_from_env(standard, build) is None
+        os.environ["CHATX_LITE_MODEL"] = "gemini-2.0-flash-lite"
+        tiers = tiers_from_env(standard, build)
+        assert tiers[STANDARD] is standard and tiers[LITE].label == "gemini-2.0-flash-lite"
+    finally:
+        if saved is None:
+            os.environ.pop("CHATX_LITE_MODEL", None)
+        else:
+            os.environ["CHATX_LITE_MODEL"] = saved
+
+    router = ToolRouter(standard, backend.tools)
+    metadata = router.select([HumanMessage(content="hi")])[1]
+    assert (metadata["chatx_tier"], metadata["chatx_tier_reason"]) == (STANDARD, "single_tier")
+    print("✓ Tiering off unless a lite model is set")
+
+
+if __name__ == "__main__":
+    test_policy_signals()
+    test_tier_applied_and_traced()
+    test_ambiguous_query_uses_standard()
+    test_disabled_from_env()
+    print("\nModel tier tests completed!")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for preload/warm-up mode and fork-safe checkpointer re-open
+"""
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import test_support  # noqa: F401  sets the test environment, so it comes before the backend is imported
+
+import api_server
+
+
+def test_ready_endpoint_waits_for_warm_up():
+    """/api/ready returns 503 until the chatbot has been built"""
+    print("Testing /api/ready before and after warm-up...")
+
+    original_chatbot = api_server.chatbot
+    api_server.chatbot = None
+    api_server.chatbot_ready.clear()
+    client = api_server.app.test_client()
+    try:
+        response = client.get('/api/ready')
+        assert response.status_code == 503
+        assert response.json == {'status': 'warming_up'}
+
+        api_server.warm_up()
+        response = client.get('/api/ready')
+        assert response.status_code == 200
+        assert response.json == {'status': 'ready'}
+    finally:
+        if original_chatbot is not None:
+            api_server.chatbot = original_chatbot
+    print("✓ Ready endpoint reflects warm-up state")
+
+
+def test_forked_worker_reopens_checkpointer():
+    """Each forked worker writes through its own connection and LLM client, not the master's"""
+    print("Testing post-fork checkpointer re-open...")
+
+    import langgraph_tool_backend as backend
+
+    api_server.warm_up()
+    master_conn = backend.conn
+    backend.close_checkpointer()
+    assert backend.conn is None
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Worker: same steps as gunicorn.conf.post_fork, then one checkpoint write
+        status = 1
+        try:
+            os.close(read_fd)
+            backend.open_checkpointer()
+            assert backend.conn is not master_conn
+            master_llm = backend.llm
+            backend.rebuild_models()
+            assert backend.llm is not master_llm and backend.llm_with_tools.llm is backend.llm
+            assert api_server.get_chatbot().checkpointer is backend.checkpointer
+            api_server.get_chatbot().update_state(
+                {"configurable": {"thread_id": f"fork-{os.getpid()}"}},
+                {"messages": []},
+            )
+            os.write(write_fd, str(os.getpid()).encode())
+            status = 0
+        finally:
+            os._exit(status)
+
+    os.close(write_fd)
+    _, status = os.waitpid(pid, 0)
+    child_pid = os.read(read_fd, 64).decode()
+    os.close(read_fd)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    backend.open_checkpointer()
+    state = api_server.get_chatbot().get_state({"configurable": {"thread_id": f"fork-{child_pid}"}})
+    assert state.config["configurable"].get("checkpoint_id")
+    print("✓ Forked worker used its own SQLite connection and LLM client")
+
+
+if __name__ == "__main__":
+    test_ready_endpoint_waits_for_warm_up()
+    test_forked_worker_reopens_checkpointer()
+    print("\nPreload tests completed!")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the pooled SQLite checkpointer (one writer, pooled readers)
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import EchoModel, chat_model, temp_db_path
+
+from langchain_core.messages import HumanMessage
+
+import langgraph_tool_backend as backend
+from sqlite_pool import PooledSqliteSaver
+
+
+def new_pool(**kwargs):
+    return PooledSqliteSaver(temp_db_path(), **kwargs)
+
+
+def chat_graph(saver):
+    return backend.build_graph().compile(checkpointer=saver)
+
+
+def run_turn(graph, thread_id, text):
+    with chat_model(EchoModel()):
+        return graph.invoke({"messages": [HumanMessage(content=text)]},
+                            config={"configurable": {"thread_id": thread_id}})
+
+
+def test_pragmas_applied_to_every_connection():
+    """Writer and readers use WAL and the configured pragmas; readers are read-only"""
+    print("Testing connection pragmas...")
+
+    saver = new_pool(pragmas={"journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": 1234,
+                              "mmap_size": 1048576, "cache_size": -2000})
+    with saver.cursor() as cur:
+        assert cur.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert cur.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert cur.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+    with saver.cursor(transaction=False) as cur:
+        assert cur.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+        assert cur.execute("PRAGMA cache_size").fetchone()[0] == -2000
+        assert cur.execute("PRAGMA mmap_size").fetchone()[0] == 1048576
+        try:
+            cur.execute("DELETE FROM checkpoints")
+            raise AssertionError("reader connections must be read-only")
+        except sqlite3.OperationalError:
+            pass
+
+    try:
+        PooledSqliteSaver(":memory:")
+        raise AssertionError("in-memory databases cannot be pooled")
+    except ValueError:
+        pass
+    print("✓ Pragmas applied")
+
+
+def test_reads_do_not_wait_for_writes():
+    """History reads complete while a write holds the writer connection"""
+    print("Testing reads during a write...")
+
+    saver = new_pool(readers=2)
+    graph = chat_graph(saver)
+    run_turn(graph, "busy", "hello")
+
+    holding, release = threading.Event(), threading.Event()
+
+    def long_write():
+        with saver.cursor() as cur:
+            cur.execute("CREATE TABLE IF NOT EXISTS scratch (x)")
+            cur.execute("INSERT INTO scratch VALUES (1)")
+            holding.set()
+            release.wait(5)
+
+    writer = threading.Thread(target=long_write)
+    writer.start()
+    holding.wait(5)
+    try:
+        start = time.perf_counter()
+        state = graph.get_state({"configurable": {"thread_id": "busy"}})
+        history = list(graph.get_state_history({"configurable": {"thread_id": "busy"}}))
+        elapsed = time.perf_counter() - start
+    finally:
+        release.set()
+        writer.join()
+
+    assert len(state.values["messages"]) == 2
+    assert history
+    assert elapsed < 0.5
+    print(f"✓ Reads finished in {elapsed * 1000:.1f} ms while the writer was busy")
+
+
+def test_read_your_writes_and_bounded_pool():
+    """Committed writes are visible to readers; concurrent reads never exceed the pool size"""
+    print("Testing read-your-writes and pool bounds...")
+
+    saver = new_pool(readers=3)
+    graph = chat_graph(saver)
+    for turn in range(3):
+        run_turn(graph, "ryw", f"turn {turn}")
+        state = graph.get_state({"configurable": {"thread_id": "ryw"}})
+        assert state.values["messages"][-2].content == f"turn {turn}"
+
+    errors = []
+
+    def reader():
+        try:
+            for _ in range(20):
+                assert saver.get_tuple({"configurable": {"thread_id": "ryw"}}) is not None
+                assert len(list(saver.list({"configurable": {"thread_id": "ryw"}}, limit=5))) == 5
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    stats = saver.stats()
+    assert stats["readers_open"] <= 3
+    assert stats["readers_idle"] == stats["readers_open"]
+    saver.close()
+    print("✓ Reads see writes; pool stays bounded")
+
+
+if __name__ == "__main__":
+    test_pragmas_applied_to_every_connection()
+    test_reads_do_not_wait_for_writes()
+    test_read_your_writes_and_bounded_pool()
+    print("\nSQLite pool tests completed!")
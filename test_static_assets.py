@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for precompressed, fingerprinted serving of the React build
+"""
+
+import gzip
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import test_support  # noqa: F401  sets the test environment, so it comes before the backend is imported
+
+import api_server
+import static_assets
+from static_assets import StaticAssets
+
+MAIN_JS = b"console.log('chatx');\n" * 400
+MAIN_CSS = b"body { margin: 0; }\n" * 200
+INDEX_HTML = b"<!doctype html><html><head><script src='/static/js/main.3f2a1b4c.js'></script></head></html>"
+
+
+def fake_build():
+    """Create a minimal CRA-style build directory"""
+    root = tempfile.mkdtemp()
+    files = {
+        "index.html": INDEX_HTML,
+        "static/js/main.3f2a1b4c.js": MAIN_JS,
+        "static/js/tiny.0a1b2c3d.chunk.js": b"x=1",
+        "static/css/main.9e8d7c6b.css": MAIN_CSS,
+    }
+    for relpath, data in files.items():
+        path = os.path.join(root, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    return root
+
+
+def client_for(root):
+    api_server.static_assets = StaticAssets(root)
+    return api_server.app.test_client()
+
+
+def test_encoding_negotiation():
+    """Clients get brotli, then gzip, then identity depending on Accept-Encoding"""
+    print("Testing Accept-Encoding negotiation...")
+
+    client = client_for(fake_build())
+    url = '/static/js/main.3f2a1b4c.js'
+
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == MAIN_JS
+    assert response.mimetype == 'application/javascript'
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+    if static_assets.brotli is not None:
+        response = client.get(url, headers={'Accept-Encoding': 'gzip, deflate, br'})
+        assert response.headers['Content-Encoding'] == 'br'
+        assert static_assets.brotli.decompress(response.data) == MAIN_JS
+
+    response = client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == MAIN_JS
+
+    response = client.get(url, headers={'Accept-Encoding': 'gzip;q=0'})
+    assert response.data == MAIN_JS
+    print("✓ Encoding negotiated")
+
+
+def test_cache_headers_and_etags():
+    """Hashed assets are immutable; index.html revalidates; each encoding has its own ETag"""
+    print("Testing cache headers and ETags...")
+
+    client = client_for(fake_build())
+
+    js = client.get('/static/css/main.9e8d7c6b.css', headers={'Accept-Encoding': 'gzip'})
+    assert js.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    plain = client.get('/static/css/main.9e8d7c6b.css', headers={'Accept-Encoding': 'identity'})
+    assert js.headers['ETag'] != plain.headers['ETag']
+
+    response = client.get('/static/css/main.9e8d7c6b.css',
+                          headers={'Accept-Encoding': 'gzip', 'If-None-Match': js.headers['ETag']})
+    assert response.status_code == 304
+
+    index = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert index.status_code == 200
+    assert index.headers['Cache-Control'] == 'no-cache'
+    # Too small to be worth compressing
+    assert 'Content-Encoding' not in index.headers
+    assert index.data == INDEX_HTML
+
+    tiny = client.get('/static/js/tiny.0a1b2c3d.chunk.js', headers={'Accept-Encoding': 'gzip'})
+    assert tiny.data == b"x=1"
+    assert tiny.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    print("✓ Cache headers and ETags correct")
+
+
+def test_missing_files_and_traversal():
+    """Only files in the manifest are served"""
+    print("Testing unknown paths...")
+
+    client = client_for(fake_build())
+    assert client.get('/static/js/missing.js').status_code == 404
+    assert client.get('/static/js/../../index.html').status_code == 404
+    assert client.get('/static/css/..%2F..%2Findex.html').status_code == 404
+
+    client = client_for(os.path.join(tempfile.mkdtemp(), "no-build"))
+    assert b"Frontend build not found" in client.get('/').data
+    print("✓ Unknown paths rejected")
+
+
+def test_precompressed_files_are_used():
+    """Siblings written by `python static_assets.py` are loaded instead of recompressing"""
+    print("Testing precompressed siblings...")
+
+    root = fake_build()
+    static_assets.precompress(root)
+    js_path = os.path.join(root, "static", "js", "main.3f2a1b4c.js")
+    assert os.path.exists(js_path + ".gz")
+    assert not os.path.exists(os.path.join(root, "index.html.gz"))
+
+    # Mark the sibling so we can tell it was served as-is
+    marked = gzip.compress(MAIN_JS, compresslevel=1)
+    with open(js_path + ".gz", "wb") as f:
+        f.write(marked)
+    assets = StaticAssets(root)
+    assert assets.get("static/js/main.3f2a1b4c.js").variants["gzip"] == marked
+    assert "static/js/main.3f2a1b4c.js.gz" not in assets.assets
+    print("✓ Precompressed files reused")
+
+
+if __name__ == "__main__":
+    test_encoding_negotiation()
+    test_cache_headers_and_etags()
+    test_missing_files_and_traversal()
+    test_precompressed_files_are_used()
+    print("\nStatic asset tests completed!")
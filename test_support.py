@@ -0,0 +1,81 @@
+"""
+Shared setup and fake chat models for the test scripts.
+
+Importing this module gives the tests a dummy GOOGLE_API_KEY and a throwaway
+CHATX_DB_PATH (unless they are already set), so import it before
+langgraph_tool_backend or api_server.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+os.environ.setdefault("CHATX_DB_PATH", os.path.join(tempfile.mkdtemp(), "chatbot.db"))
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import langgraph_tool_backend as backend
+
+# Usage reported by CalculatorModel(usage=True) for its two calls of a turn
+TOOL_CALL_USAGE = {"input_tokens": 12, "output_tokens": 6, "total_tokens": 18}
+ANSWER_USAGE = {"input_tokens": 30, "output_tokens": 4, "total_tokens": 34}
+
+
+class EchoModel(BaseChatModel):
+    """Answers every call with `content`; "{n}" becomes the number of prompt messages"""
+
+    content: str = "ok"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        content = self.content.replace("{n}", str(len(messages)))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    @property
+    def _llm_type(self) -> str:
+        return "echo"
+
+
+class CalculatorModel(BaseChatModel):
+    """
+    Calls the calculator on a new question, then answers from its result.
+    `usage` adds usage_metadata to both calls; `crash` kills the process instead
+    of answering, like a worker dying mid-turn.
+    """
+
+    expression: str = "6*7"
+    answer: str = "42"
+    usage: bool = False
+    crash: bool = False
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if messages[-1].type != "tool":
+            message = AIMessage(content="", tool_calls=[
+                {"name": "calculator", "args": {"expression": self.expression}, "id": f"call-{len(messages)}"}
+            ], usage_metadata=TOOL_CALL_USAGE if self.usage else None)
+        elif self.crash:
+            os._exit(1)
+        else:
+            message = AIMessage(content=self.answer, usage_metadata=ANSWER_USAGE if self.usage else None)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @property
+    def _llm_type(self) -> str:
+        return "calculator"
+
+
+@contextmanager
+def chat_model(model):
+    """Run the graph with `model` in place of the configured LLM"""
+    original = backend.llm_with_tools
+    backend.llm_with_tools = model
+    try:
+        yield model
+    finally:
+        backend.llm_with_tools = original
+
+
+def temp_db_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), "chatbot.db")
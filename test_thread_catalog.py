@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for the thread catalog and the paginated /api/threads endpoint
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import EchoModel, chat_model, temp_db_path
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+import api_server
+import langgraph_tool_backend as backend
+from thread_catalog import CatalogSaver, thread_title
+
+
+def new_saver(path=None):
+    path = path or temp_db_path()
+    return SqliteSaver(sqlite3.connect(path, check_same_thread=False)), path
+
+
+def chat(saver, thread_turns):
+    """Run `turns` user messages on each thread"""
+    with chat_model(EchoModel()):
+        graph = backend.build_graph().compile(checkpointer=saver)
+        for thread_id, turns in thread_turns:
+            for turn in range(turns):
+                graph.invoke({"messages": [HumanMessage(content=f"{thread_id} question {turn}")]},
+                             config={"configurable": {"thread_id": thread_id}})
+
+
+def test_catalog_updated_each_turn():
+    """Every turn updates updated_at and message_count; the title is the first message"""
+    print("Testing catalog updates...")
+
+    saver = CatalogSaver(new_saver()[0])
+    chat(saver, [("alpha", 1)])
+    first = saver.list_threads()["threads"][0]
+    time.sleep(0.01)
+    chat(saver, [("alpha", 2)])
+    row = saver.list_threads()["threads"][0]
+
+    assert row["thread_id"] == "alpha"
+    assert row["title"] == "alpha question 0"
+    assert row["message_count"] == 6
+    assert row["created_at"] == first["created_at"]
+    assert row["updated_at"] > first["updated_at"]
+    print("✓ Catalog row maintained per turn")
+
+
+def test_title_from_multimodal_message():
+    """Only the text parts of a multimodal first message make the title"""
+    print("Testing multimodal titles...")
+
+    message = HumanMessage(content=[
+        {"type": "text", "text": "What is in   this picture?"},
+        {"type": "image_url", "image_url": {"url": "data:image/png;base64,AAAA"}},
+    ])
+    assert thread_title([message]) == "What is in this picture?"
+    assert thread_title([HumanMessage(content="word " * 40)]).endswith("…")
+    print("✓ Title taken from the text parts")
+
+
+def test_pagination_and_sorting():
+    """Keyset pages cover every thread once in the requested order"""
+    print("Testing pagination and sorting...")
+
+    saver = CatalogSaver(new_saver()[0])
+    chat(saver, [(f"thread-{i}", 1 + i % 3) for i in range(7)])
+
+    seen, cursor = [], None
+    while True:
+        page = saver.list_threads(limit=3, cursor=cursor)
+        seen.extend(page["threads"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert [t["thread_id"] for t in seen] == [f"thread-{i}" for i in reversed(range(7))]
+
+    by_count = saver.list_threads(limit=10, sort="message_count", order="asc")["threads"]
+    counts = [t["message_count"] for t in by_count]
+    assert counts == sorted(counts)
+
+    page = saver.list_threads(limit=2, sort="title", order="asc")
+    rest = saver.list_threads(limit=10, sort="title", order="asc", cursor=page["next_cursor"])
+    titles = [t["title"] for t in page["threads"] + rest["threads"]]
+    assert titles == sorted(titles) and len(titles) == 7
+
+    for bad in ({"sort": "thread_id; DROP TABLE threads"}, {"order": "sideways"}, {"cursor": "not-a-cursor"}):
+        try:
+            saver.list_threads(**bad)
+            raise AssertionError(f"{bad} should be rejected")
+        except ValueError:
+            pass
+    print("✓ Pagination and sorting correct")
+
+
+def test_backfill_existing_database():
+    """Threads written before the catalog existed are catalogued on first use"""
+    print("Testing backfill...")
+
+    plain, path = new_saver()
+    chat(plain, [("old-1", 2), ("old-2", 1)])
+
+    saver = CatalogSaver(new_saver(path)[0])
+    threads = {t["thread_id"]: t for t in saver.list_threads()["threads"]}
+    assert set(threads) == {"old-1", "old-2"}
+    assert threads["old-1"]["message_count"] == 4
+    assert threads["old-1"]["title"] == "old-1 question 0"
+    assert threads["old-1"]["created_at"] < threads["old-1"]["updated_at"]
+    print("✓ Existing threads backfilled")
+
+
+def test_threads_endpoint_and_retrieve_all_threads():
+    """/api/threads serves pages from the catalog; retrieve_all_threads uses it too"""
+    print("Testing /api/threads...")
+
+    saver = CatalogSaver(new_saver()[0])
+    chat(saver, [("api-1", 1), ("api-2", 1), ("api-3", 1)])
+
+    original = backend.checkpointer
+    backend.checkpointer = saver
+    try:
+        client = api_server.app.test_client()
+        response = client.get('/api/threads?limit=2')
+        assert response.status_code == 200
+        assert [t['thread_id'] for t in response.json['threads']] == ['api-3', 'api-2']
+        response = client.get(f"/api/threads?limit=2&cursor={response.json['next_cursor']}")
+        assert [t['thread_id'] for t in response.json['threads']] == ['api-1']
+        assert response.json['next_cursor'] is None
+
+        assert client.get('/api/threads?sort=bogus').status_code == 400
+        assert backend.retrieve_all_threads() == ['api-3', 'api-2', 'api-1']
+    finally:
+        backend.checkpointer = original
+    print("✓ /api/threads paginates the catalog")
+
+
+if __name__ == "__main__":
+    test_catalog_updated_each_turn()
+    test_title_from_multimodal_message()
+    test_pagination_and_sorting()
+    test_backfill_existing_database()
+    test_threads_endpoint_and_retrieve_all_threads()
+    print("\nThread catalog tests completed!")
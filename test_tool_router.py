@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-turn tool pre-router
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import chat_model
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import InMemorySaver
+
+import langgraph_tool_backend as backend
+from benchmark_tool_router import bench_traces
+from tool_router import ToolRouter, router_from_env
+from tracing import TraceStore, TurnTracer
+
+# Tool names bound on each call of ToolRecordingModel
+bound_calls = []
+
+
+class ToolRecordingModel(BaseChatModel):
+    """Records which tools each call had, calls the calculator, then answers"""
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[t.name for t in tools])
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        bound_calls.append(sorted(tools or []))
+        if messages[-1].type == "tool":
+            message = AIMessage(content="It is 42.",
+                                usage_metadata={"input_tokens": 60, "output_tokens": 4, "total_tokens": 64})
+        else:
+            message = AIMessage(content="", tool_calls=[
+                {"name": "calculator", "args": {"expression": "6*7"}, "id": f"call-{len(messages)}"}
+            ], usage_metadata={"input_tokens": 40, "output_tokens": 6, "total_tokens": 46})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @property
+    def _llm_type(self) -> str:
+        return "tool-recording"
+
+
+def test_routes_to_likely_tools():
+    """Clear requests get a small subset; unclear ones get every tool"""
+    print("Testing routing decisions...")
+
+    router = ToolRouter(ToolRecordingModel(), backend.tools)
+    route = lambda text: router.route([HumanMessage(content=text)])
+
+    assert route("what is 6*7?") == {"calculator"}
+    assert route("Draw a picture of a red fox") == {"generate_image"}
+    assert "get_stock_price" in route("What's the stock price of AAPL today?")
+    assert route("hi there") is None
+    assert route("ok") is None
+
+    # Every tool matches once: a tie at the cut-off binds the full set, reported as such
+    everything = "search stock calculate image code data business blog project invest legal hiring security explain"
+    assert route(everything) == router.all_tools
+
+    # The routing cost stays far below a millisecond
+    messages = [HumanMessage(content="Help me plan the project timeline and budget for hiring, and write a blog post")]
+    start = time.perf_counter()
+    for _ in range(1000):
+        router.route(messages)
+    per_call_ms = (time.perf_counter() - start)
+    assert per_call_ms < 0.5, per_call_ms
+    print(f"✓ Routed in {per_call_ms * 1000:.1f}us per message")
+
+
+def test_bound_runnables_cached():
+    """Each subset is bound once and reused"""
+    print("Testing the bound runnable cache...")
+
+    router = ToolRouter(ToolRecordingModel(), backend.tools)
+    first = router.select([HumanMessage(content="what is 6*7?")])[0]
+    assert router.select([HumanMessage(content="calculate 2+2 please")])[0] is first
+    assert router.select([HumanMessage(content="hello")])[0] is router.full
+    assert len(router._bound) == 2
+    print("✓ Bound once per subset")
+
+
+def test_turn_keeps_its_tools():
+    """Every call in a turn has the routed tools, and the trace records them"""
+    print("Testing a routed turn...")
+
+    bound_calls.clear()
+    tracer = TurnTracer("routed")
+    with chat_model(ToolRouter(ToolRecordingModel(), backend.tools)):
+        graph = backend.build_graph().compile(checkpointer=InMemorySaver())
+        result = graph.invoke({"messages": [HumanMessage(content="What is 6*7?")]},
+                              config={"configurable": {"thread_id": "routed"}, "callbacks": [tracer]})
+        # A follow-up without keywords gets every tool again
+        graph.invoke({"messages": [HumanMessage(content="thanks!")]},
+                     config={"configurable": {"thread_id": "routed"}})
+
+    assert result["messages"][-1].content == "It is 42."
+    assert bound_calls[:2] == [["calculator"], ["calculator"]]
+    assert len(bound_calls[2]) == len(backend.tools)
+
+    trace = tracer.finish()
+    calls = [call for step in trace["steps"] for call in step["llm_calls"]]
+    assert [call["tools"] for call in calls] == [["calculator"], ["calculator"]]
+
+    store = TraceStore(os.path.join(tempfile.mkdtemp(), "traces.db"))
+    store.save(trace)
+    report = bench_traces(store.db.path, backend.tools)
+    assert report["routed_calls"] == 2 and report["input_tokens_logged"] == 100
+    assert report["input_tokens_saved"] > 0
+    print(f"✓ {report['input_tokens_saved']} input tokens saved over {report['llm_calls']} calls")
+
+
+def test_disabled_from_env():
+    """CHATX_TOOL_ROUTER=0 binds every tool"""
+    print("Testing CHATX_TOOL_ROUTER=0...")
+
+    os.environ["CHATX_TOOL_ROUTER"] = "0"
+    try:
+        bound = router_from_env(ToolRecordingModel(), backend.tools)
+    finally:
+        del os.environ["CHATX_TOOL_ROUTER"]
+    assert not isinstance(bound, ToolRouter)
+    assert len(bound.kwargs["tools"]) == len(backend.tools)
+    assert isinstance(router_from_env(ToolRecordingModel(), backend.tools), ToolRouter)
+    print("✓ Router disabled by environment")
+
+
+if __name__ == "__main__":
+    test_routes_to_likely_tools()
+    test_bound_runnables_cached()
+    test_turn_keeps_its_tools()
+    test_disabled_from_env()
+    print("\nTool router tests completed!")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for per-turn execution traces (node timings, tool calls, token usage)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Sets the test environment, so it comes before the backend is imported
+from test_support import CalculatorModel, chat_model
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+import api_server
+import langgraph_tool_backend as backend
+from tracing import TraceStore, TurnTracer, store_from_env
+
+
+def calculator():
+    """Asks for 2+2 with the calculator, then answers "It is 4." (42 + 10 tokens)"""
+    return chat_model(CalculatorModel(expression="2+2", answer="It is 4.", usage=True))
+
+
+def fake_graph():
+    return backend.build_graph().compile(checkpointer=InMemorySaver())
+
+
+def new_store(**kwargs):
+    return TraceStore(os.path.join(tempfile.mkdtemp(), "traces.db"), **kwargs)
+
+
+def test_tracer_records_steps_tools_and_usage():
+    """Each superstep is recorded with its LLM calls, tool runs and token counts"""
+    print("Testing TurnTracer...")
+
+    with calculator():
+        graph = fake_graph()
+        tracer = TurnTracer("trace-thread")
+        graph.invoke({"messages": [HumanMessage(content="2+2?")]},
+                     config={"configurable": {"thread_id": "trace-thread"}, "callbacks": [tracer]})
+    trace = tracer.finish()
+
+    assert [step["node"] for step in trace["steps"]] == ["chat_node", "tools", "chat_node"]
+    assert [step["step"] for step in trace["steps"]] == [1, 2, 3]
+    first, tools, last = trace["steps"]
+    assert first["llm_calls"][0]["tool_calls"] == [{"name": "calculator", "args": {"expression": "2+2"}}]
+    assert tools["tools"][0]["name"] == "calculator"
+    assert tools["tools"][0]["duration_ms"] is not None
+    assert all(step["duration_ms"] is not None for step in trace["steps"])
+    assert trace["usage"] == {"input_tokens": 42, "output_tokens": 10, "total_tokens": 52}
+    json.dumps(trace)
+    print("✓ Steps, tool calls and usage recorded")
+
+
+def test_debug_header_returns_and_stores_trace():
+    """X-ChatX-Debug adds the trace to /api/chat; every turn is stored"""
+    print("Testing /api/chat debug traces...")
+
+    original_chatbot, original_store = api_server.chatbot, api_server.trace_store
+    api_server.trace_store = new_store()
+    try:
+        with calculator():
+            api_server.chatbot = fake_graph()
+            client = api_server.app.test_client()
+
+            response = client.post('/api/chat', json={'message': '2+2?', 'thread_id': 'plain'})
+            assert response.status_code == 200
+            assert 'trace' not in response.json
+
+            response = client.post('/api/chat', json={'message': '2+2?', 'thread_id': 'debug'},
+                                   headers={'X-ChatX-Debug': '1'})
+            assert response.json['response'] == 'It is 4.'
+            trace = response.json['trace']
+            assert trace['thread_id'] == 'debug'
+            assert trace['usage']['total_tokens'] == 52
+
+            stored = api_server.trace_store.get(trace['turn_id'])
+            assert stored['steps'] == trace['steps']
+            assert len(api_server.trace_store.slowest(10)) == 2
+
+            response = client.post('/api/chat/stream', json={'message': '2+2?', 'thread_id': 'debug-stream'},
+                                   headers={'X-ChatX-Debug': 'true'})
+            events = [json.loads(line[len("data: "):]) for line in response.get_data(as_text=True).splitlines()
+                      if line.startswith("data: ")]
+            done = events[-1]
+            assert done['type'] == 'done'
+            assert [step['node'] for step in done['trace']['steps']] == ['chat_node', 'tools', 'chat_node']
+    finally:
+        api_server.chatbot, api_server.trace_store = original_chatbot, original_store
+    print("✓ Debug traces returned and stored")
+
+
+def test_trace_store_sampling():
+    """Slow turns can be sampled; fast turns below the threshold are not stored"""
+    print("Testing TraceStore...")
+
+    store = new_store(min_duration_ms=50)
+    for turn, duration in enumerate([10, 400, 75, 1200]):
+        store.save({"turn_id": f"turn-{turn}", "thread_id": "t", "started_at": 1000.0 + turn,
+                    "duration_ms": duration, "error": None, "steps": [], "usage": {"total_tokens": 0}})
+    slowest = store.slowest(10)
+    assert [trace["duration_ms"] for trace in slowest] == [1200, 400, 75]
+    assert store.get("turn-0") is None
+    assert [trace["turn_id"] for trace in store.slowest(10, since=1002.0)] == ["turn-3", "turn-2"]
+    print("✓ Slow turns sampled")
+
+
+def test_trace_store_retention():
+    """Storing is opt-in; each process prunes old and excess traces from its first save"""
+    print("Testing trace retention...")
+
+    saved = os.environ.pop("CHATX_TRACES", None)
+    try:
+        assert store_from_env() is None
+    finally:
+        if saved is not None:
+            os.environ["CHATX_TRACES"] = saved
+
+    path = os.path.join(tempfile.mkdtemp(), "traces.db")
+    now = time.time()
+
+    def trace(turn, age_hours):
+        return {"turn_id": f"turn-{turn}", "thread_id": "t", "started_at": now - age_hours * 3600,
+                "duration_ms": 100, "error": None, "steps": [], "usage": {"total_tokens": 0}}
+
+    writer = TraceStore(path, max_rows=3, max_age_hours=24)
+    for turn, age in enumerate([48, 5, 4, 3, 2]):
+        writer.save(trace(turn, age))
+    # A new process (a restarted worker) prunes before its first insert: the
+    # 48-hour-old trace and all but the newest 3 go, then turn-5 is added
+    TraceStore(path, max_rows=3, max_age_hours=24).save(trace(5, 1))
+    assert sorted(t["turn_id"] for t in writer.slowest(10)) == ["turn-2", "turn-3", "turn-4", "turn-5"]
+    print("✓ Old and excess traces pruned")
+
+
+if __name__ == "__main__":
+    test_tracer_records_steps_tools_and_usage()
+    test_debug_header_returns_and_stores_trace()
+    test_trace_store_sampling()
+    test_trace_store_retention()
+    print("\nTracing tests completed!")
@@ -0,0 +1,237 @@
+"""
+Thread catalog kept next to the checkpoints.
+
+CatalogSaver upserts one row per thread (created_at, updated_at, message_count,
+title from the first user message) every time a checkpoint is written, so
+listing conversations is an indexed query over `threads` instead of
+deserializing every checkpoint in the database. Databases created before the
+catalog existed are backfilled once from each thread's latest checkpoint.
+"""
+
+import base64
+import json
+import time
+from datetime import datetime
+
+from langchain_core.messages import HumanMessage
+
+from chat_stream import message_text
+from checkpointers import DelegatingSaver
+
+SCHEMA_STATEMENTS = (
+    """CREATE TABLE IF NOT EXISTS threads (
+        thread_id TEXT PRIMARY KEY,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        message_count INTEGER NOT NULL DEFAULT 0,
+        title TEXT NOT NULL DEFAULT ''
+    )""",
+    "CREATE INDEX IF NOT EXISTS threads_updated_at ON threads (updated_at, thread_id)",
+    "CREATE INDEX IF NOT EXISTS threads_created_at ON threads (created_at, thread_id)",
+    "CREATE INDEX IF NOT EXISTS threads_message_count ON threads (message_count, thread_id)",
+    "CREATE INDEX IF NOT EXISTS threads_title ON threads (title, thread_id)",
+)
+
+UPSERT_THREAD = """
+INSERT INTO threads (thread_id, created_at, updated_at, message_count, title)
+VALUES (?, ?, ?, COALESCE(?, 0), ?)
+ON CONFLICT(thread_id) DO UPDATE SET
+    updated_at = excluded.updated_at,
+    message_count = COALESCE(?, threads.message_count),
+    title = CASE WHEN threads.title = '' THEN excluded.title ELSE threads.title END
+"""
+
+SORT_COLUMNS = ("updated_at", "created_at", "message_count", "title")
+TITLE_LENGTH = 80
+MAX_PAGE_SIZE = 200
+
+
+def thread_title(messages):
+    """First user message, shortened for a sidebar entry"""
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            title = " ".join(message_text(message.content).split())
+            return title if len(title) <= TITLE_LENGTH else title[:TITLE_LENGTH - 1] + "…"
+    return ""
+
+
+def catalog_row(config, checkpoint, now=None):
+    """Parameters for UPSERT_THREAD, or None for subgraph checkpoints"""
+    configurable = config["configurable"]
+    if configurable.get("checkpoint_ns", ""):
+        return None
+    messages = checkpoint.get("channel_values", {}).get("messages")
+    count = len(messages) if messages is not None else None
+    now = time.time() if now is None else now
+    return (configurable["thread_id"], now, now, count, thread_title(messages or []), count)
+
+
+def stamp_metadata(metadata, row):
+    """Record the message count in checkpoint metadata so history syncs can diff against it"""
+    if row is None or row[3] is None:
+        return metadata
+    return {**metadata, "message_count": row[3]}
+
+
+def encode_cursor(value, thread_id) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, thread_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        value, thread_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return value, thread_id
+
+
+class CatalogSaver(DelegatingSaver):
+    """Maintains the threads table as checkpoints are written"""
+
+    def __init__(self, inner):
+        super().__init__(inner)
+        self._catalog_ready = False
+
+    def _ensure_catalog(self):
+        if self._catalog_ready:
+            return
+        with self.inner.cursor() as cur:
+            for statement in SCHEMA_STATEMENTS:
+                cur.execute(statement)
+            (catalogued,) = cur.execute("SELECT COUNT(*) FROM threads").fetchone()
+            (checkpointed,) = cur.execute(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM checkpoints WHERE checkpoint_ns = '' LIMIT 1)"
+            ).fetchone()
+        self._catalog_ready = True
+        if not catalogued and checkpointed:
+            self.backfill()
+
+    def backfill(self) -> int:
+        """Catalog threads that were written before the catalog existed"""
+        with self.inner.cursor(transaction=False) as cur:
+            rows = cur.execute(
+                "SELECT thread_id, MIN(checkpoint_id), MAX(checkpoint_id) FROM checkpoints "
+                "WHERE checkpoint_ns = '' AND thread_id NOT IN (SELECT thread_id FROM threads) "
+                "GROUP BY thread_id"
+            ).fetchall()
+        added = 0
+        for thread_id, first_id, last_id in rows:
+            latest = self.inner.get_tuple(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": "", "checkpoint_id": last_id}}
+            )
+            first = self.inner.get_tuple(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": "", "checkpoint_id": first_id}}
+            )
+            if latest is None:
+                continue
+            updated_at = _timestamp(latest.checkpoint)
+            created_at = _timestamp(first.checkpoint) if first else updated_at
+            _, _, _, count, title, _ = catalog_row(latest.config, latest.checkpoint)
+            with self.inner.cursor() as cur:
+                cur.execute(UPSERT_THREAD, (thread_id, created_at, updated_at, count, title, count))
+            added += 1
+        if added:
+            print(f"[INFO] Backfilled thread catalog with {added} threads")
+        return added
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        self._ensure_catalog()
+        row = catalog_row(config, checkpoint)
+        next_config = self.inner.put(config, checkpoint, stamp_metadata(metadata, row), new_versions)
+        if row is not None:
+            with self.inner.cursor() as cur:
+                cur.execute(UPSERT_THREAD, row)
+        return next_config
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        row = catalog_row(config, checkpoint)
+        next_config = await self.inner.aput(config, checkpoint, stamp_metadata(metadata, row), new_versions)
+        if row is not None:
+            # AsyncSqliteSaver: aiosqlite connection guarded by an asyncio lock
+            async with self.inner.lock:
+                if not self._catalog_ready:
+                    for statement in SCHEMA_STATEMENTS:
+                        await self.inner.conn.execute(statement)
+                    self._catalog_ready = True
+                await self.inner.conn.execute(UPSERT_THREAD, row)
+                await self.inner.conn.commit()
+        return next_config
+
+    def delete_thread(self, thread_id):
+        self.inner.delete_thread(thread_id)
+        self._ensure_catalog()
+        with self.inner.cursor() as cur:
+            cur.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+
+    def list_threads(self, limit: int = 50, sort: str = "updated_at", order: str = "desc", cursor: str = None):
+        """
+        One page of threads, ordered by `sort` then thread_id. Pages are keyset
+        paginated: pass the returned next_cursor to continue after the last row.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_COLUMNS)}")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        self._ensure_catalog()
+
+        where, params = "", []
+        if cursor:
+            value, thread_id = decode_cursor(cursor)
+            op = "<" if order == "desc" else ">"
+            # Row-value comparison uses the (sort, thread_id) index
+            where = f"WHERE ({sort}, thread_id) {op} (?, ?)"
+            params = [value, thread_id]
+        query = (
+            f"SELECT thread_id, title, created_at, updated_at, message_count FROM threads {where} "
+            f"ORDER BY {sort} {order}, thread_id {order} LIMIT ?"
+        )
+        with self.inner.cursor(transaction=False) as cur:
+            rows = cur.execute(query, params + [limit + 1]).fetchall()
+
+        threads = [
+            {"thread_id": r[0], "title": r[1], "created_at": r[2], "updated_at": r[3], "message_count": r[4]}
+            for r in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last = threads[-1]
+            next_cursor = encode_cursor(last[sort], last["thread_id"])
+        return {"threads": threads, "next_cursor": next_cursor}
+
+    def message_count_at(self, thread_id: str, checkpoint_id: str = None):
+        """
+        (checkpoint_id, message_count) of the thread's latest checkpoint, or of
+        `checkpoint_id` if given; None if there is no such checkpoint. Reads the
+        checkpoint's metadata only, not its messages.
+        """
+        query = "SELECT checkpoint_id, metadata FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ''"
+        params = [thread_id]
+        if checkpoint_id:
+            query += " AND checkpoint_id = ?"
+            params.append(checkpoint_id)
+        with self.inner.cursor(transaction=False) as cur:
+            row = cur.execute(query + " ORDER BY checkpoint_id DESC LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        count = json.loads(row[1]).get("message_count") if row[1] else None
+        if count is None:
+            # Written before counts were stamped: load that checkpoint once
+            saved = self.inner.get_tuple(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": "", "checkpoint_id": row[0]}}
+            )
+            count = len(saved.checkpoint.get("channel_values", {}).get("messages", [])) if saved else 0
+        return row[0], count
+
+    def thread_ids(self) -> list:
+        """All thread ids, most recently updated first"""
+        self._ensure_catalog()
+        with self.inner.cursor(transaction=False) as cur:
+            return [row[0] for row in cur.execute("SELECT thread_id FROM threads ORDER BY updated_at DESC")]
+
+
+def _timestamp(checkpoint) -> float:
+    try:
+        return datetime.fromisoformat(checkpoint["ts"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return time.time()
@@ -0,0 +1,226 @@
+"""
+Per-turn tool pre-routing for chat_node.
+
+Binding all 14 tools sends every tool schema (~1.1k input tokens) with every
+Gemini call, although a turn rarely needs more than one or two of them.
+ToolRouter scores the latest user message against a keyword table per tool
+(precompiled regexes behind substring checks, tens of microseconds) and binds only the best few. When
+nothing matches it binds the full set, as without routing; when too many tools
+tie for the last slot to tell them apart the message is ambiguous rather than
+tool-free, so route() returns the full set by name and the turn stays on the
+standard model tier.
+
+Bound runnables are cached per tool subset, and within a turn the subset is
+stable: later chat_node calls (after tool results) route on the same user
+message and always keep the tools already called in that turn.
+
+The router also applies the model tier chosen per call (model_tiers.py).
+
+Enabled by default; CHATX_TOOL_ROUTER=0 binds every tool on every call.
+"""
+
+import os
+import re
+import threading
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import Runnable
+
+from chat_stream import message_text
+from metrics import MODEL_TIER_CHOICES, MODEL_TIER_DURATION, TOOL_ROUTES
+from model_tiers import STANDARD, TierPolicy, policy_from_env
+
+# Word-prefix patterns per tool name; a message scores one point per distinct match
+KEYWORDS = {
+    "duckduckgo_search": [
+        r"search", r"look ?up", r"google", r"news", r"latest", r"current(ly)?\b", r"today",
+        r"this (week|month|year)", r"recent", r"who (is|won)", r"weather", r"happen", r"20[2-3]\d\b",
+    ],
+    "get_stock_price": [
+        r"stocks?\b", r"share price", r"shares? of", r"ticker", r"nasdaq", r"nyse", r"s&p",
+        r"market cap", r"\$[a-z]{1,5}\b", r"trading at",
+    ],
+    "calculator": [
+        r"calculat", r"comput", r"\d[\d.,]*\s*[-+*/x^%]\s*\(?\d", r"sqrt", r"square root", r"percent(age)? of",
+        r"multipl", r"divid", r"how much is \d", r"what is \d", r"sum of", r"arithmetic",
+    ],
+    "generate_image": [
+        r"image", r"picture", r"draw", r"illustrat", r"photo", r"logo", r"sketch", r"paint",
+        r"wallpaper", r"render", r"artwork", r"poster", r"avatar", r"visuali[sz]e",
+    ],
+    "code_analyzer": [
+        r"code", r"bug", r"debug", r"refactor", r"python", r"javascript", r"typescript", r"java\b",
+        r"c\+\+", r"function", r"snippet", r"traceback", r"exception", r"compile", r"```",
+        r"def ", r"class ", r"review (my|this)",
+    ],
+    "data_analyst": [
+        r"data", r"csv", r"statistic", r"analy[sz]", r"chart", r"trend", r"correlat", r"regression",
+        r"average", r"median", r"dashboard", r"metric", r"spreadsheet",
+    ],
+    "business_consultant": [
+        r"business", r"startup", r"strateg", r"competitor", r"market(ing)?\b", r"revenue", r"growth",
+        r"customer", r"pricing", r"swot", r"scal(e|ing) (my|our|the)", r"go.to.market", r"entrepreneur",
+    ],
+    "content_creator": [
+        r"blog", r"article", r"social media", r"tweet", r"linkedin", r"instagram", r"newsletter",
+        r"copywrit", r"caption", r"press release", r"write (a|an|me|the)", r"draft", r"email", r"ad copy",
+    ],
+    "project_manager": [
+        r"project", r"timeline", r"milestone", r"sprint", r"roadmap", r"schedul", r"deadline",
+        r"agile", r"scrum", r"kanban", r"gantt", r"resource allocation", r"deliverable", r"launch plan",
+    ],
+    "financial_advisor": [
+        r"invest", r"budget", r"saving", r"retire", r"loan", r"mortgage", r"debt", r"portfolio",
+        r"tax", r"financ", r"401k", r"ira\b", r"credit", r"interest rate", r"net worth", r"money",
+    ],
+    "legal_advisor": [
+        r"legal", r"law", r"contract", r"lawsuit", r"sue\b", r"liabil", r"copyright", r"trademark",
+        r"patent", r"gdpr", r"complian", r"lease", r"attorney", r"lawyer", r"terms of service", r"nda\b",
+    ],
+    "hr_specialist": [
+        r"hiring", r"hire", r"interview", r"resume", r"employee", r"salar", r"onboard", r"recruit",
+        r"hr\b", r"human resources", r"workplace", r"performance review", r"fire (an|my)", r"layoff",
+        r"job description",
+    ],
+    "cybersecurity_expert": [
+        r"secur", r"hack", r"password", r"phishing", r"malware", r"vulnerab", r"encrypt", r"firewall",
+        r"breach", r"ransomware", r"cyber", r"2fa", r"mfa\b", r"xss", r"sql injection", r"threat",
+    ],
+    "knowledge_assistant": [
+        r"explain", r"how does", r"how do", r"why (is|do|does|are)", r"what (is|are) (a|an|the)\b",
+        r"history of", r"define", r"definition", r"meaning of", r"teach me", r"tell me about",
+        r"overview", r"difference between", r"guide to",
+    ],
+}
+
+MAX_TOOLS = 4
+
+
+def literal_prefix(pattern: str) -> str:
+    """Leading plain text of a pattern (lowercase), checked with `in` before running the regex"""
+    match = re.match(r"[a-z0-9 &'-]*", pattern)
+    prefix = match.group(0)
+    if len(prefix) < len(pattern) and pattern[len(prefix)] in "?*{":
+        prefix = prefix[:-1]  # the last character is optional
+    return prefix
+
+
+def compile_keywords(keywords) -> dict:
+    """Tool name -> [(literal prefix, regex)]"""
+    return {name: [(literal_prefix(pattern),
+                    re.compile(r"\b" + pattern if pattern[0].isalnum() else pattern, re.IGNORECASE))
+                   for pattern in patterns]
+            for name, patterns in keywords.items()}
+
+
+def current_turn(messages):
+    """The latest user message and the messages after it"""
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            return messages[index], messages[index + 1:]
+    return None, messages
+
+
+class ToolRouter(Runnable):
+    """Stands in for llm.bind_tools(tools), binding only the tools a turn is likely to use
+
+    With `tiers` ({tier: model}, see model_tiers.py) it also picks the model per call.
+    """
+
+    def __init__(self, llm, tools, max_tools: int = MAX_TOOLS, keywords=KEYWORDS,
+                 tiers=None, policy=None, route_tools: bool = True):
+        self.llm = llm
+        self.tools = list(tools)
+        self.max_tools = max(1, max_tools)
+        self.models = dict(tiers) if tiers else {STANDARD: llm}
+        self.policy = policy or TierPolicy()
+        self.route_tools = route_tools
+        self._by_name = {t.name: t for t in self.tools}
+        self._patterns = compile_keywords({name: keywords.get(name, []) for name in self._by_name})
+        self._bound = {}  # (tier, frozenset of tool names) -> bound runnable
+        self._lock = threading.Lock()
+        self.all_tools = frozenset(self._by_name)
+        self.full = self.bind(self.all_tools)
+
+    def score(self, text: str) -> dict:
+        """Tool name -> number of its patterns found in `text`, for tools with any"""
+        lowered = text.lower()
+        scores = {}
+        for name, patterns in self._patterns.items():
+            # Substring checks are far cheaper than regex searches and rule out almost all patterns
+            hits = sum(1 for prefix, pattern in patterns if prefix in lowered and pattern.search(text))
+            if hits:
+                scores[name] = hits
+        return scores
+
+    def route(self, messages):
+        """
+        Names of the tools to bind for this call: a subset, every tool name when the
+        keywords match too many tools to choose (ambiguous), or None when nothing matches
+        """
+        human, after = current_turn(messages)
+        if human is None:
+            return None
+        scores = self.score(message_text(human.content))
+        if not scores:
+            return None
+        ranked = sorted(scores, key=lambda name: -scores[name])
+        if len(ranked) > self.max_tools and scores[ranked[self.max_tools]] == scores[ranked[self.max_tools - 1]]:
+            # A tie across the cut-off: the keywords cannot tell which tools matter
+            return self.all_tools
+        selected = set(ranked[:self.max_tools])
+        for message in after:
+            if isinstance(message, AIMessage):
+                selected.update(call["name"] for call in message.tool_calls if call["name"] in self._by_name)
+        return frozenset(selected)
+
+    def bind(self, names, tier: str = STANDARD):
+        key = (tier, names)
+        with self._lock:
+            bound = self._bound.get(key)
+        if bound is None:
+            tools = [t for t in self.tools if t.name in names]
+            bound = self.models[tier].bind_tools(tools)
+            with self._lock:
+                bound = self._bound.setdefault(key, bound)
+        return bound
+
+    def select(self, messages):
+        """(bound runnable, run metadata naming the tools and tier) for a call with these messages"""
+        names = self.route(messages)
+        if len(self.models) > 1:
+            tier, reason = self.policy.choose(messages, names)
+        else:
+            tier, reason = STANDARD, "single_tier"
+        MODEL_TIER_CHOICES.inc(tier=tier, reason=reason)
+        if not self.route_tools:
+            names = None
+        else:
+            TOOL_ROUTES.inc(outcome="no_match" if names is None
+                            else "ambiguous" if names == self.all_tools else "routed")
+        names = self.all_tools if names is None else names
+        # Read by TurnTracer, so traces show what each call was given
+        metadata = {"chatx_tools": sorted(names), "chatx_tier": tier, "chatx_tier_reason": reason}
+        return self.bind(names, tier), metadata
+
+    def invoke(self, input, config=None, **kwargs):
+        bound, metadata = self.select(input)
+        with MODEL_TIER_DURATION.time(tier=metadata["chatx_tier"]):
+            return bound.with_config(metadata=metadata).invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        bound, metadata = self.select(input)
+        with MODEL_TIER_DURATION.time(tier=metadata["chatx_tier"]):
+            return await bound.with_config(metadata=metadata).ainvoke(input, config, **kwargs)
+
+
+def router_from_env(llm, tools, tiers=None):
+    """
+    A ToolRouter over `tiers` (or just `llm`). CHATX_TOOL_ROUTER=0 binds every tool
+    on every call; without tiers that is a plain llm.bind_tools(tools).
+    """
+    route_tools = os.getenv("CHATX_TOOL_ROUTER", "1") != "0"
+    if not route_tools and not tiers:
+        return llm.bind_tools(tools)
+    return ToolRouter(llm, tools, max_tools=int(os.getenv("CHATX_TOOL_ROUTER_MAX_TOOLS", str(MAX_TOOLS))),
+                      tiers=tiers, policy=policy_from_env(), route_tools=route_tools)
@@ -0,0 +1,279 @@
+"""
+Per-turn execution traces.
+
+A TurnTracer is passed in the callbacks of one chat turn and records every graph
+superstep (chat_node, tools) with its timing, the LLM calls made in it (tool calls
+issued, Gemini usage_metadata token counts) and each tool execution. Clients that
+send `X-ChatX-Debug: 1` get the trace back with the response. With CHATX_TRACES=1
+every trace is also stored in a local turn_traces table, pruned to the newest
+CHATX_TRACE_MAX_ROWS and CHATX_TRACE_MAX_AGE_HOURS, so slow turns can be sampled
+afterwards:
+
+    python tracing.py --slowest 20
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from sqlite_utils import ProcessLocalConnection
+
+DEBUG_HEADER = "X-ChatX-Debug"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS turn_traces (
+    turn_id TEXT PRIMARY KEY,
+    thread_id TEXT,
+    created_at REAL NOT NULL,
+    duration_ms REAL NOT NULL,
+    total_tokens INTEGER NOT NULL,
+    error TEXT,
+    trace TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS turn_traces_duration ON turn_traces (duration_ms);
+CREATE INDEX IF NOT EXISTS turn_traces_created_at ON turn_traces (created_at);
+"""
+
+
+def debug_requested(headers) -> bool:
+    return headers.get(DEBUG_HEADER, "").strip().lower() in ("1", "true", "yes", "trace")
+
+
+class TurnTracer(BaseCallbackHandler):
+    """Callback handler collecting the trace of a single chat turn"""
+
+    def __init__(self, thread_id: str = None):
+        self.turn_id = uuid.uuid4().hex
+        self.thread_id = thread_id
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._steps = {}      # (step, node) -> step entry, in start order
+        self._runs = {}       # run_id -> (kind, entry, started)
+        self.trace = None
+
+    def _elapsed_ms(self, since=None) -> float:
+        return round((time.perf_counter() - (since if since is not None else self._start)) * 1000, 2)
+
+    def _step_for(self, metadata):
+        metadata = metadata or {}
+        node = metadata.get("langgraph_node")
+        if node is None:
+            return None
+        key = (metadata.get("langgraph_step"), node)
+        step = self._steps.get(key)
+        if step is None:
+            step = self._steps[key] = {
+                "step": key[0], "node": node, "start_ms": self._elapsed_ms(),
+                "duration_ms": None, "error": None, "llm_calls": [], "tools": [],
+            }
+        return step
+
+    # Graph nodes
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        metadata = metadata or {}
+        # Only the node's own run, not runnables nested inside it
+        if kwargs.get("name") != metadata.get("langgraph_node"):
+            return
+        with self._lock:
+            step = self._step_for(metadata)
+            self._runs[run_id] = ("node", step, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end_node(run_id, None)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end_node(run_id, error)
+
+    def _end_node(self, run_id, error):
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            if run is None or run[0] != "node":
+                return
+            _, step, started = run
+            step["duration_ms"] = self._elapsed_ms(started)
+            if error is not None:
+                step["error"] = str(error)
+
+    # LLM calls
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        with self._lock:
+            step = self._step_for(metadata)
+            metadata = metadata or {}
+            # "tools" and "tier": what ToolRouter bound for this call (None without the router)
+            call = {"model": metadata.get("ls_model_name"), "tools": metadata.get("chatx_tools"),
+                    "tier": metadata.get("chatx_tier"), "tier_reason": metadata.get("chatx_tier_reason"),
+                    "duration_ms": None, "usage": None, "tool_calls": [], "cached": False, "error": None}
+            if step is not None:
+                step["llm_calls"].append(call)
+            self._runs[run_id] = ("llm", call, time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            if run is None:
+                return
+            _, call, started = run
+            call["duration_ms"] = self._elapsed_ms(started)
+            generations = response.generations[0] if response.generations else []
+            message = getattr(generations[0], "message", None) if generations else None
+            if message is not None:
+                call["usage"] = dict(message.usage_metadata) if message.usage_metadata else None
+                call["tool_calls"] = [
+                    {"name": tool_call["name"], "args": tool_call["args"]}
+                    for tool_call in getattr(message, "tool_calls", None) or []
+                ]
+                call["cached"] = bool(message.response_metadata.get("cache_hit"))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            if run is not None:
+                run[1]["duration_ms"] = self._elapsed_ms(run[2])
+                run[1]["error"] = str(error)
+
+    # Tools (ToolNode may run several in parallel threads)
+    def on_tool_start(self, serialized, input_str, *, run_id, metadata=None, **kwargs):
+        with self._lock:
+            step = self._step_for(metadata)
+            entry = {"name": (serialized or {}).get("name") or kwargs.get("name"),
+                     "start_ms": self._elapsed_ms(), "duration_ms": None, "error": None}
+            if step is not None:
+                step["tools"].append(entry)
+            self._runs[run_id] = ("tool", entry, time.perf_counter())
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end_tool(run_id, None)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end_tool(run_id, error)
+
+    def _end_tool(self, run_id, error):
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            if run is None:
+                return
+            run[1]["duration_ms"] = self._elapsed_ms(run[2])
+            if error is not None:
+                run[1]["error"] = str(error)
+
+    def finish(self, error=None) -> dict:
+        """Close the trace and return it as a JSON-serializable dict"""
+        with self._lock:
+            steps = list(self._steps.values())
+        usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        for step in steps:
+            for call in step["llm_calls"]:
+                for name in usage:
+                    usage[name] += (call["usage"] or {}).get(name, 0)
+        self.trace = {
+            "turn_id": self.turn_id,
+            "thread_id": self.thread_id,
+            "started_at": self.started_at,
+            "duration_ms": self._elapsed_ms(),
+            "error": str(error) if error is not None else None,
+            "steps": steps,
+            "usage": usage,
+        }
+        return self.trace
+
+
+class TraceStore:
+    """turn_traces table; keeps the newest max_rows traces, none older than max_age_hours"""
+
+    def __init__(self, path: str = "traces.db", min_duration_ms: float = 0, max_rows: int = 10000,
+                 max_age_hours: float = 7 * 24):
+        self.db = ProcessLocalConnection(path, SCHEMA)
+        self.min_duration_ms = min_duration_ms
+        self.max_rows = max_rows
+        self.max_age_hours = max_age_hours
+        self._saves = 0
+
+    def save(self, trace: dict):
+        if trace["duration_ms"] < self.min_duration_ms:
+            return
+        with self.db.cursor() as cur:
+            # Trimming is a full index scan; amortize it over many inserts, starting
+            # with the first one so short-lived workers still prune
+            if self._saves % 100 == 0:
+                self.prune(cur)
+            self._saves += 1
+            cur.execute(
+                "INSERT OR REPLACE INTO turn_traces "
+                "(turn_id, thread_id, created_at, duration_ms, total_tokens, error, trace) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (trace["turn_id"], trace["thread_id"], trace["started_at"], trace["duration_ms"],
+                 trace["usage"]["total_tokens"], trace["error"], json.dumps(trace)),
+            )
+
+    def prune(self, cur):
+        """Delete traces older than max_age_hours, then all but the newest max_rows"""
+        if self.max_age_hours:
+            cur.execute("DELETE FROM turn_traces WHERE created_at < ?",
+                        (time.time() - self.max_age_hours * 3600,))
+        if self.max_rows:
+            cur.execute(
+                "DELETE FROM turn_traces WHERE created_at < "
+                "(SELECT created_at FROM turn_traces ORDER BY created_at DESC LIMIT 1 OFFSET ?)",
+                (self.max_rows - 1,),
+            )
+
+    def get(self, turn_id: str):
+        with self.db.cursor(transaction=False) as cur:
+            row = cur.execute("SELECT trace FROM turn_traces WHERE turn_id = ?", (turn_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def slowest(self, limit: int = 20, since: float = 0) -> list:
+        with self.db.cursor(transaction=False) as cur:
+            rows = cur.execute(
+                "SELECT trace FROM turn_traces WHERE created_at >= ? ORDER BY duration_ms DESC LIMIT ?",
+                (since, limit),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+def trace_path_from_env() -> str:
+    # Next to the checkpoint database unless configured
+    default_path = os.path.join(os.path.dirname(os.getenv("CHATX_DB_PATH", "chatbot.db")), "traces.db")
+    return os.getenv("CHATX_TRACE_PATH", default_path)
+
+
+def store_from_env():
+    """Return the configured trace store, or None unless CHATX_TRACES=1"""
+    if os.getenv("CHATX_TRACES", "0") != "1":
+        return None
+    return TraceStore(
+        path=trace_path_from_env(),
+        min_duration_ms=float(os.getenv("CHATX_TRACE_MIN_MS", "0")),
+        max_rows=int(os.getenv("CHATX_TRACE_MAX_ROWS", "10000")),
+        max_age_hours=float(os.getenv("CHATX_TRACE_MAX_AGE_HOURS", str(7 * 24))),
+    )
+
+
+def finish_turn(tracer: TurnTracer, store, error=None) -> dict:
+    """Finish a turn's trace and persist it; storage problems never fail the turn"""
+    trace = tracer.finish(error)
+    if store is not None:
+        try:
+            store.save(trace)
+        except Exception as e:
+            print(f"[ERROR] Failed to store turn trace: {e}")
+    return trace
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show the slowest stored chat turns")
+    parser.add_argument("--slowest", type=int, default=20, help="number of traces to show")
+    parser.add_argument("--hours", type=float, default=24, help="only turns from the last N hours")
+    parser.add_argument("--path", default=trace_path_from_env())
+    args = parser.parse_args()
+    store = TraceStore(args.path)
+    json.dump(store.slowest(args.slowest, since=time.time() - args.hours * 3600), sys.stdout, indent=2)
+    print()